@@ -5,11 +5,17 @@ from sqlalchemy import pool
 
 from alembic import context
 from app.database import DATABASE_URL, Base
-from app.auth.models import User
-from app.department.models import Department, Job
+from app.auth.models import User, RevokedToken, RefreshToken, PasswordResetToken
+from app.department.models import Department, Job, department_closure
 from app.employee.models import Employee, EmployeeStatus
 from app.presence.models import Presence
 from app.policy.models import Role, Permission, role_permissions
+from app.bootstrap.models import BootstrapState
+from app.analytics.models import DataVersion
+from app.payroll.models import PayrollRun, PayrollItem
+from app.work_calendar.models import WorkingCalendar, Holiday
+from app.scheduler.models import JobRun
+from app.idempotency.models import IdempotencyKey
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
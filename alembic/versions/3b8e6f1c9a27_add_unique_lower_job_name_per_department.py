@@ -0,0 +1,30 @@
+"""add unique lower job name per department
+
+Revision ID: 3b8e6f1c9a27
+Revises: 8d5c1b7e3f90
+Create Date: 2026-10-19 23:12:40.906114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8e6f1c9a27'
+down_revision: Union[str, Sequence[str], None] = '8d5c1b7e3f90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # MySQL needs the functional key part in its own parentheses. Fails if a department
+    # already holds names differing only in case; rename those first
+    op.create_index('uq_job_department_id_lower_name', 'job', ['department_id', sa.text('(lower(name))')], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_job_department_id_lower_name', table_name='job')
@@ -0,0 +1,35 @@
+"""use autoincrement for permission ids
+
+Revision ID: 5e2d8c4a1f63
+Revises: 3b8e6f1c9a27
+Create Date: 2026-10-20 09:41:17.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2d8c4a1f63'
+down_revision: Union[str, Sequence[str], None] = '3b8e6f1c9a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Permission IDs are bit positions in access tokens and must never be reused. Without
+    # AUTOINCREMENT SQLite hands out the ID of a deleted highest row again; other dialects
+    # already keep counting
+    if op.get_bind().dialect.name == 'sqlite':
+        with op.batch_alter_table('permissions', recreate='always', table_kwargs={'sqlite_autoincrement': True}) as batch_op:
+            pass
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'sqlite':
+        with op.batch_alter_table('permissions', recreate='always', table_kwargs={'sqlite_autoincrement': False}) as batch_op:
+            pass
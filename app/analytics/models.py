@@ -0,0 +1,10 @@
+from app.database import Base
+from sqlalchemy import String
+from sqlalchemy.orm import mapped_column, Mapped
+
+
+class DataVersion(Base):
+    __tablename__ = "data_versions"
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    version: Mapped[int] = mapped_column(nullable=False, default=0)
\ No newline at end of file
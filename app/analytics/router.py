@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends
+from typing import Annotated
+from sqlalchemy.orm import Session
+from app.database import get_read_session
+from app.policy.dependencies import require_permission
+from .schemas import GroupBy, HeadcountSchema, CompensationSchema
+from .service import headcount, compensation
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"], dependencies=[Depends(require_permission("employee", "list"))])
+
+@router.get("/headcount")
+def get_headcount(db: Annotated[Session, Depends(get_read_session)], group_by: GroupBy = GroupBy.DEPARTMENT) -> HeadcountSchema:
+    return headcount(group_by, db)
+
+@router.get("/compensation")
+def get_compensation(db: Annotated[Session, Depends(get_read_session)], group_by: GroupBy = GroupBy.DEPARTMENT) -> CompensationSchema:
+    return compensation(group_by, db)
\ No newline at end of file
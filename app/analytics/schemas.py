@@ -0,0 +1,40 @@
+from pydantic import BaseModel
+from enum import StrEnum
+
+
+class GroupBy(StrEnum):
+    DEPARTMENT = "department"
+    JOB = "job"
+    STATUS = "status"
+    HIRE_YEAR = "hire_year"
+    HIRE_MONTH = "hire_month"
+
+
+class HeadcountGroupSchema(BaseModel):
+    key: str
+    headcount: int
+
+
+class HeadcountSchema(BaseModel):
+    group_by: GroupBy
+    data: list[HeadcountGroupSchema]
+    total: int
+    version: int
+
+
+class CompensationGroupSchema(BaseModel):
+    key: str
+    count: int
+    min: int
+    max: int
+    avg: float
+    p25: float
+    p50: float
+    p75: float
+    p90: float
+
+
+class CompensationSchema(BaseModel):
+    group_by: GroupBy
+    data: list[CompensationGroupSchema]
+    version: int
\ No newline at end of file
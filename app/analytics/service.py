@@ -0,0 +1,134 @@
+from sqlalchemy import select, func, extract
+from sqlalchemy.orm import Session
+from app.department.models import Department, Job
+from app.employee.models import Employee, EmployeeStatus
+from .schemas import GroupBy, HeadcountSchema, HeadcountGroupSchema, CompensationSchema, CompensationGroupSchema
+from .utils import get_data_version, result_cache
+import numpy as np
+
+PERCENTILES: tuple[int, ...] = (25, 50, 75, 90)
+
+def _group_keys(group_by: GroupBy):
+    """Columns to GROUP BY and the join needed to reach them."""
+    if group_by == GroupBy.DEPARTMENT:
+        return [Department.id, Department.name], (Department, Employee.department_id == Department.id)
+    if group_by == GroupBy.JOB:
+        return [Job.id, Job.name], (Job, Employee.job_id == Job.id)
+    if group_by == GroupBy.STATUS:
+        return [EmployeeStatus.id, EmployeeStatus.name], (EmployeeStatus, Employee.employee_status_id == EmployeeStatus.id)
+    if group_by == GroupBy.HIRE_YEAR:
+        return [extract("year", Employee.hire_date)], None
+
+    return [extract("year", Employee.hire_date), extract("month", Employee.hire_date)], None
+
+def _label(group_by: GroupBy, key: tuple) -> str:
+    if group_by == GroupBy.HIRE_YEAR:
+        return f"{int(key[0]):04d}"
+    if group_by == GroupBy.HIRE_MONTH:
+        return f"{int(key[0]):04d}-{int(key[1]):02d}"
+
+    return key[1]
+
+def _grouped(stmt, keys, join):
+    stmt = stmt.select_from(Employee)
+
+    if join is not None:
+        stmt = stmt.join(*join)
+
+    return stmt.group_by(*keys).order_by(*keys)
+
+def headcount(group_by: GroupBy, db: Session) -> HeadcountSchema:
+    version = get_data_version("employee", db)
+    cache_key = ("headcount", group_by, version)
+    cached = result_cache.get(cache_key)
+
+    if cached is not None:
+        return cached
+
+    keys, join = _group_keys(group_by)
+    rows = db.execute(_grouped(select(*keys, func.count(Employee.id)), keys, join)).all()
+
+    data = [HeadcountGroupSchema(key=_label(group_by, tuple(row[:-1])), headcount=row[-1]) for row in rows]
+    result = HeadcountSchema(group_by=group_by, data=data, total=sum(group.headcount for group in data), version=version)
+    result_cache.set(cache_key, result)
+
+    return result
+
+def _percentiles_in_sql(keys, join, db: Session) -> dict[tuple, list[float]]:
+    columns = [func.percentile_cont(p / 100).within_group(Employee.salary) for p in PERCENTILES]
+    rows = db.execute(_grouped(select(*keys, *columns), keys, join)).all()
+
+    return {tuple(row[:len(keys)]): [float(value) for value in row[len(keys):]] for row in rows}
+
+def _percentiles_in_numpy(keys, join, db: Session) -> dict[tuple, list[float]]:
+    """Fetch only (group, salary) pairs sorted by group and compute percentiles per contiguous slice."""
+    stmt = select(*keys, Employee.salary).select_from(Employee)
+
+    if join is not None:
+        stmt = stmt.join(*join)
+
+    rows = db.execute(stmt.order_by(*keys, Employee.salary)).all()
+
+    if not rows:
+        return {}
+
+    group_keys = [tuple(row[:len(keys)]) for row in rows]
+    salaries = np.fromiter((row[-1] or 0 for row in rows), dtype=np.float64, count=len(rows))
+
+    # Rows are ordered by group, so each group is one contiguous slice
+    boundaries = [0] + [i for i in range(1, len(group_keys)) if group_keys[i] != group_keys[i - 1]] + [len(group_keys)]
+
+    return {
+        group_keys[start]: np.percentile(salaries[start:end], PERCENTILES).tolist()
+        for start, end in zip(boundaries[:-1], boundaries[1:])
+    }
+
+def compensation(group_by: GroupBy, db: Session) -> CompensationSchema:
+    version = get_data_version("employee", db)
+    cache_key = ("compensation", group_by, version)
+    cached = result_cache.get(cache_key)
+
+    if cached is not None:
+        return cached
+
+    keys, join = _group_keys(group_by)
+    stmt = _grouped(
+        select(
+            *keys,
+            func.count(Employee.id),
+            func.min(Employee.salary),
+            func.max(Employee.salary),
+            func.avg(Employee.salary)
+        ),
+        keys,
+        join
+    )
+    rows = db.execute(stmt).all()
+
+    if db.get_bind().dialect.name == "postgresql":
+        percentiles = _percentiles_in_sql(keys, join, db)
+    else:
+        percentiles = _percentiles_in_numpy(keys, join, db)
+
+    data = []
+    for row in rows:
+        key = tuple(row[:len(keys)])
+        count, minimum, maximum, average = row[len(keys):]
+        p25, p50, p75, p90 = percentiles.get(key, [0.0] * len(PERCENTILES))
+
+        data.append(CompensationGroupSchema(
+            key=_label(group_by, key),
+            count=count,
+            min=minimum or 0,
+            max=maximum or 0,
+            avg=float(average or 0),
+            p25=p25,
+            p50=p50,
+            p75=p75,
+            p90=p90
+        ))
+
+    result = CompensationSchema(group_by=group_by, data=data, version=version)
+    result_cache.set(cache_key, result)
+
+    return result
@@ -0,0 +1,94 @@
+from sqlalchemy import Connection, event, select, update, insert
+from sqlalchemy.orm import Session
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable
+from app.employee.models import Employee
+from app.work_calendar.models import WorkingCalendar, Holiday
+from .models import DataVersion
+
+# Session.info key of the version names to bump once the session commits
+PENDING_DATA_VERSIONS = "pending_data_versions"
+
+# ORM classes whose writes bump a data version, keyed by version name
+TRACKED_MODELS: dict[type, str] = {
+    Employee: "employee",
+    WorkingCalendar: "calendar",
+    Holiday: "calendar",
+}
+
+def bump_data_version(name: str, db: Session) -> None:
+    """Invalidate cached results derived from the named data once the session commits.
+
+    Call it after bulk Core statements. The bump runs in its own short
+    transaction after the commit, so writers never queue on the shared
+    version row while holding their own locks.
+    """
+    db.info.setdefault(PENDING_DATA_VERSIONS, set()).add(name)
+
+def _increment_data_version(name: str, conn: Connection) -> None:
+    table = DataVersion.__table__
+
+    result = conn.execute(update(table).where(table.c.name == name).values(version=table.c.version + 1))
+
+    if result.rowcount == 0:
+        conn.execute(insert(table).values(name=name, version=1))
+
+def get_data_version(name: str, db: Session) -> int:
+    version = db.scalars(select(DataVersion.version).where(DataVersion.name == name)).one_or_none()
+
+    return version or 0
+
+@event.listens_for(Session, "after_flush")
+def _bump_tracked_versions(session: Session, flush_context) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if type(obj) in TRACKED_MODELS:
+            bump_data_version(TRACKED_MODELS[type(obj)], session)
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_versions(session: Session) -> None:
+    pending = session.info.pop(PENDING_DATA_VERSIONS, None)
+
+    if not pending:
+        return
+
+    with session.get_bind().begin() as conn:
+        for name in sorted(pending):
+            _increment_data_version(name, conn)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_versions(session: Session) -> None:
+    session.info.pop(PENDING_DATA_VERSIONS, None)
+
+
+class ResultCache:
+    """Small LRU cache; keys embed the data version so stale entries are simply never hit again."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            value = self._entries.get(key)
+
+            if value is not None:
+                self._entries.move_to_end(key)
+
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+result_cache = ResultCache()
@@ -4,4 +4,6 @@ settings = get_settings()
 
 SECRET_KEY: str = settings.secret_key
 ALGORITHM: str = settings.algorithm
-ACCESS_TOKEN_EXPIRE_MINUTES: int = settings.access_token_expire_minutes
\ No newline at end of file
+ACCESS_TOKEN_EXPIRE_MINUTES: int = settings.access_token_expire_minutes
+REFRESH_TOKEN_EXPIRE_DAYS: int = settings.refresh_token_expire_days
+PASSWORD_RESET_EXPIRE_MINUTES: int = settings.password_reset_expire_minutes
@@ -8,7 +8,9 @@ from datetime import datetime, timezone
 from app.config import get_settings
 from app.database import get_session
 from .utils import verify_password
+from .revocation import is_token_revoked
 from .models import User
+from .schemas import TokenData
 import jwt
 
 settings = get_settings()
@@ -19,7 +21,7 @@ SECRET_KEY: str = settings.secret_key
 ALGORITHM: str = settings.algorithm
 ACCESS_TOKEN_EXPIRE_MINUTES: int = settings.access_token_expire_minutes
 
-def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: Session = Depends(get_session)) -> User:
+def get_token_payload(token: Annotated[str, Depends(oauth2_scheme)], db: Session = Depends(get_session)) -> dict:
     credential_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -28,13 +30,50 @@ def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: Session
 
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=ALGORITHM)
-        username: str = payload.get("sub")
 
-        if username is None:
+        if payload.get("sub") is None:
             raise credential_exception
         
     except InvalidTokenError:
         raise credential_exception
+
+    jti: str | None = payload.get("jti")
+
+    if jti is not None and is_token_revoked(jti, db):
+        raise credential_exception
+
+    return payload
+
+def get_current_principal(payload: Annotated[dict, Depends(get_token_payload)]) -> TokenData:
+    """Identity and authorisation claims read from the access token alone, without a DB query."""
+    if "uid" not in payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    if payload["st"] != "active":
+        raise HTTPException(status_code=status.HTTP_423_LOCKED, detail="Inactive user")
+
+    return TokenData(
+        id=payload["uid"],
+        username=payload["sub"],
+        role_id=payload["rid"],
+        status=payload["st"],
+        is_superuser=payload["su"],
+        permission_version=payload["pv"],
+        permission_mask=int(payload["pm"], 16) if "pm" in payload else None
+    )
+
+def get_current_user(payload: Annotated[dict, Depends(get_token_payload)], db: Session = Depends(get_session)) -> User:
+    credential_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    username: str = payload["sub"]
     
     stmt = select(User).where(User.username == username)
     user: User = db.scalars(stmt).one_or_none()
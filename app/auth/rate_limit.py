@@ -0,0 +1,145 @@
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm
+from pydantic import EmailStr
+from collections import OrderedDict
+from typing import Annotated, Protocol
+from threading import Lock
+from app.config import get_settings
+import time
+
+settings = get_settings()
+
+
+class RateLimitStore(Protocol):
+    """Storage for token buckets; swap in a shared implementation to limit across workers."""
+
+    def consume(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """Take one token from the bucket under key.
+
+        Returns 0 when the call is allowed, otherwise the seconds until a token is available.
+        """
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+
+class InMemoryRateLimitStore:
+    """Per-process token buckets, evicting the least recently used keys past max_keys."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = Lock()
+
+    def consume(self, key: str, capacity: int, refill_per_second: float) -> float:
+        now = time.monotonic()
+
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (float(capacity), now))
+            tokens = min(float(capacity), tokens + (now - updated_at) * refill_per_second)
+
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+            else:
+                retry_after = (1 - tokens) / refill_per_second
+
+            self._buckets[key] = (tokens, now)
+
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+        return retry_after
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class RateLimiter:
+    def __init__(self, name: str, attempts: int, ip_attempts: int, window_seconds: int, store: RateLimitStore):
+        self.name = name
+        self.attempts = attempts
+        self.ip_attempts = ip_attempts
+        self.window_seconds = window_seconds
+        self.store = store
+        self.allowed = 0
+        self.rejected = 0
+
+    def check(self, client_ip: str, identity: str | None = None) -> None:
+        """Raise 429 when the client IP or the targeted identity ran out of attempts."""
+        retry_after = self.store.consume(
+            f"{self.name}:ip:{client_ip}", self.ip_attempts, self.ip_attempts / self.window_seconds
+        )
+
+        if not retry_after and identity:
+            retry_after = self.store.consume(
+                f"{self.name}:identity:{identity.lower()}", self.attempts, self.attempts / self.window_seconds
+            )
+
+        if retry_after:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts, please try again later",
+                headers={"Retry-After": str(max(1, round(retry_after)))}
+            )
+
+        self.allowed += 1
+
+    def stats(self) -> dict:
+        return {
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "attempts": self.attempts,
+            "ip_attempts": self.ip_attempts,
+            "window_seconds": self.window_seconds,
+        }
+
+
+store: RateLimitStore = InMemoryRateLimitStore()
+
+login_limiter = RateLimiter(
+    "login",
+    attempts=settings.login_rate_limit_attempts,
+    ip_attempts=settings.login_rate_limit_ip_attempts,
+    window_seconds=settings.login_rate_limit_window_seconds,
+    store=store
+)
+forgot_password_limiter = RateLimiter(
+    "forgot_password",
+    attempts=settings.login_rate_limit_attempts,
+    ip_attempts=settings.login_rate_limit_ip_attempts,
+    window_seconds=settings.login_rate_limit_window_seconds,
+    store=store
+)
+
+def set_rate_limit_store(new_store: RateLimitStore) -> None:
+    """Point every limiter at another store, e.g. one shared by all API nodes."""
+    global store
+    store = new_store
+
+    for limiter in (login_limiter, forgot_password_limiter):
+        limiter.store = new_store
+
+def get_client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+def limit_login(request: Request, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]) -> None:
+    login_limiter.check(get_client_ip(request), form_data.username)
+
+def limit_forgot_password(request: Request, email: EmailStr) -> None:
+    forgot_password_limiter.check(get_client_ip(request), email)
+
+def get_rate_limit_stats() -> dict:
+    return {
+        "tracked_keys": len(store),
+        "limiters": {
+            limiter.name: limiter.stats()
+            for limiter in (login_limiter, forgot_password_limiter)
+        }
+    }
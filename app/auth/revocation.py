@@ -0,0 +1,87 @@
+from sqlalchemy import select, delete
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timezone
+from threading import Lock
+from app.config import get_settings
+from .models import RevokedToken
+import time
+
+settings = get_settings()
+
+# IDs are handed out at insert but rows show up at commit, so a lower ID can land after a
+# higher one was read. Every sync re-reads this many IDs below the watermark
+SYNC_LOOKBACK_IDS = 1000
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class RevocationList:
+    """In-memory copy of revoked_tokens, synced incrementally by row ID with a lookback window.
+
+    Lookups are a set membership test; the database is only queried once per
+    sync interval to pick up revocations made by other workers.
+    """
+
+    def __init__(self, sync_seconds: int):
+        self.sync_seconds = sync_seconds
+        self._expires: dict[str, datetime] = {}
+        self._last_id = 0
+        self._synced_at = 0.0
+        self._lock = Lock()
+
+    def is_revoked(self, jti: str, db: Session) -> bool:
+        if time.monotonic() - self._synced_at >= self.sync_seconds:
+            self.sync(db)
+
+        return jti in self._expires
+
+    def sync(self, db: Session) -> None:
+        with self._lock:
+            stmt = (
+                select(RevokedToken.id, RevokedToken.jti, RevokedToken.expires_at)
+                .where(RevokedToken.id > self._last_id - SYNC_LOOKBACK_IDS)
+                .order_by(RevokedToken.id)
+            )
+
+            # Rows already known are simply set again
+            for row_id, jti, expires_at in db.execute(stmt):
+                self._expires[jti] = expires_at
+                self._last_id = max(self._last_id, row_id)
+
+            now = _utcnow()
+            self._expires = {jti: expires_at for jti, expires_at in self._expires.items() if expires_at > now}
+            self._synced_at = time.monotonic()
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        with self._lock:
+            self._expires[jti] = expires_at
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expires.clear()
+            self._last_id = 0
+            self._synced_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+
+revocation_list = RevocationList(settings.token_revocation_sync_seconds)
+
+def revoke_token(jti: str, expires_at: datetime, db: Session) -> None:
+    """Persist the revocation, drop rows whose token already expired and update this worker's list."""
+    db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= _utcnow()))
+    db.add(RevokedToken(jti=jti, expires_at=expires_at))
+
+    try:
+        db.commit()
+    except IntegrityError:
+        # Token was already revoked
+        db.rollback()
+
+    revocation_list.add(jti, expires_at)
+
+def is_token_revoked(jti: str, db: Session) -> bool:
+    return revocation_list.is_revoked(jti, db)
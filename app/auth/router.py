@@ -2,51 +2,59 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from typing import Annotated
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from pydantic import EmailStr
 from app.database import get_session
 from app.employee.service import get_by_email
-from .constants import ACCESS_TOKEN_EXPIRE_MINUTES, SECRET_KEY, ALGORITHM
-from .dependencies import authenticate_user, get_current_user
-from .schemas import Token, UserSchema
+from app.policy.dependencies import require_permission
+from .dependencies import authenticate_user, get_current_user, get_token_payload
+from .revocation import revoke_token
+from .rate_limit import limit_login, limit_forgot_password, get_rate_limit_stats
+from .schemas import Token, RefreshTokenSchema, UserSchema, ResetPasswordSchema
 from .models import User
+from .service import create_access_token, issue_tokens, rotate_refresh_token, revoke_refresh_family, create_password_reset_token, reset_password, send_reset_email
 from .utils import verify_password
-import jwt
 
 router = APIRouter(tags=["Authentication"])
 
-def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
-    to_encode = data.copy()
-
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=30)
-    
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-
-    return encoded_jwt
-
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, dependencies=[Depends(limit_login)])
 def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()], db: Annotated[Session, Depends(get_session)]) -> Token:
     username: str = form_data.username
     password: str = form_data.password
 
     user = authenticate_user(username, password, db)
 
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={
-            "sub": user.username,
-        },
-        expires_delta=access_token_expires
-    )
+    return issue_tokens(user, db)
 
-    return Token(
-        access_token=access_token,
-        token_type="bearer"
-    )
+@router.post("/refresh", response_model=Token)
+def refresh(body: RefreshTokenSchema, db: Annotated[Session, Depends(get_session)]) -> Token:
+    try:
+        return rotate_refresh_token(body.refresh_token, db)
+    except ValueError as err:
+        raise HTTPException(status.HTTP_401_UNAUTHORIZED, detail=str(err), headers={"WWW-Authenticate": "Bearer"})
+    except PermissionError as err:
+        raise HTTPException(status.HTTP_423_LOCKED, detail=str(err))
+
+@router.post("/logout")
+def logout(payload: Annotated[dict, Depends(get_token_payload)], db: Annotated[Session, Depends(get_session)]):
+    jti: str | None = payload.get("jti")
+
+    if jti is None:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail="Token can not be revoked")
+
+    expires_at = datetime.fromtimestamp(payload["exp"], timezone.utc).replace(tzinfo=None)
+    revoke_token(jti, expires_at, db)
+
+    if payload.get("fam"):
+        revoke_refresh_family(payload["fam"], db)
+
+    return {
+        "msg": "Successfully logged out"
+    }
+
+@router.get("/rate-limit/stats", dependencies=[Depends(require_permission("rate_limit", "read"))])
+def rate_limit_stats():
+    return get_rate_limit_stats()
 
 @router.get("/me")
 def read_users_me(current_user: Annotated[User, Depends(get_current_user)]) -> UserSchema:
@@ -73,7 +81,7 @@ def change_password(password: str, current_user: Annotated[User, Depends(get_cur
         "msg": "Your password has been changed successfully"
     }
 
-@router.post("/forgot-password", status_code=status.HTTP_204_NO_CONTENT)
+@router.post("/forgot-password", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(limit_forgot_password)])
 def forgot_password(email: EmailStr, db: Annotated[Session, Depends(get_session)]):
     employee = get_by_email(email=email, db=db)
 
@@ -85,4 +93,17 @@ def forgot_password(email: EmailStr, db: Annotated[Session, Depends(get_session)
     
     if employee.user.status != "active":
         raise HTTPException(status.HTTP_423_LOCKED, detail="User account is not active")
-    
+
+    reset_token = create_password_reset_token(employee.user, db)
+    send_reset_email(employee.email_address, reset_token)
+
+@router.post("/reset-password")
+def reset_password_with_token(body: ResetPasswordSchema, db: Annotated[Session, Depends(get_session)]):
+    try:
+        reset_password(body.token, body.new_password, db)
+    except ValueError as err:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=str(err))
+
+    return {
+        "msg": "Your password has been reset successfully"
+    }
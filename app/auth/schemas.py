@@ -1,9 +1,31 @@
 from pydantic import BaseModel
 from datetime import datetime
+import uuid
 
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: str | None = None
+    expires_in: int | None = None
+
+
+class RefreshTokenSchema(BaseModel):
+    refresh_token: str
+
+
+class ResetPasswordSchema(BaseModel):
+    token: str
+    new_password: str
+
+
+class TokenData(BaseModel):
+    id: uuid.UUID
+    username: str
+    role_id: int | None = None
+    status: str
+    is_superuser: bool = False
+    permission_version: int = 0
+    permission_mask: int | None = None
 
 
 class UserSchema(BaseModel):
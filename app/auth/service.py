@@ -1,4 +1,192 @@
-def send_reset_email(to_email:str, reset_token:str) -> None:
-    reset_link: str = f"https://yourdomain.com/reset-password?token={reset_token}"
-    # Here you would normally send the email using an email service.
-    print(f"Sending password reset email to {to_email} with link: {reset_link}")
\ No newline at end of file
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta, timezone
+from app.config import get_settings
+from app.mail.service import send_mail
+from app.policy.utils import permission_mask
+from .constants import ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS, PASSWORD_RESET_EXPIRE_MINUTES, SECRET_KEY, ALGORITHM
+from .models import User, RefreshToken, PasswordResetToken
+from .schemas import Token
+import hashlib
+import secrets
+import jwt
+import uuid
+
+settings = get_settings()
+
+def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
+    to_encode = data.copy()
+
+    if expires_delta:
+        expire = datetime.now(timezone.utc) + expires_delta
+    else:
+        expire = datetime.now(timezone.utc) + timedelta(minutes=30)
+
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
+    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+    return encoded_jwt
+
+def access_token_claims(user: User, family_id: str) -> dict:
+    """Claims that let get_current_principal authorise a request without reading the user row."""
+    claims = {
+        "sub": user.username,
+        "uid": str(user.id),
+        "rid": user.role_id,
+        "st": user.status,
+        "su": bool(user.is_superuser),
+        "pv": user.role.permission_version if user.role else 0,
+        "fam": family_id,
+    }
+
+    if settings.token_permission_mask and user.role and not user.is_superuser:
+        # Hex string, JSON numbers lose precision past 53 bits
+        claims["pm"] = format(permission_mask(permission.id for permission in user.role.permissions), "x")
+
+    return claims
+
+def hash_token(token: str) -> str:
+    # Refresh and reset tokens are 256 bit random values, a fast digest is enough to store them
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def hash_refresh_token(refresh_token: str) -> str:
+    return hash_token(refresh_token)
+
+def _create_refresh_token(user_id: uuid.UUID, family_id: str, db: Session) -> str:
+    refresh_token = secrets.token_urlsafe(32)
+
+    db.add(RefreshToken(
+        user_id=user_id,
+        family_id=family_id,
+        token_hash=hash_refresh_token(refresh_token),
+        expires_at=datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    ))
+
+    return refresh_token
+
+def _issue(user: User, family_id: str, db: Session) -> Token:
+    refresh_token = _create_refresh_token(user.id, family_id, db)
+    db.commit()
+
+    access_token = create_access_token(
+        data=access_token_claims(user, family_id),
+        expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+
+    return Token(
+        access_token=access_token,
+        token_type="bearer",
+        refresh_token=refresh_token,
+        expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    )
+
+def issue_tokens(user: User, db: Session) -> Token:
+    """Start a new refresh token family for a fresh login."""
+    return _issue(user, uuid.uuid4().hex, db)
+
+def revoke_refresh_family(family_id: str, db: Session) -> None:
+    db.execute(update(RefreshToken).where(RefreshToken.family_id == family_id).values(revoked=True))
+    db.commit()
+
+def rotate_refresh_token(refresh_token: str, db: Session) -> Token:
+    """Exchange a refresh token for a new access/refresh pair.
+
+    Presenting a refresh token that was already rotated revokes its whole
+    family, since it means the token leaked.
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    stmt = select(RefreshToken).where(RefreshToken.token_hash == hash_refresh_token(refresh_token))
+    stored: RefreshToken | None = db.scalars(stmt).one_or_none()
+
+    if stored is None:
+        raise ValueError("Invalid refresh token")
+
+    if stored.revoked or stored.expires_at <= now:
+        raise ValueError("Refresh token has expired or been revoked")
+
+    # Compare-and-swap so two concurrent refreshes can not both succeed
+    result = db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == stored.id, RefreshToken.used_at.is_(None))
+        .values(used_at=now)
+    )
+
+    if result.rowcount != 1:
+        db.rollback()
+        revoke_refresh_family(stored.family_id, db)
+        raise ValueError("Refresh token reuse detected")
+
+    user: User = stored.user
+
+    if user.status != "active":
+        db.rollback()
+        revoke_refresh_family(stored.family_id, db)
+        raise PermissionError("Inactive user")
+
+    return _issue(user, stored.family_id, db)
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def create_password_reset_token(user: User, db: Session) -> str:
+    """Issue a single-use reset token; only its hash is stored and earlier unused tokens stop working."""
+    now = _utcnow()
+    reset_token = secrets.token_urlsafe(32)
+
+    db.execute(
+        update(PasswordResetToken)
+        .where(PasswordResetToken.user_id == user.id, PasswordResetToken.used_at.is_(None))
+        .values(used_at=now)
+    )
+    db.add(PasswordResetToken(
+        user_id=user.id,
+        token_hash=hash_token(reset_token),
+        expires_at=now + timedelta(minutes=PASSWORD_RESET_EXPIRE_MINUTES)
+    ))
+    db.commit()
+
+    return reset_token
+
+def reset_password(reset_token: str, new_password: str, db: Session) -> None:
+    """Set a new password with a reset token and sign the user out of every refresh token family."""
+    now = _utcnow()
+    stmt = select(PasswordResetToken).where(PasswordResetToken.token_hash == hash_token(reset_token))
+    stored: PasswordResetToken | None = db.scalars(stmt).one_or_none()
+
+    if stored is None or stored.used_at is not None or stored.expires_at <= now:
+        raise ValueError("Invalid or expired reset token")
+
+    # Compare-and-swap so the token can only be spent once
+    result = db.execute(
+        update(PasswordResetToken)
+        .where(PasswordResetToken.id == stored.id, PasswordResetToken.used_at.is_(None))
+        .values(used_at=now)
+    )
+
+    if result.rowcount != 1:
+        db.rollback()
+        raise ValueError("Invalid or expired reset token")
+
+    try:
+        stored.user.reset_password(new_password)
+    except ValueError:
+        db.rollback()
+        raise
+
+    db.execute(update(RefreshToken).where(RefreshToken.user_id == stored.user_id).values(revoked=True))
+    db.commit()
+
+def send_reset_email(to_email: str, reset_token: str) -> None:
+    """Queue the reset link; delivery happens in the background mail queue."""
+    reset_link: str = f"{settings.password_reset_url}?token={reset_token}"
+
+    send_mail(
+        to=to_email,
+        subject="Reset your password",
+        body=(
+            "We received a request to reset your password.\n\n"
+            f"Open the link below within {PASSWORD_RESET_EXPIRE_MINUTES} minutes to choose a new one:\n"
+            f"{reset_link}\n\n"
+            "If you did not ask for this, you can ignore this email."
+        )
+    )
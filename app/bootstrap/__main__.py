@@ -0,0 +1,66 @@
+"""Command line entry point for seeding the database.
+
+Usage:
+    python -m app.bootstrap run
+    python -m app.bootstrap seed-permissions [--resource NAME ...] [--role NAME ...]
+"""
+from argparse import ArgumentParser
+from sqlalchemy import select
+from app.database import Session
+from app.policy.models import Role
+from .service import (
+    SYSTEM_ADMINISTRATOR_ROLE,
+    run_bootstrap,
+    get_resources,
+    upsert_permissions,
+    upsert_role,
+    grant_all_permissions,
+)
+import sys
+
+def seed_permissions(resources: list[str] | None, roles: list[str]) -> None:
+    with Session() as db:
+        created = upsert_permissions(resources or get_resources(db), db)
+
+        granted = 0
+        for name in roles:
+            if name == SYSTEM_ADMINISTRATOR_ROLE:
+                role_id = upsert_role(name, "Full access of management and system configuration", db)
+            else:
+                role_id = db.scalars(select(Role.id).where(Role.name == name)).one_or_none()
+
+                if role_id is None:
+                    raise SystemExit(f"Role {name} is not found")
+
+            granted += grant_all_permissions(role_id, db)
+
+        db.commit()
+
+    print(f"Permissions created: {created}, grants added: {granted}")
+
+def main(argv: list[str] | None = None) -> int:
+    parser = ArgumentParser(prog="python -m app.bootstrap", description="Seed users, roles and permissions")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("run", help="Run the idempotent startup bootstrap")
+
+    seed = commands.add_parser("seed-permissions", help="Insert missing permissions and grant them to roles")
+    seed.add_argument("--resource", action="append", dest="resources", help="Resource to seed, defaults to every table")
+    seed.add_argument("--role", action="append", dest="roles", help=f"Role receiving all permissions, defaults to {SYSTEM_ADMINISTRATOR_ROLE}")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        with Session() as db:
+            applied = run_bootstrap(db)
+
+        print("Bootstrap applied" if applied else "Bootstrap already applied")
+
+    elif args.command == "seed-permissions":
+        seed_permissions(args.resources, args.roles or [SYSTEM_ADMINISTRATOR_ROLE])
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+from app.database import Base
+from sqlalchemy.orm import mapped_column, Mapped
+from sqlalchemy.sql import func
+from datetime import datetime
+
+
+class BootstrapState(Base):
+    __tablename__ = "bootstrap_state"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    version: Mapped[int] = mapped_column(nullable=False)
+    applied_at: Mapped[datetime] = mapped_column(server_default=func.now())
\ No newline at end of file
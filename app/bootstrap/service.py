@@ -0,0 +1,233 @@
+from sqlalchemy import select, insert, inspect, literal
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timezone
+from app.concurrency import advisory_lock
+from app.config import get_settings
+from app.auth.models import User
+from app.auth.utils import get_password_hash
+from app.policy.models import Role, Permission, role_permissions
+from app.policy.schemas import Action
+from app.policy.service import bump_permission_version
+from .models import BootstrapState
+import logging
+
+settings = get_settings()
+
+# Bump when a bootstrap step changes so already-bootstrapped databases run it again
+BOOTSTRAP_VERSION: int = 1
+BOOTSTRAP_STATE_ID: int = 1
+BOOTSTRAP_LOCK_NAME: str = "user_management_system_bootstrap"
+BOOTSTRAP_LOCK_TIMEOUT: int = 30
+SYSTEM_ADMINISTRATOR_ROLE: str = "System Administrator"
+
+def create_first_superuser(db: Session) -> bool:
+    print("Checking for superuser...")
+    username: str = settings.superuser_username
+    password: str = settings.superuser_password
+
+    if username == "" or password == "":
+        logging.warning("Superuser credentials are not set. Skipping superuser creation.")
+        return False
+
+    stmt = select(User.id).where(User.username == username)
+
+    if db.scalars(stmt).one_or_none() is not None:
+        print("Superuser already exists. Skipping creation.")
+        return True
+
+    new_user: User = User(
+        username=username,
+        password_hash=get_password_hash(password),
+        is_superuser=True
+    )
+
+    try:
+        db.add(new_user)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        print("Superuser already exists. Skipping creation.")
+        return True
+
+    print("Superuser created successfully.")
+
+    return True
+
+# Create role system administrator
+def create_role_sa(db: Session) -> None:
+    try:
+        role_id = upsert_role(
+            name=SYSTEM_ADMINISTRATOR_ROLE,
+            description="Full access of management and system configuration",
+            db=db
+        )
+        granted = grant_all_permissions(role_id, db)
+        db.commit()
+
+        print(f"System Administrator granted {granted} new permissions")
+
+    except Exception:
+        db.rollback()
+        print("Failed to create system administrator")
+
+# Create all permissions for all resource
+def create_all_permissions(db: Session) -> None:
+    try:
+        created = upsert_permissions(get_resources(db), db)
+        db.commit()
+
+        print(f"Created {created} new permissions")
+
+    except Exception:
+        db.rollback()
+        print("Failed to create all permissions")
+
+def get_resources(db: Session) -> list[str]:
+    """List the tables that should get CRUD permissions, read live from the database."""
+    tables = inspect(db.get_bind()).get_table_names()
+
+    return [
+        table for table in tables
+        if "alembic" not in table and table != BootstrapState.__tablename__
+    ]
+
+def _insert_ignore(table, db: Session):
+    """INSERT that silently skips rows hitting a unique constraint on this dialect."""
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "mysql":
+        stmt = mysql_insert(table)
+        # No-op update keeps the existing row, unlike INSERT IGNORE which hides every error
+        return stmt.on_duplicate_key_update(id=table.c.id)
+    if dialect == "postgresql":
+        return postgresql_insert(table).on_conflict_do_nothing()
+    if dialect == "sqlite":
+        return sqlite_insert(table).on_conflict_do_nothing()
+
+    return None
+
+def upsert_permissions(resources: list[str], db: Session) -> int:
+    """Insert the missing action permissions for every resource in one statement.
+
+    Returns the affected row count reported by the database.
+    """
+    rows = [
+        {
+            "name": f"{action.value.capitalize()} {' '.join(resource.split('_')).capitalize()}",
+            "resource": resource,
+            "action": action.value,
+            "description": "",
+        }
+        for resource in resources
+        for action in Action
+    ]
+
+    if not rows:
+        return 0
+
+    stmt = _insert_ignore(Permission.__table__, db)
+
+    if stmt is None:
+        existing = set(db.scalars(select(Permission.name).where(Permission.name.in_([row["name"] for row in rows]))))
+        rows = [row for row in rows if row["name"] not in existing]
+
+        if not rows:
+            return 0
+
+        stmt = insert(Permission.__table__)
+
+    result = db.execute(stmt.values(rows))
+
+    return max(result.rowcount, 0)
+
+def upsert_role(name: str, description: str | None, db: Session) -> int:
+    """Create the role when missing and return its ID."""
+    stmt = _insert_ignore(Role.__table__, db)
+
+    if stmt is None:
+        role_id = db.scalars(select(Role.id).where(Role.name == name)).one_or_none()
+
+        if role_id is not None:
+            return role_id
+
+        stmt = insert(Role.__table__)
+
+    db.execute(stmt.values(name=name, description=description))
+
+    return db.scalars(select(Role.id).where(Role.name == name)).one()
+
+def grant_all_permissions(role_id: int, db: Session) -> int:
+    """Grant every permission the role does not hold yet with a single INSERT ... SELECT.
+
+    Returns the number of grants that were added.
+    """
+    already_granted = (
+        select(role_permissions.c.permission_id)
+        .where(role_permissions.c.role_id == role_id)
+        .where(role_permissions.c.permission_id == Permission.id)
+    )
+    missing = select(literal(role_id), Permission.id).where(~already_granted.exists())
+
+    result = db.execute(
+        insert(role_permissions).from_select(["role_id", "permission_id"], missing)
+    )
+    granted = max(result.rowcount, 0)
+
+    if granted:
+        bump_permission_version(db, role_id=role_id)
+
+    return granted
+
+def get_applied_version(db: Session) -> int:
+    """Return the bootstrap version recorded in the database, 0 when never applied."""
+    stmt = select(BootstrapState.version).where(BootstrapState.id == BOOTSTRAP_STATE_ID)
+    version = db.scalars(stmt).one_or_none()
+
+    return version or 0
+
+def bootstrap_lock(db: Session):
+    """Hold a database advisory lock so only one worker bootstraps at a time."""
+    return advisory_lock(db, BOOTSTRAP_LOCK_NAME, BOOTSTRAP_LOCK_TIMEOUT)
+
+def run_bootstrap(db: Session) -> bool:
+    """Seed the superuser, permissions and System Administrator role once.
+
+    Returns True when the bootstrap steps ran, False when the database is
+    already at BOOTSTRAP_VERSION and nothing was done.
+    """
+    if get_applied_version(db) >= BOOTSTRAP_VERSION:
+        return False
+
+    with bootstrap_lock(db):
+        # Another worker may have finished while we were waiting on the lock,
+        # end the current transaction so the re-check sees its commit
+        db.rollback()
+        if get_applied_version(db) >= BOOTSTRAP_VERSION:
+            return False
+
+        superuser_created = create_first_superuser(db)
+        create_all_permissions(db)
+        create_role_sa(db)
+
+        # Without superuser credentials the next boot has to try again
+        if not superuser_created:
+            return True
+
+        state = db.get(BootstrapState, BOOTSTRAP_STATE_ID)
+
+        if state is None:
+            db.add(BootstrapState(id=BOOTSTRAP_STATE_ID, version=BOOTSTRAP_VERSION))
+        else:
+            state.version = BOOTSTRAP_VERSION
+            state.applied_at = datetime.now(timezone.utc)
+
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+
+    return True
@@ -0,0 +1,196 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Callable, Protocol
+import zlib
+
+try:
+    # Python 3.14+
+    from compression import zstd as _zstd
+
+    def _zstd_encoder(level: int):
+        return _StreamEncoder(_zstd.ZstdCompressor(level=level), _zstd.ZstdCompressor.FLUSH_BLOCK)
+
+except ImportError:
+    try:
+        import zstandard as _zstd
+
+        def _zstd_encoder(level: int):
+            return _StreamEncoder(_zstd.ZstdCompressor(level=level).compressobj(), _zstd.COMPRESSOBJ_FLUSH_BLOCK)
+
+    except ImportError:
+        _zstd_encoder = None
+
+
+class Encoder(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+    def sync_flush(self) -> bytes: ...
+    def flush(self) -> bytes: ...
+
+
+class _StreamEncoder:
+    """A compressor that can also emit everything buffered so far without ending the stream."""
+
+    def __init__(self, compressor, sync_mode: int):
+        self.compressor = compressor
+        self.sync_mode = sync_mode
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.compress(data)
+
+    def sync_flush(self) -> bytes:
+        return self.compressor.flush(self.sync_mode)
+
+    def flush(self) -> bytes:
+        return self.compressor.flush()
+
+
+def _gzip_encoder(level: int) -> Encoder:
+    return _StreamEncoder(zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS), zlib.Z_SYNC_FLUSH)
+
+def available_encoders(gzip_level: int, zstd_level: int) -> dict[str, Callable[[], Encoder]]:
+    """Encoders this process can produce, in server preference order."""
+    encoders: dict[str, Callable[[], Encoder]] = {}
+
+    if _zstd_encoder is not None:
+        encoders["zstd"] = lambda: _zstd_encoder(zstd_level)
+
+    encoders["gzip"] = lambda: _gzip_encoder(gzip_level)
+
+    return encoders
+
+def quality_values(header: str) -> dict[str, float]:
+    """Tokens of an Accept or Accept-Encoding header mapped to their q-value."""
+    weights: dict[str, float] = {}
+
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        quality = 1.0
+
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        if token:
+            weights[token.strip().lower()] = quality
+
+    return weights
+
+def negotiate(accept_encoding: str, supported: list[str]) -> str | None:
+    """Best supported coding for an Accept-Encoding header; ties go to the server's order."""
+    weights = quality_values(accept_encoding)
+    best, best_quality = None, 0.0
+
+    for coding in supported:
+        quality = weights.get(coding, weights.get("*", 0.0))
+
+        if quality > best_quality:
+            best, best_quality = coding, quality
+
+    return best
+
+
+class CompressionMiddleware:
+    """Compress responses with zstd or gzip, chunk by chunk so streaming bodies stay streamed.
+
+    Bodies are held back only until `minimum_size` bytes have arrived; anything
+    smaller is sent untouched. Event streams and already encoded responses are
+    passed through.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, zstd_level: int = 3):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoders = available_encoders(gzip_level, zstd_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        coding = negotiate(Headers(scope=scope).get("accept-encoding", ""), list(self.encoders))
+
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await _CompressedResponder(self.app, coding, self.encoders[coding], self.minimum_size)(scope, receive, send)
+
+
+class _CompressedResponder:
+    def __init__(self, app: ASGIApp, coding: str, encoder_factory: Callable[[], Encoder], minimum_size: int):
+        self.app = app
+        self.coding = coding
+        self.encoder_factory = encoder_factory
+        self.minimum_size = minimum_size
+        self.send: Send
+        self.start: Message | None = None
+        self.pending: list[bytes] = []
+        self.pending_size = 0
+        self.encoder: Encoder | None = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.start = message
+            self.passthrough = "content-encoding" in headers or headers.get("content-type", "").startswith("text/event-stream")
+
+            if self.passthrough:
+                await self.send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self.encoder is not None:
+            if more_body and not body:
+                return
+
+            # Flushed per chunk, otherwise the compressor holds a streamed body back until it has a full block
+            chunk = self.encoder.compress(body) + (self.encoder.sync_flush() if more_body else self.encoder.flush())
+            await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+            return
+
+        self.pending.append(body)
+        self.pending_size += len(body)
+
+        if self.pending_size < self.minimum_size:
+            if more_body:
+                return
+
+            # The whole body is below the threshold, send it as it came
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": b"".join(self.pending), "more_body": False})
+            return
+
+        self.encoder = self.encoder_factory()
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers["Content-Encoding"] = self.coding
+        headers.add_vary_header("Accept-Encoding")
+
+        chunk = self.encoder.compress(b"".join(self.pending))
+        self.pending = []
+
+        if more_body:
+            # Length is unknown until the stream ends
+            del headers["Content-Length"]
+            chunk += self.encoder.sync_flush()
+        else:
+            chunk += self.encoder.flush()
+            headers["Content-Length"] = str(len(chunk))
+
+        await self.send(self.start)
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
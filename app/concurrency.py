@@ -0,0 +1,61 @@
+from fastapi import Header, HTTPException, status
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from contextlib import contextmanager
+from typing import Annotated
+
+
+class VersionConflict(Exception):
+    """The row changed since the client read it."""
+
+
+def etag(version: int) -> str:
+    return f'"{version}"'
+
+def check_version(current: int, expected: int | None, label: str) -> None:
+    if expected is not None and current != expected:
+        raise VersionConflict(f"{label} was modified by someone else (version {current}, expected {expected})")
+
+def if_match_version(if_match: Annotated[str | None, Header()] = None) -> int | None:
+    """Version the client expects, from an If-Match ETag; None when absent or `*`."""
+    if if_match is None or if_match.strip() == "*":
+        return None
+
+    value = if_match.strip().removeprefix("W/").strip('"')
+
+    if not value.isdigit():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="If-Match must be an ETag returned by a previous read")
+
+    return int(value)
+
+@contextmanager
+def advisory_lock(db: Session, name: str, timeout: int):
+    """Hold a named database advisory lock for the duration of the block.
+
+    The lock lives on its own connection because the session hands its
+    connection back to the pool on every commit. Dialects without advisory
+    locks (SQLite, which serialises writers anyway) run the block unlocked.
+    """
+    bind = db.get_bind()
+    dialect = bind.dialect.name
+
+    if dialect not in ("mysql", "postgresql"):
+        yield
+        return
+
+    with bind.connect() as conn:
+        if dialect == "mysql":
+            acquired = conn.execute(text("SELECT GET_LOCK(:name, :timeout)"), {"name": name, "timeout": timeout}).scalar()
+
+            if acquired != 1:
+                raise TimeoutError(f"Timed out waiting for the {name} lock")
+        else:
+            conn.execute(text("SELECT pg_advisory_lock(hashtext(:name))"), {"name": name})
+
+        try:
+            yield
+        finally:
+            if dialect == "mysql":
+                conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": name})
+            else:
+                conn.execute(text("SELECT pg_advisory_unlock(hashtext(:name))"), {"name": name})
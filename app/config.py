@@ -1,4 +1,5 @@
 from functools import lru_cache
+from datetime import time
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -6,14 +7,48 @@ class _Settings(BaseSettings):
     secret_key: str
     algorithm: str
     access_token_expire_minutes: int
+    refresh_token_expire_days: int = 14
     database_dialect: str
     database_username: str
     database_password: str
     database_host: str
     database_port: str
     database_name: str
+    database_replica_urls: list[str] = []
+    database_replica_sticky_seconds: int = 5
     superuser_username: str
     superuser_password: str
+    token_revocation_sync_seconds: int = 5
+    token_permission_mask: bool = True
+    permission_registry_sync_seconds: int = 5
+    subordinate_cache_ttl_seconds: int = 60
+    login_rate_limit_attempts: int = 5
+    login_rate_limit_ip_attempts: int = 50
+    login_rate_limit_window_seconds: int = 60
+    payroll_standard_hours_per_day: float = 8
+    payroll_overtime_multiplier: float = 1.5
+    default_calendar_weekmask: str = "1111100"
+    absence_job_enabled: bool = True
+    absence_job_time: time = time(0, 5)
+    password_reset_expire_minutes: int = 30
+    password_reset_url: str = "https://yourdomain.com/reset-password"
+    mail_backend: str = "smtp"
+    mail_from: str = "no-reply@localhost"
+    mail_batch_size: int = 50
+    mail_max_retries: int = 5
+    mail_retry_base_seconds: float = 1.0
+    smtp_host: str = "localhost"
+    smtp_port: int = 25
+    smtp_username: str = ""
+    smtp_password: str = ""
+    smtp_use_tls: bool = False
+    idempotency_key_ttl_hours: int = 24
+    idempotency_lock_seconds: int = 60
+    employee_batch_get_limit: int = 100
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_zstd_level: int = 3
 
     model_config = SettingsConfigDict(env_file=".env")
 
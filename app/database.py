@@ -1,9 +1,15 @@
+from fastapi import Request, Response
 from sqlalchemy import create_engine, URL, inspect
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from itertools import cycle
+import time
 from app.config import get_settings
 
 settings = get_settings()
 
+# Cookie holding the epoch until which a client reads from the primary
+PRIMARY_STICKY_COOKIE = "primary_until"
+
 
 class Base(DeclarativeBase):
     pass
@@ -13,19 +19,62 @@ if "sqlite" in settings.database_dialect:
     DATABASE_URL: str = f"{settings.database_dialect}:///{settings.database_name}"
 else:
     DATABASE_URL = URL.create(
-        drivername=settings.database_dialect, 
-        username=settings.database_username, 
-        password=settings.database_password, 
-        host=settings.database_host, 
-        port=settings.database_port, 
+        drivername=settings.database_dialect,
+        username=settings.database_username,
+        password=settings.database_password,
+        host=settings.database_host,
+        port=settings.database_port,
         database=settings.database_name).render_as_string(hide_password=False)
 
 engine = create_engine(DATABASE_URL, echo=False)
 Session = sessionmaker(bind=engine, autoflush=False)
 
+replica_engines = [create_engine(url, echo=False, pool_pre_ping=True) for url in settings.database_replica_urls]
+ReplicaSessions = [sessionmaker(bind=replica, autoflush=False) for replica in replica_engines]
+_replica_cycle = cycle(ReplicaSessions) if ReplicaSessions else None
+
 inspector = inspect(engine)
 list_of_tables = inspector.get_table_names()
 
 def get_session():
     with Session() as session:
         yield session
+
+def is_primary_sticky(request: Request) -> bool:
+    """Check whether the client wrote recently and must keep reading from the primary."""
+    primary_until = request.cookies.get(PRIMARY_STICKY_COOKIE)
+
+    if primary_until is None:
+        return False
+
+    try:
+        return float(primary_until) > time.time()
+    except ValueError:
+        return False
+
+def stick_to_primary(response: Response) -> None:
+    """Pin the client's reads to the primary for the configured replication lag window."""
+    sticky_seconds = settings.database_replica_sticky_seconds
+
+    response.set_cookie(
+        PRIMARY_STICKY_COOKIE,
+        str(time.time() + sticky_seconds),
+        max_age=sticky_seconds,
+        httponly=True
+    )
+
+def get_read_session_factory(request: Request) -> sessionmaker:
+    """Session factory for read-only work, round-robin over the replicas when configured.
+
+    Streaming routes use it to open a session and close it before the response
+    starts; a yield dependency would hold the connection until the stream ends.
+    """
+    if _replica_cycle is None or is_primary_sticky(request):
+        return Session
+
+    return next(_replica_cycle)
+
+def get_read_session(request: Request):
+    """Session for read-only routes, round-robin over the replicas when configured."""
+    with get_read_session_factory(request)() as session:
+        yield session
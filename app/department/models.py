@@ -1,26 +1,63 @@
 from app.database import Base
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, String, Table, Column, Integer, Index, event, insert, select, literal
 from sqlalchemy.orm import mapped_column, Mapped, relationship
 from sqlalchemy.sql import func
 from datetime import datetime
 from typing import TYPE_CHECKING
+from app.work_calendar.models import WorkingCalendar
 
 if TYPE_CHECKING:
     from app.employee.models import Employee
 
+# Every ancestor/descendant pair of the department tree, including each department with itself at depth 0
+department_closure = Table(
+    "department_closure",
+    Base.metadata,
+    Column("ancestor_id", Integer, ForeignKey("department.id", ondelete="CASCADE"), primary_key=True),
+    Column("descendant_id", Integer, ForeignKey("department.id", ondelete="CASCADE"), primary_key=True),
+    Column("depth", Integer, nullable=False),
+    Index("ix_department_closure_descendant_id", "descendant_id")
+)
+
 
 class Department(Base):
     __tablename__ = "department"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    parent_id: Mapped[int] = mapped_column(ForeignKey("department.id"), nullable=True, index=True)
+    calendar_id: Mapped[int | None] = mapped_column(ForeignKey("working_calendars.id", ondelete="SET NULL"), nullable=True)
     name: Mapped[str] = mapped_column(String(150), unique=True, nullable=False)
     description: Mapped[str] = mapped_column(String(255))
     is_active: Mapped[bool] = mapped_column(default=True, nullable=False)
+    version: Mapped[int] = mapped_column(server_default="1", nullable=False)
     created_at: Mapped[datetime] = mapped_column(server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(server_default=func.now())
 
+    # UPDATEs compare-and-swap on version and raise StaleDataError when it moved
+    __mapper_args__ = {"version_id_col": version}
+
     employee: Mapped[list["Employee"]] = relationship(back_populates="department")
     job: Mapped[list["Job"]] = relationship(back_populates="department")
+    parent: Mapped["Department"] = relationship(back_populates="children", remote_side=[id])
+    children: Mapped[list["Department"]] = relationship(back_populates="parent")
+    calendar: Mapped["WorkingCalendar"] = relationship()
+
+
+@event.listens_for(Department, "after_insert")
+def _insert_closure(mapper, connection, target: Department) -> None:
+    """Link a new department to itself and to every ancestor of its parent."""
+    connection.execute(insert(department_closure).values(ancestor_id=target.id, descendant_id=target.id, depth=0))
+
+    if target.parent_id is not None:
+        ancestors = select(
+            department_closure.c.ancestor_id,
+            literal(target.id),
+            department_closure.c.depth + 1
+        ).where(department_closure.c.descendant_id == target.parent_id)
+
+        connection.execute(
+            insert(department_closure).from_select(["ancestor_id", "descendant_id", "depth"], ancestors)
+        )
 
 
 class Job(Base):
@@ -35,4 +72,8 @@ class Job(Base):
     updated_at: Mapped[datetime] = mapped_column(server_default=func.now())
 
     department: Mapped["Department"] = relationship(back_populates="job")
-    employee: Mapped[list["Employee"]] = relationship(back_populates="job", cascade="")
\ No newline at end of file
+    employee: Mapped[list["Employee"]] = relationship(back_populates="job", cascade="")
+
+
+# Job names are unique per department regardless of case
+Index("uq_job_department_id_lower_name", Job.department_id, func.lower(Job.name), unique=True)
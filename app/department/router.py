@@ -1,12 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from app.negotiation import MsgPackRoute
+from app.concurrency import VersionConflict, etag, if_match_version
+from app.fields import sparse_fields, sparse_response
 from typing import Annotated
 from sqlalchemy.orm import Session
 from app.policy.dependencies import require_permission
-from app.database import get_session
-from .schemas import CreateDepartmentSchema, DepartmentSchema, DepartmentsSchema, UpdateDepartmentSchema, JobSchema, CreateJobSchema
-from .service import create, get_all, get_by_id, update, delete, create_job
+from app.database import get_session, get_read_session
+from .schemas import CreateDepartmentSchema, DepartmentSchema, DepartmentsSchema, UpdateDepartmentSchema, JobSchema, CreateJobSchema, MoveDepartmentSchema, DepartmentCalendarSchema
+from .service import create, get_all, get_by_id, update, delete, create_job, move
+from .models import Department, Job
+from app.work_calendar.service import set_department_calendar
 
-router = APIRouter(prefix="/department", tags=["Department"])
+router = APIRouter(prefix="/department", tags=["Department"], route_class=MsgPackRoute)
+
+def to_job_schema(job: Job) -> JobSchema:
+    return JobSchema(
+        id=job.id,
+        name=job.name,
+        description=job.description,
+        is_active=job.is_active
+    )
+
+def to_sparse_department(department: Department, fields: list[str]) -> dict:
+    return {
+        field: [to_job_schema(job) for job in department.job] if field == "jobs" else getattr(department, field)
+        for field in fields
+    }
 
 @router.post("/", dependencies=[Depends(require_permission("department", "create"))], status_code=status.HTTP_201_CREATED)
 def create_department(department: CreateDepartmentSchema, db: Annotated[Session, Depends(get_session)]):
@@ -15,8 +34,11 @@ def create_department(department: CreateDepartmentSchema, db: Annotated[Session,
             name=department.name,
             description=department.description,
             is_active=department.is_active,
+            parent_id=department.parent_id,
             db=db
         )
+    except NameError as ne:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(ne))
     except ValueError as ve:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(ve))
     except RuntimeError as re:
@@ -28,57 +50,87 @@ def create_department(department: CreateDepartmentSchema, db: Annotated[Session,
     }
 
 @router.get("/")
-def get_all_departments(db: Annotated[Session, Depends(get_session)]) -> DepartmentsSchema:
+def get_all_departments(
+    db: Annotated[Session, Depends(get_read_session)],
+    fields: Annotated[list[str] | None, Depends(sparse_fields(DepartmentSchema))]
+) -> DepartmentsSchema:
+
+    departments = get_all(db, fields=fields)
 
-    departments = get_all(db)
+    if fields is not None:
+        return sparse_response({
+            "data": [to_sparse_department(dp, fields) for dp in departments],
+            "count": len(departments)
+        })
 
     return DepartmentsSchema(
         data=[DepartmentSchema(
             name=dp.name,
             description=dp.description,
             is_active=dp.is_active,
+            parent_id=dp.parent_id,
             id=dp.id,
-            jobs=[JobSchema(
-                id=job.id,
-                name=job.name,
-                description=job.description,
-                is_active=job.is_active
-            ) for job in dp.job]
+            version=dp.version,
+            jobs=[to_job_schema(job) for job in dp.job]
         ) for dp in departments],
         count=len(departments)
     )
 
 @router.get("/{id}", response_model=DepartmentSchema)
-def get_department(id: int, db: Annotated[Session, Depends(get_session)]) -> DepartmentSchema:
-    department = get_by_id(id, db)
+def get_department(
+    id: int,
+    db: Annotated[Session, Depends(get_read_session)],
+    response: Response,
+    fields: Annotated[list[str] | None, Depends(sparse_fields(DepartmentSchema))]
+) -> DepartmentSchema:
+    department = get_by_id(id, db, fields=fields)
 
     if not department:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Department not found")
+
+    if fields is not None:
+        return sparse_response(to_sparse_department(department, fields), headers={"ETag": etag(department.version)})
+
+    response.headers["ETag"] = etag(department.version)
     
     return DepartmentSchema(
         name=department.name,
         description=department.description,
         is_active=department.is_active,
-        id=department.id
+        parent_id=department.parent_id,
+        id=department.id,
+        version=department.version,
+        jobs=[to_job_schema(job) for job in department.job]
     )
 
 @router.put("/{id}", dependencies=[Depends(require_permission("department", "update"))])
-def update_department(id: int, department: UpdateDepartmentSchema, db: Annotated[Session, Depends(get_session)]):
+def update_department(
+    id: int,
+    department: UpdateDepartmentSchema,
+    db: Annotated[Session, Depends(get_session)],
+    expected_version: Annotated[int | None, Depends(if_match_version)],
+    response: Response
+):
     try:
-        update(
+        version = update(
             department_id=id,
             name=department.name,
             description=department.description,
             is_active=department.is_active,
-            db=db
+            db=db,
+            expected_version=expected_version
         )
     except NameError as ne:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(ne))
+    except VersionConflict as vc:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(vc))
     except ValueError as ve:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(ve))
     except RuntimeError as re:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(re))
 
+    response.headers["ETag"] = etag(version)
+
     return {
         "msg": f"Success updated department with ID {id}"
     }
@@ -92,6 +144,8 @@ def delete_department(id: int, db: Annotated[Session, Depends(get_session)]):
         )
     except NameError as ne:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(ne))
+    except ValueError as ve:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(ve))
     except RuntimeError as re:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(re))
 
@@ -99,6 +153,42 @@ def delete_department(id: int, db: Annotated[Session, Depends(get_session)]):
         "msg": f"Success deleted department with ID {id}"
     }
 
+@router.put("/{id}/parent", dependencies=[Depends(require_permission("department", "update"))])
+def move_department(id: int, body: MoveDepartmentSchema, db: Annotated[Session, Depends(get_session)]):
+    try:
+        move(
+            department_id=id,
+            parent_id=body.parent_id,
+            db=db
+        )
+    except NameError as ne:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(ne))
+    except ValueError as ve:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(ve))
+    except RuntimeError as re:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(re))
+
+    return {
+        "msg": f"Success moved department with ID {id}"
+    }
+
+@router.put("/{id}/calendar", dependencies=[Depends(require_permission("department", "update"))])
+def set_calendar(id: int, body: DepartmentCalendarSchema, db: Annotated[Session, Depends(get_session)]):
+    try:
+        set_department_calendar(
+            department_id=id,
+            calendar_id=body.calendar_id,
+            db=db
+        )
+    except NameError as ne:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(ne))
+    except RuntimeError as re:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(re))
+
+    return {
+        "msg": f"Success set calendar of department with ID {id}"
+    }
+
 @router.post("/{id}/job", status_code=status.HTTP_201_CREATED, dependencies=[Depends(require_permission("job", "create"))])
 def create_job_for_department(id: int, job: CreateJobSchema, db: Annotated[Session, Depends(get_session)]):
     try:
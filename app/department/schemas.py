@@ -16,10 +16,12 @@ class CreateDepartmentSchema(BaseModel):
     name: str
     description: Optional[str] = ""
     is_active: bool = True
+    parent_id: Optional[int] = None
 
 
 class DepartmentSchema(CreateDepartmentSchema):
     id: int
+    version: int = 1
     jobs: list[JobSchema]
 
 
@@ -31,4 +33,12 @@ class DepartmentsSchema(BaseModel):
 class UpdateDepartmentSchema(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
-    is_active: Optional[bool] = None
\ No newline at end of file
+    is_active: Optional[bool] = None
+
+
+class MoveDepartmentSchema(BaseModel):
+    parent_id: Optional[int] = None
+
+
+class DepartmentCalendarSchema(BaseModel):
+    calendar_id: Optional[int] = None
\ No newline at end of file
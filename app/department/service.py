@@ -1,14 +1,22 @@
+from sqlalchemy import select, delete as sql_delete, insert, true
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from .models import Department, Job
+from sqlalchemy.orm.exc import StaleDataError
+from app.concurrency import VersionConflict, check_version
+from app.fields import loader_options
+from .models import Department, Job, department_closure
 
 
-def create(name: str, description: str | None, db: Session, is_active: bool = True) -> None:
+def create(name: str, description: str | None, db: Session, is_active: bool = True, parent_id: int | None = None) -> None:
     """Create a new department in the database."""
+    if parent_id is not None and db.get(Department, parent_id) is None:
+        raise NameError(f"Parent department with ID {parent_id} is not found")
+
     new_department = Department(
         name=name,
         description=description,
-        is_active=is_active
+        is_active=is_active,
+        parent_id=parent_id
     )
 
     try:
@@ -23,21 +31,34 @@ def create(name: str, description: str | None, db: Session, is_active: bool = Tr
         db.rollback()
         raise RuntimeError(str(err))
     
-def get_all(db: Session) -> list[Department]:
-    """Retrieve all departments from the database."""
-    return db.query(Department).all()
+def _field_options(fields: list[str] | None) -> list:
+    if fields is None:
+        return []
+
+    # version always comes along for the ETag
+    return loader_options(Department, fields, {"jobs": Department.job}, always=(Department.id, Department.version))
+
+def get_all(db: Session, fields: list[str] | None = None) -> list[Department]:
+    """Retrieve all departments from the database, loading only the given schema fields when set."""
+    return db.query(Department).options(*_field_options(fields)).all()
 
-def get_by_id(department_id: int, db: Session) -> Department | None:
-    """Retrieve a department by its ID."""
-    return db.get(Department, department_id)
+def get_by_id(department_id: int, db: Session, fields: list[str] | None = None) -> Department | None:
+    """Retrieve a department by its ID, loading only the given schema fields when set."""
+    return db.get(Department, department_id, options=_field_options(fields))
 
-def update(department_id: int, name: str | None, description: str | None, is_active: bool | None, db: Session) -> None:
-    """Update an existing department in the database."""
+def update(department_id: int, name: str | None, description: str | None, is_active: bool | None, db: Session, expected_version: int | None = None) -> int:
+    """Update an existing department in the database, returning its new version.
+
+    With expected_version the update only applies if nobody changed the
+    department since the client read that version.
+    """
     department = db.get(Department, department_id)
 
     if not department:
         raise NameError(f"Department with ID {department_id} is not found")
 
+    check_version(department.version, expected_version, f"Department with ID {department_id}")
+
     if name is not None:
         department.name = name
     if description is not None:
@@ -52,10 +73,16 @@ def update(department_id: int, name: str | None, description: str | None, is_act
         db.rollback()
         raise ValueError(f"Duplicate entry department {name}")
 
+    except StaleDataError:
+        db.rollback()
+        raise VersionConflict(f"Department with ID {department_id} was modified by someone else")
+
     except Exception as err:
         db.rollback()
         raise RuntimeError(str(err))
 
+    return department.version
+
 def delete(department_id: int, db: Session) -> None:
     """Delete a department from the database."""
     department = db.get(Department, department_id)
@@ -63,6 +90,9 @@ def delete(department_id: int, db: Session) -> None:
     if not department:
         raise NameError(f"Department with ID {department_id} is not found")
 
+    if department.children:
+        raise ValueError(f"Department with ID {department_id} still has sub-departments")
+
     try:
         db.delete(department)
         db.commit()
@@ -71,6 +101,67 @@ def delete(department_id: int, db: Session) -> None:
         db.rollback()
         raise RuntimeError(str(err))
 
+def get_descendant_ids(department_id: int, db: Session) -> list[int]:
+    """IDs of the department and every department below it."""
+    stmt = select(department_closure.c.descendant_id).where(department_closure.c.ancestor_id == department_id)
+
+    return list(db.scalars(stmt).all())
+
+def move(department_id: int, parent_id: int | None, db: Session) -> None:
+    """Re-parent a department, rewriting only the closure rows that cross the moved subtree."""
+    department = db.get(Department, department_id)
+
+    if not department:
+        raise NameError(f"Department with ID {department_id} is not found")
+
+    if parent_id is not None and db.get(Department, parent_id) is None:
+        raise NameError(f"Parent department with ID {parent_id} is not found")
+
+    subtree_ids = get_descendant_ids(department_id, db)
+
+    if parent_id in subtree_ids:
+        raise ValueError("Department can not be moved under itself or one of its sub-departments")
+
+    old_ancestor_ids = list(db.scalars(
+        select(department_closure.c.ancestor_id)
+        .where(department_closure.c.descendant_id == department_id)
+        .where(department_closure.c.depth > 0)
+    ).all())
+
+    try:
+        # ID lists instead of subqueries: MySQL can not delete from a table it selects from
+        if old_ancestor_ids:
+            db.execute(
+                sql_delete(department_closure)
+                .where(department_closure.c.descendant_id.in_(subtree_ids))
+                .where(department_closure.c.ancestor_id.in_(old_ancestor_ids))
+            )
+
+        if parent_id is not None:
+            new_ancestors = department_closure.alias("new_ancestors")
+            subtree = department_closure.alias("subtree")
+            links = (
+                select(
+                    new_ancestors.c.ancestor_id,
+                    subtree.c.descendant_id,
+                    new_ancestors.c.depth + subtree.c.depth + 1
+                )
+                .select_from(new_ancestors)
+                # Every new ancestor with every node of the moved subtree
+                .join(subtree, true())
+                .where(new_ancestors.c.descendant_id == parent_id)
+                .where(subtree.c.ancestor_id == department_id)
+            )
+
+            db.execute(insert(department_closure).from_select(["ancestor_id", "descendant_id", "depth"], links))
+
+        department.parent_id = parent_id
+        db.commit()
+
+    except Exception as err:
+        db.rollback()
+        raise RuntimeError(str(err))
+
 def create_job(department_id: int, name: str, description: str | None, db: Session, is_active: bool = True) -> None:
     """Create a new job for a specific department."""
     department = db.get(Department, department_id)
@@ -86,21 +177,13 @@ def create_job(department_id: int, name: str, description: str | None, db: Sessi
     )
 
     try:
-        job_names = [job.name.lower() for job in department.job]
-
-        if new_job.name.lower() in job_names:
-            raise ValueError(f"Duplicate entry job {name} on Department {department.name}")
-
         db.add(new_job)
         db.commit()
 
+    # uq_job_department_id_lower_name rejects names differing only in case
     except IntegrityError:
         db.rollback()
         raise ValueError(f"Duplicate entry job {name} on Department {department.name}")
-    
-    except ValueError as err:
-        db.rollback()
-        raise ValueError(str(err))
 
     except Exception as err:
         db.rollback()
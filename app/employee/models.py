@@ -37,6 +37,7 @@ class Employee(Base):
     job_id: Mapped[int] = mapped_column(ForeignKey("job.id"), nullable=False)
     salary: Mapped[int] = mapped_column(default=0)
     employee_status_id: Mapped[int] = mapped_column(ForeignKey("employee_status.id"))
+    manager_id: Mapped[uuid.UUID | None] = mapped_column(Uuid(as_uuid=True), ForeignKey("employee.id"), nullable=True, index=True)
     hire_date: Mapped[datetime] = mapped_column(server_default=func.now())
     created_at: Mapped[datetime] = mapped_column(server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(server_default=func.now())
@@ -45,4 +46,6 @@ class Employee(Base):
     job: Mapped["Job"] = relationship(back_populates="employee")
     employee_status: Mapped["EmployeeStatus"] = relationship(back_populates="employee")
     user: Mapped["User"] = relationship(back_populates="employee")
-    presences: Mapped[list["Presence"]] = relationship(back_populates="employee", cascade="all, delete-orphan")
\ No newline at end of file
+    presences: Mapped[list["Presence"]] = relationship(back_populates="employee", cascade="all, delete-orphan")
+    manager: Mapped["Employee"] = relationship(back_populates="direct_reports", remote_side=[id])
+    direct_reports: Mapped[list["Employee"]] = relationship(back_populates="manager")
\ No newline at end of file
@@ -1,16 +1,89 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.negotiation import MsgPackRoute
 from sqlalchemy.orm import Session
 from typing import Annotated
-from app.database import get_session
+from app.database import get_session, get_read_session
 from app.policy.dependencies import require_permission
-from .service import get_all, get_by_id, create, create_status, get_all_status
-from .schemas import EmployeesSchema, EmployeeSchema, CreateEmployeeSchema, CreateUserSchema, CreateEmployeeStatusSchema, EmployeeStatusSchema, EmployeeStatusesSchema
+from app.idempotency.dependencies import IdempotentRequest, idempotency
+from app.fields import sparse_fields, sparse_response
+from app.auth.dependencies import get_current_user
+from app.auth.models import User
+from app.presence.schemas import PresencePageSchema
+from app.presence.service import get_presence_history
+from app.config import get_settings
+from .models import Employee
+from .service import get_all, get_all_fields, get_by_id, get_fields_by_id, get_many, get_many_fields, create, create_status, get_all_status, get_direct_reports, set_manager, bulk_update
+from .schemas import EmployeesSchema, EmployeeSchema, CreateEmployeeSchema, CreateUserSchema, CreateEmployeeStatusSchema, EmployeeStatusSchema, EmployeeStatusesSchema, SetManagerSchema, BulkUpdateEmployeeSchema, BulkUpdateResultSchema, BatchGetEmployeesSchema, EmployeeBatchSchema
+from datetime import date
 import uuid
 
-router = APIRouter(prefix="/employee", tags=["Employee"], dependencies=[Depends(require_permission("employee_status", "list"))])
+settings = get_settings()
+
+router = APIRouter(prefix="/employee", tags=["Employee"], dependencies=[Depends(require_permission("employee_status", "list"))], route_class=MsgPackRoute)
+
+def to_employee_schema(employee: Employee) -> EmployeeSchema:
+    return EmployeeSchema(
+        id=employee.id,
+        full_name=employee.full_name,
+        gender=employee.gender,
+        birthday=employee.birthday,
+        email_address=employee.email_address,
+        phone_number=employee.phone_number,
+        address=employee.address,
+        department=employee.department.name,
+        job=employee.job.name,
+        salary=employee.salary,
+        employee_status=employee.employee_status.name,
+        manager_id=employee.manager_id,
+        hire_date=employee.hire_date,
+        created_at=employee.created_at,
+        updated_at=employee.updated_at
+    )
+
+def get_reports(manager_id: uuid.UUID, db: Session, transitive: bool) -> EmployeesSchema:
+    if transitive:
+        employees = get_all(db, manager_id=manager_id)
+    else:
+        employees = get_direct_reports(manager_id, db)
+
+    return EmployeesSchema(
+        data=[to_employee_schema(emp) for emp in employees],
+        count=len(employees)
+    )
+
+def parse_ids(ids: str) -> list[uuid.UUID]:
+    try:
+        return [uuid.UUID(value.strip()) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma separated list of employee IDs"
+        )
+
+def batch_get(ids: list[uuid.UUID], fields: list[str] | None, db: Session) -> EmployeeBatchSchema:
+    """Employees for the IDs in request order, one query however many are asked for."""
+    if not ids or len(ids) > settings.employee_batch_get_limit:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Request between 1 and {settings.employee_batch_get_limit} employee IDs"
+        )
+
+    if fields is not None:
+        found = get_many_fields(ids, fields, db)
+    else:
+        found = {employee_id: to_employee_schema(employee) for employee_id, employee in get_many(ids, db).items()}
+
+    data = [found.get(employee_id) for employee_id in ids]
+    not_found = list(dict.fromkeys(employee_id for employee_id in ids if employee_id not in found))
+    count = sum(employee is not None for employee in data)
+
+    if fields is not None:
+        return sparse_response({"data": data, "not_found": not_found, "count": count})
+
+    return EmployeeBatchSchema(data=data, not_found=not_found, count=count)
 
 @router.get("/status")
-def get_employee_status(db: Session = Depends(get_session)) -> EmployeeStatusesSchema:
+def get_employee_status(db: Session = Depends(get_read_session)) -> EmployeeStatusesSchema:
     
     statuses = get_all_status(db=db)
 
@@ -49,8 +122,111 @@ def create_employee_status(employee_status: CreateEmployeeStatusSchema, db: Sess
         "msg": f"Success created status {employee_status.name}"
     }
 
+@router.post("/bulk-update", dependencies=[Depends(require_permission("employee", "update"))])
+def bulk_update_employees(body: BulkUpdateEmployeeSchema, db: Annotated[Session, Depends(get_session)], dry_run: bool = False) -> BulkUpdateResultSchema:
+    try:
+        matched = bulk_update(body, db, dry_run=dry_run)
+    except NameError as err:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(err)
+        )
+    except ValueError as err:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(err)
+        )
+    except RuntimeError as err:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(err)
+        )
+
+    return BulkUpdateResultSchema(matched=matched, dry_run=dry_run)
+
+@router.post("/batch-get", dependencies=[Depends(require_permission("employee", "list"))])
+def batch_get_employees(
+    body: BatchGetEmployeesSchema,
+    db: Annotated[Session, Depends(get_read_session)],
+    fields: Annotated[list[str] | None, Depends(sparse_fields(EmployeeSchema))]
+) -> EmployeeBatchSchema:
+    return batch_get(body.ids, fields, db)
+
+@router.get("/me/reports")
+def get_my_reports(current_user: Annotated[User, Depends(get_current_user)], db: Annotated[Session, Depends(get_read_session)], transitive: bool = False) -> EmployeesSchema:
+    if current_user.employee_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User is not linked to an employee"
+        )
+
+    return get_reports(current_user.employee_id, db, transitive)
+
+@router.get("/{id}/reports", dependencies=[Depends(require_permission("employee", "list"))])
+def get_employee_reports(id: uuid.UUID, db: Annotated[Session, Depends(get_read_session)], transitive: bool = False) -> EmployeesSchema:
+    return get_reports(id, db, transitive)
+
+@router.put("/{id}/manager", dependencies=[Depends(require_permission("employee", "update"))])
+def update_employee_manager(id: uuid.UUID, body: SetManagerSchema, db: Annotated[Session, Depends(get_session)]):
+    try:
+        set_manager(id, body.manager_id, db)
+    except NameError as err:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(err)
+        )
+    except ValueError as err:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(err)
+        )
+    except RuntimeError as err:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(err)
+        )
+
+    return {"msg": f"Success updated manager of employee with ID {id}"}
+
+@router.get("/{id}/presence", dependencies=[Depends(require_permission("presences", "list"))])
+def get_employee_presences(
+    id: uuid.UUID,
+    db: Annotated[Session, Depends(get_read_session)],
+    start: date | None = None,
+    end: date | None = None,
+    limit: Annotated[int, Query(ge=1, le=500)] = 50,
+    cursor: str | None = None
+) -> PresencePageSchema:
+    try:
+        return get_presence_history(id, db, start=start, end=end, limit=limit, cursor=cursor)
+    except NameError as err:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(err)
+        )
+    except ValueError as err:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=str(err)
+        )
+
 @router.get("/{id}", dependencies=[Depends(require_permission("employee", "read"))])
-def get_employee(id: uuid.UUID, db: Annotated[Session, Depends(get_session)]) -> EmployeeSchema:
+def get_employee(
+    id: uuid.UUID,
+    db: Annotated[Session, Depends(get_read_session)],
+    fields: Annotated[list[str] | None, Depends(sparse_fields(EmployeeSchema))]
+) -> EmployeeSchema:
+    if fields is not None:
+        employee = get_fields_by_id(id, fields, db)
+
+        if employee is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Employee not found"
+            )
+
+        return sparse_response(employee)
+
     employee = get_by_id(id, db)
 
     if employee is None:
@@ -59,49 +235,39 @@ def get_employee(id: uuid.UUID, db: Annotated[Session, Depends(get_session)]) ->
             detail="Employee not found"
         )
 
-    return EmployeeSchema(
-        id=employee.id,
-        full_name=employee.full_name,
-        gender=employee.gender,
-        birthday=employee.birthday,
-        email_address=employee.email_address,
-        phone_number=employee.phone_number,
-        address=employee.address,
-        department=employee.department.name,
-        job=employee.job.name,
-        salary=employee.salary,
-        employee_status=employee.employee_status.name,
-        hire_date=employee.hire_date,
-        created_at=employee.created_at,
-        updated_at=employee.updated_at
-    )
+    return to_employee_schema(employee)
 
 @router.get("", dependencies=[Depends(require_permission("employee", "list"))])
-def get_all_employees(db: Annotated[Session, Depends(get_session)]) -> EmployeesSchema:
-    employees = get_all(db)
+def get_all_employees(
+    db: Annotated[Session, Depends(get_read_session)],
+    fields: Annotated[list[str] | None, Depends(sparse_fields(EmployeeSchema))],
+    department_id: int | None = None,
+    include_subdepartments: bool = False,
+    manager_id: uuid.UUID | None = None,
+    ids: str | None = None
+) -> EmployeesSchema | EmployeeBatchSchema:
+    if ids is not None:
+        return batch_get(parse_ids(ids), fields, db)
+
+    if fields is not None:
+        employees = get_all_fields(fields, db, department_id=department_id, include_subdepartments=include_subdepartments, manager_id=manager_id)
+
+        return sparse_response({"data": employees, "count": len(employees)})
+
+    employees = get_all(db, department_id=department_id, include_subdepartments=include_subdepartments, manager_id=manager_id)
 
     return EmployeesSchema(
-        data=[EmployeeSchema(
-            id=emp.id,
-            full_name=emp.full_name,
-            gender=emp.gender,
-            birthday=emp.birthday,
-            email_address=emp.email_address,
-            phone_number=emp.phone_number,
-            address=emp.address,
-            department=emp.department.name,
-            job=emp.job.name,
-            salary=emp.salary,
-            employee_status=emp.employee_status.name,
-            hire_date=emp.hire_date,
-            created_at=emp.created_at,
-            updated_at=emp.updated_at
-        ) for emp in employees],
+        data=[to_employee_schema(emp) for emp in employees],
         count=len(employees)
     )
 
 @router.post("", status_code=status.HTTP_201_CREATED, dependencies=[Depends(require_permission("employee", "create"))])
-def create_employee(employee: CreateEmployeeSchema, user: CreateUserSchema, db: Annotated[Session, Depends(get_session)]):
+def create_employee(
+    employee: CreateEmployeeSchema,
+    user: CreateUserSchema,
+    db: Annotated[Session, Depends(get_session)],
+    idempotent: Annotated[IdempotentRequest, Depends(idempotency("POST /employee"))]
+):
     try:
         create(employee, user, db)
     except ValueError as err:
@@ -115,4 +281,4 @@ def create_employee(employee: CreateEmployeeSchema, user: CreateUserSchema, db:
             detail=str(err)
         )
 
-    return {"msg": "Employee and user created successfully"}
\ No newline at end of file
+    return idempotent.save({"msg": "Employee and user created successfully"}, status.HTTP_201_CREATED)
\ No newline at end of file
@@ -1,5 +1,5 @@
 from datetime import datetime
-from pydantic import BaseModel, EmailStr, field_validator
+from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
 from pydantic_extra_types.phone_numbers import PhoneNumber, PhoneNumberValidator
 from typing import Annotated, Union
 import uuid
@@ -21,6 +21,7 @@ class EmployeeSchema(BaseModel):
     job: str
     salary: int
     employee_status: str
+    manager_id: uuid.UUID | None = None
     hire_date: datetime
     created_at: datetime
     updated_at: datetime
@@ -31,6 +32,17 @@ class EmployeesSchema(BaseModel):
     count: int
 
 
+class BatchGetEmployeesSchema(BaseModel):
+    ids: list[uuid.UUID] = Field(min_length=1)
+
+
+class EmployeeBatchSchema(BaseModel):
+    # One entry per requested ID in request order, null where it was not found
+    data: list[EmployeeSchema | None]
+    not_found: list[uuid.UUID]
+    count: int
+
+
 class CreateEmployeeSchema(BaseModel):
     full_name: str
     gender: bool
@@ -52,6 +64,44 @@ class CreateEmployeeSchema(BaseModel):
         return v
 
 
+class EmployeeFilterSchema(BaseModel):
+    department_id: int | None = None
+    include_subdepartments: bool = False
+    job_id: int | None = None
+    employee_status_id: int | None = None
+
+    @model_validator(mode="after")
+    def validate_not_empty(self):
+        if self.department_id is None and self.job_id is None and self.employee_status_id is None:
+            raise ValueError("At least one filter is required")
+        return self
+
+
+class BulkUpdateEmployeeSchema(BaseModel):
+    filter: EmployeeFilterSchema
+    salary_percent: float | None = None
+    salary_amount: int | None = None
+    job_id: int | None = None
+    employee_status_id: int | None = None
+
+    @model_validator(mode="after")
+    def validate_changes(self):
+        if self.salary_percent is not None and self.salary_amount is not None:
+            raise ValueError("Use either salary_percent or salary_amount, not both")
+        if all(value is None for value in (self.salary_percent, self.salary_amount, self.job_id, self.employee_status_id)):
+            raise ValueError("At least one change is required")
+        return self
+
+
+class BulkUpdateResultSchema(BaseModel):
+    matched: int
+    dry_run: bool
+
+
+class SetManagerSchema(BaseModel):
+    manager_id: uuid.UUID | None = None
+
+
 class CreateUserSchema(BaseModel):
     username: str
     password: str
@@ -1,22 +1,264 @@
-from sqlalchemy import select
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select, update, func, case, cast, literal, Integer
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.exc import IntegrityError, OperationalError
+from app.analytics.utils import bump_data_version
 from app.auth.models import User
 from app.auth.utils import get_password_hash
+from app.concurrency import advisory_lock
+from app.department.models import Department, Job, department_closure
 from .models import Employee, EmployeeStatus
-from .schemas import CreateUserSchema, CreateEmployeeSchema
+from .schemas import CreateUserSchema, CreateEmployeeSchema, EmployeeFilterSchema, BulkUpdateEmployeeSchema
+from .utils import subordinate_cache
+import uuid
+
+# Deepest reporting line the recursive queries follow
+MAX_REPORTING_DEPTH = 64
+
+# Serialises reporting line changes across workers
+REPORTING_LINES_LOCK_NAME = "user_management_system_reporting_lines"
+REPORTING_LINES_LOCK_TIMEOUT = 10
+
+# Column behind every EmployeeSchema field, for sparse fieldsets
+EMPLOYEE_FIELD_COLUMNS = {
+    "id": Employee.id,
+    "full_name": Employee.full_name,
+    "gender": Employee.gender,
+    "birthday": Employee.birthday,
+    "email_address": Employee.email_address,
+    "phone_number": Employee.phone_number,
+    "address": Employee.address,
+    "department": Department.name,
+    "job": Job.name,
+    "salary": Employee.salary,
+    "employee_status": EmployeeStatus.name,
+    "manager_id": Employee.manager_id,
+    "hire_date": Employee.hire_date,
+    "created_at": Employee.created_at,
+    "updated_at": Employee.updated_at,
+}
+
+def _filtered(stmt, db: Session, department_id: int | None, include_subdepartments: bool, manager_id: uuid.UUID | None):
+    if manager_id is not None:
+        stmt = stmt.where(Employee.id.in_(get_subordinate_ids(manager_id, db)))
+
+    if department_id is not None and include_subdepartments:
+        # Single indexed join on the closure table instead of walking the tree
+        stmt = stmt.join(department_closure, department_closure.c.descendant_id == Employee.department_id) \
+            .where(department_closure.c.ancestor_id == department_id)
+    elif department_id is not None:
+        stmt = stmt.where(Employee.department_id == department_id)
+
+    return stmt
+
+def _select_fields(fields: list[str]):
+    """SELECT only the requested columns, joining the lookup tables only for the names asked for."""
+    stmt = select(*(EMPLOYEE_FIELD_COLUMNS[field].label(field) for field in fields)).select_from(Employee)
+
+    if "department" in fields:
+        stmt = stmt.join(Department, Employee.department_id == Department.id)
+    if "job" in fields:
+        stmt = stmt.join(Job, Employee.job_id == Job.id)
+    if "employee_status" in fields:
+        stmt = stmt.join(EmployeeStatus, Employee.employee_status_id == EmployeeStatus.id)
+
+    return stmt
+
+def get_all(db: Session, department_id: int | None = None, include_subdepartments: bool = False, manager_id: uuid.UUID | None = None) -> list[Employee]:
+    stmt = _filtered(select(Employee), db, department_id, include_subdepartments, manager_id)
 
-def get_all(db: Session) -> list[Employee]:
-    stmt = select(Employee)
     employees: list[Employee] = db.scalars(stmt).all()
     return employees
 
+def get_all_fields(fields: list[str], db: Session, department_id: int | None = None, include_subdepartments: bool = False, manager_id: uuid.UUID | None = None) -> list[dict]:
+    """Like get_all, but only the requested EmployeeSchema fields as plain dicts."""
+    stmt = _filtered(_select_fields(fields), db, department_id, include_subdepartments, manager_id)
+
+    return [dict(row) for row in db.execute(stmt).mappings()]
+
+def get_direct_reports(manager_id: uuid.UUID, db: Session) -> list[Employee]:
+    stmt = select(Employee).where(Employee.manager_id == manager_id)
+    employees: list[Employee] = db.scalars(stmt).all()
+
+    return employees
+
+def _query_subordinate_ids(manager_id: uuid.UUID, db: Session) -> frozenset[uuid.UUID]:
+    reports = select(Employee.id, literal(1).label("depth")).where(Employee.manager_id == manager_id).cte("reports", recursive=True)
+    reports = reports.union_all(
+        select(Employee.id, reports.c.depth + 1)
+        .join(reports, Employee.manager_id == reports.c.id)
+        # Stops a reporting cycle written behind our back from recursing forever
+        .where(reports.c.depth < MAX_REPORTING_DEPTH)
+    )
+
+    return frozenset(db.scalars(select(reports.c.id)).all())
+
+def get_subordinate_ids(manager_id: uuid.UUID, db: Session) -> frozenset[uuid.UUID]:
+    """IDs of everyone reporting to the manager directly or transitively, served from cache when possible."""
+    subordinate_ids = subordinate_cache.get(manager_id)
+
+    if subordinate_ids is None:
+        subordinate_ids = _query_subordinate_ids(manager_id, db)
+        subordinate_cache.set(manager_id, subordinate_ids)
+
+    return subordinate_ids
+
+def get_manager_chain(employee_id: uuid.UUID, db: Session) -> list[uuid.UUID]:
+    """IDs of the employee's manager, that manager's manager and so on up to the top."""
+    chain = select(Employee.manager_id.label("id"), literal(1).label("depth")) \
+        .where(Employee.id == employee_id, Employee.manager_id.is_not(None)) \
+        .cte("chain", recursive=True)
+    chain = chain.union_all(
+        select(Employee.manager_id, chain.c.depth + 1)
+        .join(chain, Employee.id == chain.c.id)
+        .where(Employee.manager_id.is_not(None), chain.c.depth < MAX_REPORTING_DEPTH)
+    )
+
+    return list(db.scalars(select(chain.c.id).order_by(chain.c.depth)).all())
+
+def set_manager(employee_id: uuid.UUID, manager_id: uuid.UUID | None, db: Session) -> None:
+    # One lock for every reporting line change, disjoint row locks would still let two moves close a longer cycle
+    try:
+        with advisory_lock(db, REPORTING_LINES_LOCK_NAME, REPORTING_LINES_LOCK_TIMEOUT):
+            subtree, old_chain, new_chain = _move_reporting_line(employee_id, manager_id, db)
+    except (OperationalError, TimeoutError):
+        # Deadlocked or timed out against a concurrent change, nothing was written
+        db.rollback()
+        raise ValueError("Reporting lines are being changed concurrently, try again")
+
+    subordinate_cache.move(subtree, old_chain, new_chain)
+
+def _move_reporting_line(employee_id: uuid.UUID, manager_id: uuid.UUID | None, db: Session):
+    employee = db.get(Employee, employee_id)
+
+    if employee is None:
+        raise NameError(f"Employee with ID {employee_id} is not found")
+
+    if manager_id is not None and db.get(Employee, manager_id) is None:
+        db.rollback()
+        raise NameError(f"Manager with ID {manager_id} is not found")
+
+    # Checked against the database, the subordinate cache may be stale when another worker moved someone
+    if manager_id is not None and (manager_id == employee_id or employee_id in get_manager_chain(manager_id, db)):
+        db.rollback()
+        raise ValueError("Employee can not report to themselves or one of their reports")
+
+    subtree = get_subordinate_ids(employee_id, db) | {employee_id}
+
+    old_chain = get_manager_chain(employee_id, db)
+    new_chain = [manager_id, *get_manager_chain(manager_id, db)] if manager_id is not None else []
+
+    try:
+        employee.manager_id = manager_id
+        db.commit()
+    except OperationalError:
+        raise
+    except Exception as err:
+        db.rollback()
+        raise RuntimeError(str(err))
+
+    return subtree, old_chain, new_chain
+
+def _filter_criteria(filters: EmployeeFilterSchema) -> list:
+    criteria = []
+
+    if filters.department_id is not None and filters.include_subdepartments:
+        subtree = select(department_closure.c.descendant_id).where(department_closure.c.ancestor_id == filters.department_id)
+        criteria.append(Employee.department_id.in_(subtree))
+    elif filters.department_id is not None:
+        criteria.append(Employee.department_id == filters.department_id)
+
+    if filters.job_id is not None:
+        criteria.append(Employee.job_id == filters.job_id)
+
+    if filters.employee_status_id is not None:
+        criteria.append(Employee.employee_status_id == filters.employee_status_id)
+
+    return criteria
+
+def _bulk_values(changes: BulkUpdateEmployeeSchema) -> dict:
+    values = {"updated_at": func.now()}
+
+    if changes.salary_percent is not None:
+        values["salary"] = cast(func.round(Employee.salary * (1 + changes.salary_percent / 100)), Integer)
+    elif changes.salary_amount is not None:
+        values["salary"] = Employee.salary + changes.salary_amount
+
+    # Cuts never take a salary below zero
+    if "salary" in values:
+        values["salary"] = case((values["salary"] < 0, 0), else_=values["salary"])
+
+    if changes.job_id is not None:
+        values["job_id"] = changes.job_id
+
+    if changes.employee_status_id is not None:
+        values["employee_status_id"] = changes.employee_status_id
+
+    return values
+
+def bulk_update(changes: BulkUpdateEmployeeSchema, db: Session, dry_run: bool = False) -> int:
+    """Apply the changes to every matching employee in one UPDATE and return how many rows it touches.
+
+    With dry_run only the matching rows are counted and nothing is written.
+    """
+    if changes.job_id is not None and db.get(Job, changes.job_id) is None:
+        raise NameError(f"Job with ID {changes.job_id} is not found")
+
+    if changes.employee_status_id is not None and db.get(EmployeeStatus, changes.employee_status_id) is None:
+        raise NameError(f"Employee status with ID {changes.employee_status_id} is not found")
+
+    criteria = _filter_criteria(changes.filter)
+
+    if dry_run:
+        return db.scalar(select(func.count()).select_from(Employee).where(*criteria))
+
+    stmt = update(Employee).where(*criteria).values(_bulk_values(changes)) \
+        .execution_options(synchronize_session=False)
+
+    try:
+        matched = db.execute(stmt).rowcount
+        bump_data_version("employee", db)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise ValueError("Bulk update violates a constraint")
+    except Exception as err:
+        db.rollback()
+        raise RuntimeError(str(err))
+
+    return matched
+
 def get_by_id(employee_id: str, db: Session) -> Employee | None:
     stmt = select(Employee).where(Employee.id == employee_id)
     employee: Employee | None = db.scalars(stmt).one_or_none()
     
     return employee
 
+def get_fields_by_id(employee_id: uuid.UUID, fields: list[str], db: Session) -> dict | None:
+    row = db.execute(_select_fields(fields).where(Employee.id == employee_id)).mappings().one_or_none()
+
+    return dict(row) if row is not None else None
+
+def get_many(employee_ids: list[uuid.UUID], db: Session) -> dict[uuid.UUID, Employee]:
+    """Employees for the IDs in one IN query, with the names shown in EmployeeSchema joined in."""
+    stmt = select(Employee).where(Employee.id.in_(set(employee_ids))).options(
+        joinedload(Employee.department),
+        joinedload(Employee.job),
+        joinedload(Employee.employee_status)
+    )
+
+    return {employee.id: employee for employee in db.scalars(stmt)}
+
+def get_many_fields(employee_ids: list[uuid.UUID], fields: list[str], db: Session) -> dict[uuid.UUID, dict]:
+    """Like get_many, but only the requested EmployeeSchema fields as plain dicts."""
+    stmt = _select_fields(fields).add_columns(Employee.id.label("_key")).where(Employee.id.in_(set(employee_ids)))
+
+    employees = {}
+    for row in db.execute(stmt).mappings():
+        employee = dict(row)
+        employees[employee.pop("_key")] = employee
+
+    return employees
+
 def get_by_email(email: str, db: Session) -> Employee | None:
     stmt = select(Employee).where(Employee.email_address == email)
     employee: Employee | None = db.scalars(stmt).one_or_none()
@@ -0,0 +1,53 @@
+from threading import Lock
+from app.config import get_settings
+import time
+import uuid
+
+settings = get_settings()
+
+
+class SubordinateCache:
+    """Transitive report sets per manager, kept in process memory.
+
+    Reporting line changes made by this worker patch the cached sets in place;
+    changes made by other workers are picked up once an entry's TTL expires.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[uuid.UUID, tuple[float, frozenset[uuid.UUID]]] = {}
+        self._lock = Lock()
+
+    def get(self, manager_id: uuid.UUID) -> frozenset[uuid.UUID] | None:
+        entry = self._entries.get(manager_id)
+
+        if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+            return None
+
+        return entry[1]
+
+    def set(self, manager_id: uuid.UUID, subordinate_ids: frozenset[uuid.UUID]) -> None:
+        with self._lock:
+            self._entries[manager_id] = (time.monotonic(), subordinate_ids)
+
+    def move(self, subtree: frozenset[uuid.UUID], old_chain: list[uuid.UUID], new_chain: list[uuid.UUID]) -> None:
+        """Move a subtree from under every manager of old_chain to under every manager of new_chain."""
+        with self._lock:
+            for manager_id in old_chain:
+                entry = self._entries.get(manager_id)
+
+                if entry is not None:
+                    self._entries[manager_id] = (entry[0], entry[1] - subtree)
+
+            for manager_id in new_chain:
+                entry = self._entries.get(manager_id)
+
+                if entry is not None:
+                    self._entries[manager_id] = (entry[0], entry[1] | subtree)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+subordinate_cache = SubordinateCache(settings.subordinate_cache_ttl_seconds)
\ No newline at end of file
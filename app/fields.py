@@ -0,0 +1,42 @@
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from sqlalchemy.orm import load_only, selectinload
+from typing import Any
+from app.negotiation import DataResponse
+
+
+def sparse_fields(schema: type[BaseModel]):
+    """Dependency turning `?fields=id,name` into the requested subset of the schema's fields; None when absent."""
+    allowed = schema.model_fields
+
+    def dependency(fields: str | None = None) -> list[str] | None:
+        if fields is None:
+            return None
+
+        requested = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+        unknown = [field for field in requested if field not in allowed]
+
+        if not requested or unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields {', '.join(unknown)}; choose from {', '.join(allowed)}" if unknown else "No fields requested"
+            )
+
+        return requested
+
+    return dependency
+
+def loader_options(model: type, fields: list[str], relationships: dict[str, Any] | None = None, always: tuple = ()) -> list:
+    """load_only for the requested columns, selectinload for the requested relationships and nothing else."""
+    relationships = relationships or {}
+    columns = [getattr(model, field) for field in fields if field not in relationships]
+
+    options = [load_only(*always, *columns)]
+    options.extend(selectinload(relationships[field]) for field in fields if field in relationships)
+
+    return options
+
+def sparse_response(content: Any, headers: dict[str, str] | None = None) -> DataResponse:
+    """Send a fields-narrowed payload as is instead of validating it against the full response model."""
+    return DataResponse(content=jsonable_encoder(content), headers=headers)
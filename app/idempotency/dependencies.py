@@ -0,0 +1,87 @@
+from fastapi import Depends, Header, HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+from typing import Annotated, Any
+from app.auth.dependencies import get_current_principal
+from app.auth.schemas import TokenData
+from app.database import get_session
+from .service import claim, complete, release, IdempotencyKeyMismatch, IdempotencyKeyInProgress
+import hashlib
+
+
+class IdempotentReplay(Exception):
+    """Raised by the dependency to answer a retry with the stored response instead of running the handler."""
+
+    def __init__(self, status_code: int, body: Any):
+        self.status_code = status_code
+        self.body = body
+
+
+async def idempotent_replay_handler(request: Request, exc: IdempotentReplay) -> JSONResponse:
+    return JSONResponse(status_code=exc.status_code, content=exc.body, headers={"Idempotent-Replayed": "true"})
+
+
+class IdempotentRequest:
+    def __init__(self, record_id: int | None = None, db: Session | None = None):
+        self.record_id = record_id
+        self.db = db
+        self.saved = False
+
+    def save(self, body: Any, status_code: int = status.HTTP_200_OK) -> Any:
+        """Remember the handler's response for retries and return it unchanged."""
+        if self.record_id is not None:
+            complete(self.record_id, status_code, body, self.db)
+            self.saved = True
+
+        return body
+
+
+async def request_fingerprint(request: Request) -> str:
+    # The body is cached by Starlette, so the handler can still read it
+    digest = hashlib.sha256()
+    digest.update(f"{request.method} {request.url.path}?{request.url.query}\n".encode())
+    digest.update(await request.body())
+
+    return digest.hexdigest()
+
+def idempotency(scope: str):
+    """Dependency honouring the Idempotency-Key header for a write endpoint.
+
+    Without the header the handler runs as usual. With it, the first request
+    claims the key and the handler stores its response with save(); retries
+    by the same user get that response back without running the handler.
+    A failed request releases the key.
+    """
+
+    def dependency(
+        principal: Annotated[TokenData, Depends(get_current_principal)],
+        fingerprint: Annotated[str, Depends(request_fingerprint)],
+        db: Annotated[Session, Depends(get_session)],
+        idempotency_key: Annotated[str | None, Header(max_length=255)] = None
+    ):
+        if idempotency_key is None:
+            yield IdempotentRequest()
+            return
+
+        try:
+            record_id, stored = claim(str(principal.id), scope, idempotency_key, fingerprint, db)
+        except IdempotencyKeyMismatch as err:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(err))
+        except IdempotencyKeyInProgress as err:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(err))
+
+        if stored is not None:
+            raise IdempotentReplay(*stored)
+
+        request = IdempotentRequest(record_id, db)
+
+        try:
+            yield request
+        except Exception:
+            release(record_id, db)
+            raise
+
+        if not request.saved:
+            release(record_id, db)
+
+    return dependency
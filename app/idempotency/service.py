@@ -0,0 +1,121 @@
+from sqlalchemy import select, update, delete
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from fastapi.encoders import jsonable_encoder
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from app.analytics.utils import ResultCache
+from app.config import get_settings
+from .models import IdempotencyKey
+import json
+
+settings = get_settings()
+
+# Completed responses by (principal, scope, key), so most retries never reach the database
+_completed = ResultCache(max_entries=10_000)
+
+
+class IdempotencyKeyMismatch(Exception):
+    """The key was already used for a request with a different payload."""
+
+
+class IdempotencyKeyInProgress(Exception):
+    """The first request with this key has not finished yet."""
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def _stored(entry: tuple[str, int, Any, datetime], request_hash: str) -> tuple[int, Any] | None:
+    stored_hash, status_code, body, expires_at = entry
+
+    if expires_at <= _utcnow():
+        return None
+
+    if stored_hash != request_hash:
+        raise IdempotencyKeyMismatch("Idempotency-Key was already used with a different request")
+
+    return status_code, body
+
+def claim(principal: str, scope: str, key: str, request_hash: str, db: Session) -> tuple[int | None, tuple[int, Any] | None]:
+    """Claim the key for a new request, or return the stored (status_code, body) of the first one.
+
+    Returns (record_id, None) when the caller should run the handler and
+    (None, response) when it should replay the response.
+    """
+    cached = _completed.get((principal, scope, key))
+
+    if cached is not None and (response := _stored(cached, request_hash)) is not None:
+        return None, response
+
+    now = _utcnow()
+    record: IdempotencyKey | None = db.scalars(
+        select(IdempotencyKey).where(
+            IdempotencyKey.principal == principal,
+            IdempotencyKey.scope == scope,
+            IdempotencyKey.key == key
+        )
+    ).one_or_none()
+
+    if record is not None:
+        abandoned = record.status_code is None and record.created_at <= now - timedelta(seconds=settings.idempotency_lock_seconds)
+
+        if record.expires_at <= now or abandoned:
+            db.delete(record)
+            db.commit()
+        elif record.status_code is None:
+            if record.request_hash != request_hash:
+                raise IdempotencyKeyMismatch("Idempotency-Key was already used with a different request")
+
+            raise IdempotencyKeyInProgress("A request with this Idempotency-Key is still being processed")
+        else:
+            entry = (record.request_hash, record.status_code, json.loads(record.response_body), record.expires_at)
+            _completed.set((principal, scope, key), entry)
+
+            return None, _stored(entry, request_hash)
+
+    # Housekeeping piggybacks on new claims, like token revocation does
+    db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now))
+
+    record = IdempotencyKey(
+        principal=principal,
+        scope=scope,
+        key=key,
+        request_hash=request_hash,
+        created_at=now,
+        expires_at=now + timedelta(hours=settings.idempotency_key_ttl_hours)
+    )
+
+    try:
+        db.add(record)
+        db.commit()
+
+    except IntegrityError:
+        # A concurrent retry claimed it first
+        db.rollback()
+        raise IdempotencyKeyInProgress("A request with this Idempotency-Key is still being processed")
+
+    return record.id, None
+
+def complete(record_id: int, status_code: int, body: Any, db: Session) -> None:
+    """Store the response of a claimed request so retries can replay it."""
+    body = jsonable_encoder(body)
+    record = db.get(IdempotencyKey, record_id)
+
+    if record is None:
+        return
+
+    record.status_code = status_code
+    record.response_body = json.dumps(body)
+    db.commit()
+
+    _completed.set((record.principal, record.scope, record.key), (record.request_hash, status_code, body, record.expires_at))
+
+def release(record_id: int, db: Session) -> None:
+    """Forget a claim whose request failed, so a retry runs the handler again."""
+    db.rollback()
+    db.execute(delete(IdempotencyKey).where(IdempotencyKey.id == record_id, IdempotencyKey.status_code.is_(None)))
+    db.commit()
+
+def clear_idempotency_cache() -> None:
+    _completed.clear()
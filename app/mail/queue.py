@@ -0,0 +1,148 @@
+from email.message import EmailMessage
+from collections import deque
+from dataclasses import dataclass
+from threading import Lock
+from .transport import MailTransport
+import asyncio
+import logging
+
+
+@dataclass
+class _Envelope:
+    message: EmailMessage
+    attempts: int = 0
+
+
+class MailQueue:
+    """Outbound mail delivered by a background task on the event loop.
+
+    enqueue() only appends to a deque, so request handlers (sync or async)
+    return immediately. The worker drains the queue in batches, one SMTP
+    connection per batch in a thread, and retries failed batches with
+    exponential backoff until max_retries is reached.
+    """
+
+    def __init__(self, transport: MailTransport, batch_size: int = 50, max_retries: int = 5, retry_base_seconds: float = 1.0):
+        self.transport = transport
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self._pending: deque[_Envelope] = deque()
+        self._in_flight = 0
+        self._retrying = 0
+        self._lock = Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._worker: asyncio.Task | None = None
+        self.sent = 0
+        self.failed = 0
+
+    def enqueue(self, message: EmailMessage) -> None:
+        """Queue a message; safe to call from any thread. Messages queued before start() wait for it."""
+        with self._lock:
+            self._pending.append(_Envelope(message))
+
+        self._notify()
+
+    def _notify(self) -> None:
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._worker = asyncio.create_task(self._run())
+
+        if self._pending:
+            self._wakeup.set()
+
+    async def stop(self, timeout: float = 5) -> None:
+        """Give queued mail up to `timeout` seconds to go out, then stop the worker."""
+        if self._worker is None:
+            return
+
+        try:
+            await asyncio.wait_for(self.join(), timeout)
+        except TimeoutError:
+            logging.warning(f"Mail queue stopped with {len(self)} messages undelivered")
+
+        self._worker.cancel()
+
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+
+        self._loop = self._wakeup = self._worker = None
+
+    async def join(self) -> None:
+        """Wait until every queued message, including pending retries, is delivered or dropped."""
+        while len(self):
+            await asyncio.sleep(0.01)
+
+    def _next_batch(self) -> list[_Envelope]:
+        with self._lock:
+            batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+            self._in_flight = len(batch)
+
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            while batch := self._next_batch():
+                try:
+                    await self._deliver(batch)
+                finally:
+                    self._in_flight = 0
+
+    async def _deliver(self, batch: list[_Envelope]) -> None:
+        try:
+            rejected = await asyncio.to_thread(self.transport.send_batch, [envelope.message for envelope in batch])
+        except Exception as err:
+            logging.warning(f"Mail batch of {len(batch)} failed: {err}")
+            self._retry(batch)
+            return
+
+        rejected_ids = {id(message) for message in rejected}
+        self.failed += len(rejected_ids)
+        self.sent += len(batch) - len(rejected_ids)
+
+        for envelope in batch:
+            if id(envelope.message) in rejected_ids:
+                logging.error(f"Mail to {envelope.message['To']} was rejected")
+
+    def _retry(self, batch: list[_Envelope]) -> None:
+        retry: list[_Envelope] = []
+
+        for envelope in batch:
+            envelope.attempts += 1
+
+            if envelope.attempts > self.max_retries:
+                self.failed += 1
+                logging.error(f"Giving up on mail to {envelope.message['To']} after {envelope.attempts} attempts")
+            else:
+                retry.append(envelope)
+
+        if not retry:
+            return
+
+        # Envelopes of one batch share an attempt count, so they back off together
+        delay = self.retry_base_seconds * 2 ** (retry[0].attempts - 1)
+        self._retrying += len(retry)
+        self._loop.call_later(delay, self._requeue, retry)
+
+    def _requeue(self, envelopes: list[_Envelope]) -> None:
+        with self._lock:
+            self._pending.extend(envelopes)
+
+        self._retrying -= len(envelopes)
+        self._wakeup.set()
+
+    def stats(self) -> dict:
+        return {"queued": len(self), "sent": self.sent, "failed": self.failed}
+
+    def __len__(self) -> int:
+        return len(self._pending) + self._in_flight + self._retrying
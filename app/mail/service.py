@@ -0,0 +1,35 @@
+from email.message import EmailMessage
+from app.config import get_settings
+from .queue import MailQueue
+from .transport import MailTransport, SMTPTransport, MemoryTransport
+
+settings = get_settings()
+
+def _create_transport() -> MailTransport:
+    if settings.mail_backend == "memory":
+        return MemoryTransport()
+
+    return SMTPTransport(
+        host=settings.smtp_host,
+        port=settings.smtp_port,
+        username=settings.smtp_username,
+        password=settings.smtp_password,
+        use_tls=settings.smtp_use_tls
+    )
+
+mail_queue = MailQueue(
+    _create_transport(),
+    batch_size=settings.mail_batch_size,
+    max_retries=settings.mail_max_retries,
+    retry_base_seconds=settings.mail_retry_base_seconds
+)
+
+def send_mail(to: str, subject: str, body: str) -> None:
+    """Queue a plain text email for background delivery."""
+    message = EmailMessage()
+    message["From"] = settings.mail_from
+    message["To"] = to
+    message["Subject"] = subject
+    message.set_content(body)
+
+    mail_queue.enqueue(message)
@@ -0,0 +1,66 @@
+from email.message import EmailMessage
+from typing import Protocol
+from threading import Lock
+import smtplib
+
+
+class MailTransport(Protocol):
+    """Delivers a batch of messages; called from a worker thread, never the event loop."""
+
+    def send_batch(self, messages: list[EmailMessage]) -> list[EmailMessage]:
+        """Send every message over one connection.
+
+        Returns the messages the server refused for good (e.g. unknown
+        recipient). Raises when the batch could not be sent at all, in which
+        case the whole batch is retried.
+        """
+        ...
+
+
+class SMTPTransport:
+    def __init__(self, host: str, port: int, username: str = "", password: str = "", use_tls: bool = False, timeout: float = 10):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+
+    def send_batch(self, messages: list[EmailMessage]) -> list[EmailMessage]:
+        rejected: list[EmailMessage] = []
+
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.use_tls:
+                smtp.starttls()
+
+            if self.username:
+                smtp.login(self.username, self.password)
+
+            for message in messages:
+                try:
+                    smtp.send_message(message)
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError):
+                    rejected.append(message)
+
+        return rejected
+
+
+class MemoryTransport:
+    """Local stand-in for an SMTP server: keeps delivered messages in `outbox`."""
+
+    def __init__(self):
+        self.outbox: list[EmailMessage] = []
+        self.batches: list[int] = []
+        self._lock = Lock()
+
+    def send_batch(self, messages: list[EmailMessage]) -> list[EmailMessage]:
+        with self._lock:
+            self.outbox.extend(messages)
+            self.batches.append(len(messages))
+
+        return []
+
+    def clear(self) -> None:
+        with self._lock:
+            self.outbox.clear()
+            self.batches.clear()
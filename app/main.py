@@ -1,136 +1,71 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 # from app.routers import auth, department, user
 # from app.dependencies import database, setting
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy import select, insert
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from app.config import get_settings
-from app.database import get_session, list_of_tables
+from app.database import Session, replica_engines, stick_to_primary
 from app.auth.router import router as auth_router
-from app.auth.utils import get_password_hash
-from app.auth.models import User
-from app.policy.models import Role, Permission, role_permissions
+from app.bootstrap.service import run_bootstrap, create_first_superuser, create_all_permissions, create_role_sa
 from app.department.router import router as department_router
 from app.employee.router import router as employee_router
 from app.presence.router import router as presence_router
 from app.policy.router import role_router, permission_router
+from app.analytics.router import router as analytics_router
+from app.payroll.router import router as payroll_router
+from app.work_calendar.router import router as calendar_router
+from app.presence.service import ABSENCE_JOB_NAME, mark_absences
+from app.scheduler.service import schedule_daily
+from app.mail.service import mail_queue
+from app.idempotency.dependencies import IdempotentReplay, idempotent_replay_handler
+from app.compression import CompressionMiddleware
+import asyncio
 import logging
 
 settings = get_settings()
 
-def create_first_superuser(db: Session) -> None:
-    print("Checking for superuser...")
-    username: str = settings.superuser_username
-    password: str = settings.superuser_password
-
-    if username == "" or password == "":
-        logging.warning("Superuser credentials are not set. Skipping superuser creation.")
-        return
-
-    password_hashed: str = get_password_hash(password)
-   
-    stmt = select(User).where(User.username == username)
-
-    user = db.scalars(stmt).one_or_none()
-
-    if not user:
-        new_user: User = User(
-            username=username,
-            password_hash=password_hashed,
-            is_superuser=True
-        )
-
-        db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
-
-        print("Superuser created successfully.")
-    
-    else:
-        print("Superuser already exists. Skipping creation.")
-
-# Create role system administrator
-def create_role_sa(db: Session):
-    role = Role(
-        name="System Administrator",
-        description="Full access of management and system configuration"
-    )
-
-    try:
-        db.add(role)
-        db.commit()
-        db.refresh(role)
-
-        stmt = select(Permission.id)
-        permissions_ids = db.scalars(stmt).all()
-
-        role_permissions_to_insert = [
-            {
-                "role_id": role.id,
-                "permission_id": permission_id
-            }
-            for permission_id in permissions_ids
-        ]
-
-        db.execute(role_permissions.insert(), role_permissions_to_insert)
-        db.commit()
-
-    except IntegrityError:
-        db.rollback()
-        print("System Administrator had already created")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    with Session() as db:
+        if run_bootstrap(db):
+            logging.info("Bootstrap applied")
 
-    except Exception as err:
-        db.rollback()
-        print("Failed to create system administrator")
+    await mail_queue.start()
+    jobs: list[asyncio.Task] = []
 
-# Create all permissions for all resource
-def create_all_permissions(db: Session):
-    actions = ["create", "read", "update", "delete", "list"]
+    if settings.absence_job_enabled:
+        jobs.append(asyncio.create_task(schedule_daily(ABSENCE_JOB_NAME, mark_absences, settings.absence_job_time, Session)))
 
-    resources = list_of_tables
-    permissions: list[Permission] = []
+    yield
 
-    for resource in resources:
-        if "alembic" in resource:
-            continue
-        
-        name = " ".join(resource.split("_")).capitalize()
+    for job in jobs:
+        job.cancel()
 
-        for action in actions:
-            permission = Permission(
-                name=f"{action.capitalize()} {name}",
-                resource=resource,
-                action=action,
-                description="",
-            )
+        with suppress(asyncio.CancelledError):
+            await job
 
-            permissions.append(permission)
+    await mail_queue.stop()
+    logging.info("Application shutdown")
 
-    try:
-        db.add_all(permissions)
-        db.commit()
+app = FastAPI(lifespan=lifespan)
+app.add_exception_handler(IdempotentReplay, idempotent_replay_handler)
 
-    except IntegrityError as err:
-        db.rollback()
-        print("All permission had already created")
+# Keep the client on the primary after a write so it can read its own changes
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    response = await call_next(request)
 
-    except Exception:
-        db.rollback()
-        print("Failed to create all permissions")
+    if replica_engines and request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        stick_to_primary(response)
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    db: Session = next(get_session())
+    return response
 
-    create_first_superuser(db)
-    # create_all_permissions(db)
-    # create_role_sa(db)
-
-    yield
-    logging.info("Application shutdown")
-
-app = FastAPI(lifespan=lifespan)
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.compression_gzip_level,
+        zstd_level=settings.compression_zstd_level
+    )
 
 app.include_router(auth_router)
 app.include_router(employee_router)
@@ -138,6 +73,9 @@ app.include_router(department_router)
 app.include_router(presence_router)
 app.include_router(role_router)
 app.include_router(permission_router)
+app.include_router(analytics_router)
+app.include_router(payroll_router)
+app.include_router(calendar_router)
 
 @app.get("/healthcheck", include_in_schema=False)
 def healthcheck():
@@ -0,0 +1,91 @@
+from contextlib import contextmanager
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.responses import Response
+from app.compression import quality_values
+from typing import Any
+import fastapi.routing
+import msgpack
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+
+def prefers_msgpack(accept: str) -> bool:
+    """True when the Accept header names MessagePack at least as highly as JSON."""
+    if not accept:
+        return False
+
+    weights = quality_values(accept)
+    msgpack_quality = max(weights.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES)
+    json_quality = weights.get("application/json", weights.get("application/*", weights.get("*/*", 0.0)))
+
+    return msgpack_quality > 0 and msgpack_quality >= json_quality
+
+
+class MsgPackResponse(Response):
+    media_type = MSGPACK_MEDIA_TYPES[0]
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content)
+
+
+class DataResponse(JSONResponse):
+    """JSONResponse that keeps its content, so a MessagePack route can render it again."""
+
+    def __init__(self, content: Any, *args, **kwargs):
+        self.content = content
+        super().__init__(content, *args, **kwargs)
+
+
+@contextmanager
+def _response_class(route: APIRoute, response_class: type[Response]):
+    """Build a handler with another response class, on the route and on the inclusion context being built."""
+    # FastAPI builds handlers of included routes from a per-inclusion copy of the route
+    context_var = getattr(fastapi.routing, "_effective_route_context_var", None)
+    context = context_var.get() if context_var is not None else None
+    targets = [route] + ([context] if context is not None and getattr(context, "original_route", None) is route else [])
+    previous = [target.response_class for target in targets]
+
+    for target in targets:
+        target.response_class = response_class
+
+    try:
+        yield
+    finally:
+        for target, value in zip(targets, previous):
+            target.response_class = value
+
+
+class MsgPackRoute(APIRoute):
+    """Route answering in MessagePack when the request's Accept header prefers it, JSON otherwise.
+
+    Each route gets two handlers. JSON clients keep FastAPI's direct
+    model-to-JSON path; MessagePack clients get the validated response model
+    dumped to Python and packed, never passing through JSON. Payloads built by
+    hand (DataResponse) are packed from the content they keep.
+    """
+
+    def get_route_handler(self):
+        json_handler = super().get_route_handler()
+
+        with _response_class(self, MsgPackResponse):
+            msgpack_handler = super().get_route_handler()
+
+        async def negotiated_handler(request: Request) -> Response:
+            if not prefers_msgpack(request.headers.get("accept", "")):
+                response = await json_handler(request)
+                response.headers.add_vary_header("Accept")
+                return response
+
+            response = await msgpack_handler(request)
+            response.headers.add_vary_header("Accept")
+
+            if not isinstance(response, DataResponse):
+                return response
+
+            headers = {name: value for name, value in response.headers.items() if name not in ("content-length", "content-type")}
+
+            return MsgPackResponse(response.content, status_code=response.status_code, headers=headers, background=response.background)
+
+        return negotiated_handler
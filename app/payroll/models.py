@@ -0,0 +1,43 @@
+from app.database import Base
+from sqlalchemy import ForeignKey, Uuid, UniqueConstraint, Numeric
+from sqlalchemy.orm import mapped_column, Mapped, relationship
+from sqlalchemy.sql import func
+from datetime import datetime, date
+from decimal import Decimal
+import uuid
+
+
+class PayrollRun(Base):
+    __tablename__ = "payroll_runs"
+    __table_args__ = (UniqueConstraint("period_start", "period_end"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    period_start: Mapped[date] = mapped_column(nullable=False)
+    period_end: Mapped[date] = mapped_column(nullable=False)
+    working_days: Mapped[int] = mapped_column(nullable=False)
+    employee_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    total_net_pay: Mapped[int] = mapped_column(nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+
+    items: Mapped[list["PayrollItem"]] = relationship(back_populates="payroll_run", cascade="all, delete-orphan")
+
+
+class PayrollItem(Base):
+    __tablename__ = "payroll_items"
+    __table_args__ = (UniqueConstraint("payroll_run_id", "employee_id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    payroll_run_id: Mapped[int] = mapped_column(ForeignKey("payroll_runs.id", ondelete="CASCADE"), nullable=False)
+    employee_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), ForeignKey("employee.id"), nullable=False, index=True)
+    base_salary: Mapped[int] = mapped_column(nullable=False)
+    # Of the employee's department calendar; the run's working_days uses the default calendar
+    working_days: Mapped[int] = mapped_column(nullable=False, default=0)
+    present_days: Mapped[int] = mapped_column(nullable=False, default=0)
+    absent_days: Mapped[int] = mapped_column(nullable=False, default=0)
+    leave_days: Mapped[int] = mapped_column(nullable=False, default=0)
+    overtime_hours: Mapped[Decimal] = mapped_column(Numeric(8, 2), nullable=False, default=0)
+    absence_deduction: Mapped[int] = mapped_column(nullable=False, default=0)
+    overtime_pay: Mapped[int] = mapped_column(nullable=False, default=0)
+    net_pay: Mapped[int] = mapped_column(nullable=False)
+
+    payroll_run: Mapped["PayrollRun"] = relationship(back_populates="items")
\ No newline at end of file
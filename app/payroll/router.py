@@ -0,0 +1,69 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Annotated
+from sqlalchemy.orm import Session
+from app.database import get_session, get_read_session
+from app.policy.dependencies import require_permission
+from .schemas import CreatePayrollRunSchema, PayrollRunSchema, PayrollRunsSchema, PayrollItemSchema, PayrollItemsSchema
+from .service import run_payroll, get_run, get_runs, get_items
+
+router = APIRouter(prefix="/payroll", tags=["Payroll"])
+
+def to_run_schema(payroll_run) -> PayrollRunSchema:
+    return PayrollRunSchema(
+        id=payroll_run.id,
+        period_start=payroll_run.period_start,
+        period_end=payroll_run.period_end,
+        working_days=payroll_run.working_days,
+        employee_count=payroll_run.employee_count,
+        total_net_pay=payroll_run.total_net_pay,
+        created_at=payroll_run.created_at
+    )
+
+@router.post("/runs", dependencies=[Depends(require_permission("payroll_runs", "create"))], status_code=status.HTTP_201_CREATED)
+def create_payroll_run(payroll: CreatePayrollRunSchema, db: Annotated[Session, Depends(get_session)]) -> PayrollRunSchema:
+    try:
+        payroll_run = run_payroll(payroll.period_start, payroll.period_end, db)
+    except ValueError as ve:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(ve))
+    except RuntimeError as re:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(re))
+
+    return to_run_schema(payroll_run)
+
+@router.get("/runs", dependencies=[Depends(require_permission("payroll_runs", "list"))])
+def get_payroll_runs(db: Annotated[Session, Depends(get_read_session)]) -> PayrollRunsSchema:
+    return PayrollRunsSchema(data=[to_run_schema(payroll_run) for payroll_run in get_runs(db)])
+
+@router.get("/runs/{id}", dependencies=[Depends(require_permission("payroll_runs", "read"))])
+def get_payroll_run(id: int, db: Annotated[Session, Depends(get_read_session)]) -> PayrollRunSchema:
+    payroll_run = get_run(id, db)
+
+    if not payroll_run:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Payroll run not found")
+
+    return to_run_schema(payroll_run)
+
+@router.get("/runs/{id}/items", dependencies=[Depends(require_permission("payroll_items", "list"))])
+def get_payroll_items(
+    id: int,
+    db: Annotated[Session, Depends(get_read_session)],
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+    offset: Annotated[int, Query(ge=0)] = 0
+) -> PayrollItemsSchema:
+    if not get_run(id, db):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Payroll run not found")
+
+    items = get_items(id, db, limit=limit, offset=offset)
+
+    return PayrollItemsSchema(data=[PayrollItemSchema(
+        employee_id=item.employee_id,
+        base_salary=item.base_salary,
+        working_days=item.working_days,
+        present_days=item.present_days,
+        absent_days=item.absent_days,
+        leave_days=item.leave_days,
+        overtime_hours=item.overtime_hours,
+        absence_deduction=item.absence_deduction,
+        overtime_pay=item.overtime_pay,
+        net_pay=item.net_pay
+    ) for item in items])
@@ -0,0 +1,47 @@
+from pydantic import BaseModel, model_validator
+from datetime import date, datetime
+from decimal import Decimal
+import uuid
+
+
+class CreatePayrollRunSchema(BaseModel):
+    period_start: date
+    period_end: date
+
+    @model_validator(mode="after")
+    def check_period(self):
+        if self.period_end < self.period_start:
+            raise ValueError("period_end must not be before period_start")
+
+        return self
+
+
+class PayrollRunSchema(BaseModel):
+    id: int
+    period_start: date
+    period_end: date
+    working_days: int
+    employee_count: int
+    total_net_pay: int
+    created_at: datetime | None = None
+
+
+class PayrollRunsSchema(BaseModel):
+    data: list[PayrollRunSchema]
+
+
+class PayrollItemSchema(BaseModel):
+    employee_id: uuid.UUID
+    base_salary: int
+    working_days: int
+    present_days: int
+    absent_days: int
+    leave_days: int
+    overtime_hours: Decimal
+    absence_deduction: int
+    overtime_pay: int
+    net_pay: int
+
+
+class PayrollItemsSchema(BaseModel):
+    data: list[PayrollItemSchema]
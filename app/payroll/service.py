@@ -0,0 +1,248 @@
+from sqlalchemy import select, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from datetime import date, datetime, time, timedelta
+from app.config import get_settings
+from app.employee.models import Employee, EmployeeStatus
+from app.presence.models import Presence, StatusType
+from app.work_calendar.service import get_department_calendar_ids
+from app.work_calendar.utils import BusinessCalendar, get_business_calendar
+from .models import PayrollRun, PayrollItem
+import numpy as np
+
+settings = get_settings()
+
+def count_working_days(period_start: date, period_end: date, db: Session, calendar_id: int | None = None) -> int:
+    """Working days of the calendar between both dates, inclusive."""
+    return get_business_calendar(calendar_id, db).count_working_days(period_start, period_end)
+
+def _employee_calendars(department_ids: np.ndarray, db: Session) -> tuple[list[BusinessCalendar], np.ndarray]:
+    """Distinct calendars in use and, per employee, the position of their department's calendar."""
+    departments, department_index = np.unique(department_ids, return_inverse=True)
+    calendar_ids = get_department_calendar_ids(db, departments.tolist())
+    distinct = list(dict.fromkeys(calendar_ids[department_id] for department_id in departments.tolist()))
+    calendars = [get_business_calendar(calendar_id, db) for calendar_id in distinct]
+
+    per_department = np.array([distinct.index(calendar_ids[department_id]) for department_id in departments.tolist()], dtype=np.int64)
+
+    return calendars, per_department[department_index]
+
+def compute_payroll(
+    salaries: np.ndarray,
+    working_days: np.ndarray | int,
+    present_days: np.ndarray,
+    absent_days: np.ndarray,
+    overtime_hours: np.ndarray,
+    standard_hours: float,
+    overtime_multiplier: float,
+    employed_days: np.ndarray | None = None
+) -> dict[str, np.ndarray]:
+    """Pay for every employee at once; all arrays are aligned by employee position.
+
+    employed_days prorates the salary of employees hired during the period,
+    it defaults to the full working_days.
+    """
+    daily_rate = salaries / np.maximum(working_days, 1)
+    hourly_rate = daily_rate / standard_hours
+
+    if employed_days is None:
+        earned = salaries.astype(np.int64)
+    else:
+        earned = np.rint(np.minimum(daily_rate * employed_days, salaries)).astype(np.int64)
+
+    absence_deduction = np.rint(np.minimum(daily_rate * absent_days, earned)).astype(np.int64)
+    overtime_pay = np.rint(hourly_rate * overtime_hours * overtime_multiplier).astype(np.int64)
+
+    return {
+        "absence_deduction": absence_deduction,
+        "overtime_pay": overtime_pay,
+        "net_pay": earned - absence_deduction + overtime_pay,
+    }
+
+def _load_employees(period_end: datetime, db: Session) -> tuple[list, np.ndarray, np.ndarray, np.ndarray]:
+    """Active employees hired before the period ends, with salary, department and hire day."""
+    stmt = (
+        select(Employee.id, Employee.salary, Employee.department_id, Employee.hire_date)
+        .join(EmployeeStatus, Employee.employee_status_id == EmployeeStatus.id)
+        .where(EmployeeStatus.is_active.is_(True), Employee.hire_date < period_end)
+        .order_by(Employee.id)
+    )
+    rows = db.execute(stmt).all()
+
+    if not rows:
+        return [], np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype="datetime64[D]")
+
+    employee_ids, salaries, department_ids, hire_dates = zip(*rows)
+
+    return (
+        list(employee_ids),
+        np.array([salary or 0 for salary in salaries], dtype=np.int64),
+        np.array(department_ids, dtype=np.int64),
+        np.array(hire_dates, dtype="datetime64[D]")
+    )
+
+def _load_attendance(
+    employee_ids: list,
+    calendars: list[BusinessCalendar],
+    employee_calendar: np.ndarray,
+    period_start: datetime,
+    period_end: datetime,
+    standard_hours: float,
+    db: Session
+):
+    """Per-employee present/absent/leave day counts and overtime hours, aggregated with bincount.
+
+    Absences recorded on a non-working day of the employee's calendar are not counted.
+    """
+    count = len(employee_ids)
+    stmt = select(Presence.employee_id, Presence.status, Presence.created_at, Presence.clock_in, Presence.clock_out) \
+        .where(Presence.created_at >= period_start, Presence.created_at < period_end)
+    rows = db.execute(stmt).all()
+
+    if not rows:
+        zeros = np.zeros(count, dtype=np.int64)
+        return zeros, zeros, zeros, np.zeros(count, dtype=np.float64)
+
+    position = {employee_id: index for index, employee_id in enumerate(employee_ids)}
+    presence_employee, statuses, created_at, clock_in, clock_out = zip(*rows)
+
+    index = np.fromiter((position.get(employee_id, -1) for employee_id in presence_employee), dtype=np.int64, count=len(rows))
+    statuses = np.array([str(status) for status in statuses])
+    days = np.array(created_at, dtype="datetime64[D]")
+    clock_in = np.array(clock_in, dtype="datetime64[s]")
+    clock_out = np.array(clock_out, dtype="datetime64[s]")
+
+    # Presences of employees outside the run (e.g. hired after the period) are ignored
+    known = index >= 0
+    index, statuses, days, clock_in, clock_out = index[known], statuses[known], days[known], clock_in[known], clock_out[known]
+
+    # One vectorised bitmap lookup per calendar in use
+    working = np.zeros(len(index), dtype=bool)
+    calendar_index = employee_calendar[index]
+
+    for position, calendar in enumerate(calendars):
+        uses_calendar = calendar_index == position
+        working[uses_calendar] = calendar.is_working_day(days[uses_calendar])
+
+    present = statuses == StatusType.PRESENT
+    absent = (statuses == StatusType.ABSENT) & working
+    leave = statuses == StatusType.ON_LEAVE
+
+    worked_hours = (clock_out - clock_in) / np.timedelta64(1, "h")
+    overtime = np.nan_to_num(np.clip(worked_hours - standard_hours, 0, None), nan=0.0) * present
+
+    return (
+        np.bincount(index[present], minlength=count),
+        np.bincount(index[absent], minlength=count),
+        np.bincount(index[leave], minlength=count),
+        np.bincount(index, weights=overtime, minlength=count),
+    )
+
+def run_payroll(period_start: date, period_end: date, db: Session) -> PayrollRun:
+    """Compute and store the payroll of every employee for the period in one batch."""
+    if period_end < period_start:
+        raise ValueError("Period end must not be before period start")
+
+    standard_hours = settings.payroll_standard_hours_per_day
+    start = datetime.combine(period_start, time.min)
+    end = datetime.combine(period_end + timedelta(days=1), time.min)
+
+    working_days = count_working_days(period_start, period_end, db)
+    employee_ids, salaries, department_ids, hire_dates = _load_employees(end, db)
+    calendars, employee_calendar = _employee_calendars(department_ids, db)
+    employee_working_days = np.array(
+        [calendar.count_working_days(period_start, period_end) for calendar in calendars],
+        dtype=np.int64
+    )[employee_calendar]
+
+    # Employees hired during the period are paid from their hire date
+    employed_since = np.maximum(hire_dates, np.datetime64(period_start, "D"))
+    employed_days = np.zeros(len(employee_ids), dtype=np.int64)
+
+    for position, calendar in enumerate(calendars):
+        uses_calendar = employee_calendar == position
+        employed_days[uses_calendar] = calendar.count_working_days_since(employed_since[uses_calendar], period_end)
+    present, absent, leave, overtime_hours = _load_attendance(employee_ids, calendars, employee_calendar, start, end, standard_hours, db)
+
+    pay = compute_payroll(
+        salaries,
+        employee_working_days,
+        present,
+        absent,
+        overtime_hours,
+        standard_hours,
+        settings.payroll_overtime_multiplier,
+        employed_days
+    )
+
+    payroll_run = PayrollRun(
+        period_start=period_start,
+        period_end=period_end,
+        working_days=working_days,
+        employee_count=len(employee_ids),
+        total_net_pay=int(pay["net_pay"].sum())
+    )
+
+    try:
+        db.add(payroll_run)
+        db.flush()
+
+        if employee_ids:
+            items = [
+                {
+                    "payroll_run_id": payroll_run.id,
+                    "employee_id": employee_id,
+                    "base_salary": base_salary,
+                    "working_days": item_working_days,
+                    "present_days": present_days,
+                    "absent_days": absent_days,
+                    "leave_days": leave_days,
+                    "overtime_hours": round(hours, 2),
+                    "absence_deduction": deduction,
+                    "overtime_pay": overtime_pay,
+                    "net_pay": net_pay,
+                }
+                for employee_id, base_salary, item_working_days, present_days, absent_days, leave_days, hours, deduction, overtime_pay, net_pay in zip(
+                    employee_ids,
+                    salaries.tolist(),
+                    employed_days.tolist(),
+                    present.tolist(),
+                    absent.tolist(),
+                    leave.tolist(),
+                    overtime_hours.tolist(),
+                    pay["absence_deduction"].tolist(),
+                    pay["overtime_pay"].tolist(),
+                    pay["net_pay"].tolist()
+                )
+            ]
+
+            # executemany, batched by the driver instead of one ORM flush per row
+            db.execute(insert(PayrollItem), items)
+
+        db.commit()
+
+    except IntegrityError:
+        db.rollback()
+        raise ValueError(f"Payroll for {period_start} to {period_end} has already been run")
+
+    except Exception as err:
+        db.rollback()
+        raise RuntimeError(str(err))
+
+    return payroll_run
+
+def get_run(run_id: int, db: Session) -> PayrollRun | None:
+    return db.get(PayrollRun, run_id)
+
+def get_runs(db: Session) -> list[PayrollRun]:
+    stmt = select(PayrollRun).order_by(PayrollRun.period_start.desc())
+    runs: list[PayrollRun] = db.scalars(stmt).all()
+
+    return runs
+
+def get_items(run_id: int, db: Session, limit: int = 100, offset: int = 0) -> list[PayrollItem]:
+    stmt = select(PayrollItem).where(PayrollItem.payroll_run_id == run_id) \
+        .order_by(PayrollItem.id).limit(limit).offset(offset)
+    items: list[PayrollItem] = db.scalars(stmt).all()
+
+    return items
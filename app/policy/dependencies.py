@@ -1,15 +1,17 @@
-from app.auth.models import User
-from app.auth.dependencies import get_current_user
+from app.auth.dependencies import get_current_principal
+from app.auth.schemas import TokenData
+from app.database import get_session
 from fastapi import Depends, HTTPException, status
+from sqlalchemy.orm import Session
 from typing import Annotated
 from .utils import has_permission
 
 
 def require_permission(resource: str, action:str):
-    def permission_dependency(current_user: Annotated[User, Depends(get_current_user)]):
-        if not has_permission(current_user, resource, action):
+    def permission_dependency(principal: Annotated[TokenData, Depends(get_current_principal)], db: Annotated[Session, Depends(get_session)]):
+        if not has_permission(principal, resource, action, db):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"Permission denied: {action} on {resource}")
 
-        return current_user
+        return principal
 
     return permission_dependency
\ No newline at end of file
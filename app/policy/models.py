@@ -20,6 +20,12 @@ class Role(Base):
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(50), unique=True, index=True)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Bumped whenever the role's effective permissions change, embedded in access tokens
+    permission_version: Mapped[int] = mapped_column(server_default="1", default=1, nullable=False)
+    # Row version for optimistic concurrency on admin edits
+    version: Mapped[int] = mapped_column(server_default="1", nullable=False)
+
+    __mapper_args__ = {"version_id_col": version}
 
     users: Mapped[list["User"]] = Relationship(back_populates="role")
     permissions: Mapped[list["Permission"]] = Relationship(secondary=role_permissions, back_populates="roles")
@@ -33,5 +39,10 @@ class Permission(Base):
     resource: Mapped[str] = mapped_column(String(100))
     action: Mapped[str] = mapped_column(String(50))
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    version: Mapped[int] = mapped_column(server_default="1", nullable=False)
+
+    __mapper_args__ = {"version_id_col": version}
+    # IDs are bit positions in access tokens, SQLite must not reuse a deleted one
+    __table_args__ = {"sqlite_autoincrement": True}
 
     roles: Mapped[list["Role"]] = Relationship(secondary=role_permissions, back_populates="permissions")
\ No newline at end of file
@@ -1,14 +1,24 @@
 from app.auth.models import User
-from app.database import get_session
-from fastapi import APIRouter, status, Depends, HTTPException
+from app.database import get_session, get_read_session
+from fastapi import APIRouter, status, Depends, HTTPException, Response
+from app.negotiation import MsgPackRoute
+from app.concurrency import VersionConflict, etag, if_match_version
+from app.fields import sparse_fields, sparse_response
 from typing import Annotated
 from sqlalchemy.orm import Session
 from .dependencies import require_permission
-from .schemas import CreateRoleSchema, RoleSchema, CreatePermissionSchema, PermissionSchema
-from .service import create_r, get_all_roles, get_r_by_id, update_r, delete_r, create_p, get_permissions, get_p_by_id, update_p, delete_p
+from .schemas import CreateRoleSchema, RoleSchema, CreatePermissionSchema, PermissionSchema, RolePermissionsSchema, GrantPermissionsSchema
+from .models import Role
+from .service import create_r, get_all_roles, get_r_by_id, update_r, delete_r, create_p, get_permissions, get_p_by_id, update_p, delete_p, set_role_permissions, grant_permissions
 
-role_router = APIRouter(prefix="/roles")
-permission_router = APIRouter(prefix="/permission")
+role_router = APIRouter(prefix="/roles", route_class=MsgPackRoute)
+permission_router = APIRouter(prefix="/permission", route_class=MsgPackRoute)
+
+def to_sparse_role(role: Role, fields: list[str]) -> dict:
+    return {
+        field: [PermissionSchema.model_validate(permission) for permission in role.permissions] if field == "permissions" else getattr(role, field)
+        for field in fields
+    }
 
 @role_router.post("/", status_code=status.HTTP_201_CREATED, dependencies=[Depends(require_permission("roles", "create"))])
 def create_role(role: CreateRoleSchema, db: Annotated[Session, Depends(get_session)]):
@@ -24,32 +34,55 @@ def create_role(role: CreateRoleSchema, db: Annotated[Session, Depends(get_sessi
     }
 
 @role_router.get("/", response_model=list[RoleSchema], dependencies=[Depends(require_permission("roles", "list"))])
-def get_roles(db: Annotated[Session, Depends(get_session)]):
-    roles = get_all_roles(db)
+def get_roles(db: Annotated[Session, Depends(get_read_session)], fields: Annotated[list[str] | None, Depends(sparse_fields(RoleSchema))]):
+    roles = get_all_roles(db, fields=fields)
+
+    if fields is not None:
+        return sparse_response([to_sparse_role(role, fields) for role in roles])
 
     return roles
 
 @role_router.get("/{id}", response_model=RoleSchema, dependencies=[Depends(require_permission("roles", "read"))])
-def get_role(id: int, db: Annotated[Session, Depends(get_session)]):
-    role = get_r_by_id(id, db)
+def get_role(
+    id: int,
+    db: Annotated[Session, Depends(get_read_session)],
+    response: Response,
+    fields: Annotated[list[str] | None, Depends(sparse_fields(RoleSchema))]
+):
+    role = get_r_by_id(id, db, fields=fields)
 
     if not role:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Role is not found")
+
+    if fields is not None:
+        return sparse_response(to_sparse_role(role, fields), headers={"ETag": etag(role.version)})
+
+    response.headers["ETag"] = etag(role.version)
     
     return role
 
 @role_router.put("/{id}", dependencies=[Depends(require_permission("roles", "update"))])
-def update_role(id: int, role: CreateRoleSchema, db: Annotated[Session, Depends(get_session)]):
+def update_role(
+    id: int,
+    role: CreateRoleSchema,
+    db: Annotated[Session, Depends(get_session)],
+    expected_version: Annotated[int | None, Depends(if_match_version)],
+    response: Response
+):
     try:
-        update_r(
+        version = update_r(
             id,
             role.name,
             role.description,
-            db
+            db,
+            expected_version=expected_version
         )
     
     except NameError as err:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(err))
+
+    except VersionConflict as err:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(err))
     
     except ValueError as err:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(err))
@@ -57,6 +90,8 @@ def update_role(id: int, role: CreateRoleSchema, db: Annotated[Session, Depends(
     except RuntimeError as err:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(err))
     
+    response.headers["ETag"] = etag(version)
+
     return {
         "msg": "Success updated role"
     }
@@ -79,6 +114,39 @@ def delete_role(id: int, db: Annotated[Session, Depends(get_session)]):
         "msg": "Success deleted role"
     }
 
+@role_router.put("/{id}/permissions", dependencies=[Depends(require_permission("roles", "update"))])
+def update_role_permissions(id: int, body: RolePermissionsSchema, db: Annotated[Session, Depends(get_session)]):
+    try:
+        added, removed = set_role_permissions(id, set(body.permission_ids), db)
+
+    except NameError as err:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(err))
+
+    except RuntimeError as err:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(err))
+
+    return {
+        "msg": "Success updated role permissions",
+        "added": added,
+        "removed": removed
+    }
+
+@role_router.post("/permissions/grant", dependencies=[Depends(require_permission("roles", "update"))])
+def grant_role_permissions(body: GrantPermissionsSchema, db: Annotated[Session, Depends(get_session)]):
+    try:
+        granted = grant_permissions(set(body.role_ids), set(body.permission_ids), db)
+
+    except NameError as err:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(err))
+
+    except RuntimeError as err:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(err))
+
+    return {
+        "msg": "Success granted permissions",
+        "granted": granted
+    }
+
 # Permission router
 @permission_router.post("/", status_code=status.HTTP_201_CREATED, dependencies=[Depends(require_permission("permissions", "create"))])
 def create_permission(permission: CreatePermissionSchema, db: Annotated[Session, Depends(get_session)]):
@@ -100,34 +168,46 @@ def create_permission(permission: CreatePermissionSchema, db: Annotated[Session,
     }
 
 @permission_router.get("/", response_model=list[PermissionSchema], dependencies=[Depends(require_permission("permissions", "list"))])
-def get_all_permissions(db: Annotated[Session, Depends(get_session)]):
+def get_all_permissions(db: Annotated[Session, Depends(get_read_session)]):
     permissions = get_permissions(db)
 
     return permissions
 
 @permission_router.get("/{id}", response_model=PermissionSchema, dependencies=[Depends(require_permission("permissions", "read"))])
-def get_permission(id: int, db: Annotated[Session, Depends(get_session)]):
+def get_permission(id: int, db: Annotated[Session, Depends(get_read_session)], response: Response):
     permission = get_p_by_id(id, db)
 
     if not permission:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Permission is not found")
+
+    response.headers["ETag"] = etag(permission.version)
     
     return permission
 
 @permission_router.put("/{id}", dependencies=[Depends(require_permission("permissions", "update"))])
-def update_permission(id: int, permission: CreatePermissionSchema, db: Annotated[Session, Depends(get_session)]):
+def update_permission(
+    id: int,
+    permission: CreatePermissionSchema,
+    db: Annotated[Session, Depends(get_session)],
+    expected_version: Annotated[int | None, Depends(if_match_version)],
+    response: Response
+):
     try:
-        update_p(
+        version = update_p(
             id,
             permission.name,
             permission.resource,
             permission.action,
             permission.description,
-            db
+            db,
+            expected_version=expected_version
         )
     
     except NameError as err:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(err))
+
+    except VersionConflict as err:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(err))
     
     except ValueError as err:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(err))
@@ -135,6 +215,8 @@ def update_permission(id: int, permission: CreatePermissionSchema, db: Annotated
     except RuntimeError as err:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(err))
     
+    response.headers["ETag"] = etag(version)
+
     return {
         "msg": "Success updated permission"
     }
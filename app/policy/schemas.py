@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from enum import StrEnum
 
@@ -18,6 +18,7 @@ class CreateRoleSchema(BaseModel):
 
 class RoleSchema(CreateRoleSchema):
     id: int
+    version: int = 1
     permissions: list["PermissionSchema"] = []
 
     model_config = ConfigDict(from_attributes=True)
@@ -32,5 +33,16 @@ class CreatePermissionSchema(BaseModel):
 
 class PermissionSchema(CreatePermissionSchema):
     id: int
+    version: int = 1
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RolePermissionsSchema(BaseModel):
+    # The complete set the role should hold afterwards
+    permission_ids: list[int]
+
+
+class GrantPermissionsSchema(BaseModel):
+    role_ids: list[int] = Field(min_length=1)
+    permission_ids: list[int] = Field(min_length=1)
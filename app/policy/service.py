@@ -1,7 +1,25 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import select
-from .models import Role, Permission
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy import select, update, insert, delete, true
+from app.concurrency import VersionConflict, check_version
+from app.fields import loader_options
+from .models import Role, Permission, role_permissions
+from .utils import permission_registry, refresh_role_permissions
+
+def bump_permission_version(db: Session, role_id: int | None = None, permission_id: int | None = None, role_ids: list[int] | None = None) -> None:
+    """Invalidate cached grants of one or several roles, or of every role holding a permission."""
+    stmt = update(Role).values(permission_version=Role.permission_version + 1)
+
+    if role_id is not None:
+        stmt = stmt.where(Role.id == role_id)
+    elif role_ids is not None:
+        stmt = stmt.where(Role.id.in_(role_ids))
+    elif permission_id is not None:
+        holders = select(role_permissions.c.role_id).where(role_permissions.c.permission_id == permission_id)
+        stmt = stmt.where(Role.id.in_(holders))
+
+    db.execute(stmt)
 
 def create_r(name: str, db: Session, description: str | None = None) -> None:
     role = Role(
@@ -19,22 +37,30 @@ def create_r(name: str, db: Session, description: str | None = None) -> None:
     except Exception as err:
         raise RuntimeError(str(err))
     
-def get_all_roles(db: Session) -> list[Role]:
-    stmt = select(Role)
+def _role_field_options(fields: list[str] | None) -> list:
+    if fields is None:
+        return []
+
+    return loader_options(Role, fields, {"permissions": Role.permissions}, always=(Role.id, Role.version))
+
+def get_all_roles(db: Session, fields: list[str] | None = None) -> list[Role]:
+    stmt = select(Role).options(*_role_field_options(fields))
     roles = db.scalars(stmt).all()
 
     return roles
 
-def get_r_by_id(id: int, db: Session) -> Role | None:
-    role = db.get(Role, id)
+def get_r_by_id(id: int, db: Session, fields: list[str] | None = None) -> Role | None:
+    role = db.get(Role, id, options=_role_field_options(fields))
 
     return role
 
-def update_r(id: int, name: str, description: str | None, db: Session) -> None:
+def update_r(id: int, name: str, description: str | None, db: Session, expected_version: int | None = None) -> int:
     role = db.get(Role, id)
 
     if not role:
         raise NameError(f"Role with ID {id} is not found")
+
+    check_version(role.version, expected_version, f"Role with ID {id}")
     
     role.name = name
     role.description = description
@@ -45,11 +71,17 @@ def update_r(id: int, name: str, description: str | None, db: Session) -> None:
     except IntegrityError:
         db.rollback()
         raise ValueError(f"Duplicate entry name role {name}")
+
+    except StaleDataError:
+        db.rollback()
+        raise VersionConflict(f"Role with ID {id} was modified by someone else")
     
     except Exception as err:
         db.rollback()
         raise RuntimeError(str(err))
 
+    return role.version
+
 def delete_r(id: int, db: Session) -> None:
     role = db.get(Role, id)
 
@@ -93,11 +125,13 @@ def get_p_by_id(id: int, db: Session) -> Permission | None:
 
     return permission
 
-def update_p(id: int, name: str, resource: str, action: str, description: str | None, db: Session) -> None:
+def update_p(id: int, name: str, resource: str, action: str, description: str | None, db: Session, expected_version: int | None = None) -> int:
     permission = db.get(Permission, id)
 
     if not permission:
         raise NameError(f"Permission with ID {id} is not found")
+
+    check_version(permission.version, expected_version, f"Permission with ID {id}")
     
     permission.name = name
     permission.resource = resource
@@ -105,15 +139,25 @@ def update_p(id: int, name: str, resource: str, action: str, description: str |
     permission.description = description
 
     try:
+        bump_permission_version(db, permission_id=id)
         db.commit()
     
     except IntegrityError:
         db.rollback()
         raise ValueError(f"Duplicate entry name resource {name}")
+
+    except StaleDataError:
+        db.rollback()
+        raise VersionConflict(f"Permission with ID {id} was modified by someone else")
     
     except Exception as err:
         db.rollback()
         raise RuntimeError(str(err))
+
+    # The (resource, action) behind this bit may have changed
+    permission_registry.clear()
+
+    return permission.version
     
 def delete_p(id: int, db: Session):
     permission = db.get(Permission, id)
@@ -122,9 +166,100 @@ def delete_p(id: int, db: Session):
         raise NameError(f"Permission with ID {id} is not found")
     
     try:
+        bump_permission_version(db, permission_id=id)
         db.delete(permission)
         db.commit()
     
     except Exception as err:
         db.rollback()
-        raise RuntimeError(str(err))
\ No newline at end of file
+        raise RuntimeError(str(err))
+
+    permission_registry.clear()
+
+def _missing_ids(model, ids: set[int], db: Session) -> list[int]:
+    found = set(db.scalars(select(model.id).where(model.id.in_(ids))))
+
+    return sorted(ids - found)
+
+def set_role_permissions(role_id: int, permission_ids: set[int], db: Session) -> tuple[int, int]:
+    """Make the role hold exactly these permissions, returning how many grants were added and removed.
+
+    Only the difference from the current grants is written: one bulk DELETE
+    and one bulk INSERT in the same transaction.
+    """
+    # Row lock serialises concurrent replacements of the same role's grants
+    role = db.get(Role, role_id, with_for_update=True)
+
+    if not role:
+        raise NameError(f"Role with ID {role_id} is not found")
+
+    if missing := _missing_ids(Permission, permission_ids, db):
+        db.rollback()
+        raise NameError(f"Permissions with ID {', '.join(map(str, missing))} are not found")
+
+    current = set(db.scalars(select(role_permissions.c.permission_id).where(role_permissions.c.role_id == role_id)))
+    added = permission_ids - current
+    removed = current - permission_ids
+
+    try:
+        if removed:
+            db.execute(
+                delete(role_permissions)
+                .where(role_permissions.c.role_id == role_id)
+                .where(role_permissions.c.permission_id.in_(removed))
+            )
+
+        if added:
+            db.execute(insert(role_permissions), [{"role_id": role_id, "permission_id": permission_id} for permission_id in sorted(added)])
+
+        if added or removed:
+            bump_permission_version(db, role_id=role_id)
+
+        db.commit()
+
+    except Exception as err:
+        db.rollback()
+        raise RuntimeError(str(err))
+
+    refresh_role_permissions([role_id], db)
+
+    return len(added), len(removed)
+
+def grant_permissions(role_ids: set[int], permission_ids: set[int], db: Session) -> int:
+    """Grant every permission to every role with a single INSERT ... SELECT of the missing pairs.
+
+    Returns the number of grants that were added.
+    """
+    if missing := _missing_ids(Role, role_ids, db):
+        raise NameError(f"Roles with ID {', '.join(map(str, missing))} are not found")
+
+    if missing := _missing_ids(Permission, permission_ids, db):
+        raise NameError(f"Permissions with ID {', '.join(map(str, missing))} are not found")
+
+    already_granted = (
+        select(role_permissions.c.role_id)
+        .where(role_permissions.c.role_id == Role.id)
+        .where(role_permissions.c.permission_id == Permission.id)
+    )
+    pairs = (
+        select(Role.id, Permission.id)
+        .join(Permission, true())
+        .where(Role.id.in_(role_ids), Permission.id.in_(permission_ids))
+        .where(~already_granted.exists())
+    )
+
+    try:
+        granted = max(db.execute(insert(role_permissions).from_select(["role_id", "permission_id"], pairs)).rowcount, 0)
+
+        if granted:
+            bump_permission_version(db, role_ids=sorted(role_ids))
+
+        db.commit()
+
+    except Exception as err:
+        db.rollback()
+        raise RuntimeError(str(err))
+
+    refresh_role_permissions(role_ids, db)
+
+    return granted
@@ -1,22 +1,146 @@
-from app.auth.models import User
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from threading import Lock
+from typing import NamedTuple
+from app.auth.schemas import TokenData
 from app.config import get_settings
+from .models import Role, Permission, role_permissions
+import time
 
 settings = get_settings()
 
-def has_permission(user: User, resource: str, action: str):
-    if user.is_superuser:
+
+class _RoleGrants(NamedTuple):
+    version: int
+    permissions: frozenset[tuple[str, str]]
+    mask: int
+
+
+# role_id -> grants at the permission_version they were loaded for
+_role_permissions: dict[int, _RoleGrants] = {}
+_lock = Lock()
+
+def permission_mask(permission_ids) -> int:
+    """Bitmask of a set of grants; a permission's ID is its bit position, IDs are never reused."""
+    mask = 0
+
+    for permission_id in permission_ids:
+        mask |= 1 << permission_id
+
+    return mask
+
+
+class PermissionRegistry:
+    """In-memory (resource, action) -> bit position map, resynced from the permissions table.
+
+    Permissions are few and rarely edited, so the whole table is reloaded at
+    most once per sync interval instead of being queried on every check.
+    """
+
+    def __init__(self, sync_seconds: int):
+        self.sync_seconds = sync_seconds
+        self._bits: dict[tuple[str, str], int] = {}
+        self._synced_at = 0.0
+        self._lock = Lock()
+
+    def bit(self, resource: str, action: str, db: Session) -> int | None:
+        if time.monotonic() - self._synced_at >= self.sync_seconds:
+            self.sync(db)
+
+        return self._bits.get((resource, action))
+
+    def sync(self, db: Session) -> None:
+        with self._lock:
+            stmt = select(Permission.id, Permission.resource, Permission.action)
+            self._bits = {(resource, action): permission_id for permission_id, resource, action in db.execute(stmt)}
+            self._synced_at = time.monotonic()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bits = {}
+            self._synced_at = 0.0
+
+
+permission_registry = PermissionRegistry(settings.permission_registry_sync_seconds)
+
+def _load_role(role_id: int, permission_version: int, db: Session) -> _RoleGrants:
+    cached = _role_permissions.get(role_id)
+
+    if cached is not None and cached.version >= permission_version:
+        return cached
+
+    stmt = (
+        select(Permission.id, Permission.resource, Permission.action)
+        .join(role_permissions, role_permissions.c.permission_id == Permission.id)
+        .where(role_permissions.c.role_id == role_id)
+    )
+    rows = db.execute(stmt).all()
+    grants = _RoleGrants(
+        permission_version,
+        frozenset((resource, action) for _, resource, action in rows),
+        permission_mask(permission_id for permission_id, _, _ in rows)
+    )
+
+    with _lock:
+        cached = _role_permissions.get(role_id)
+
+        if cached is None or cached.version <= permission_version:
+            _role_permissions[role_id] = grants
+
+    return grants
+
+def get_role_permissions(role_id: int, permission_version: int, db: Session) -> frozenset[tuple[str, str]]:
+    """Grants of a role, loaded from the database only when the token carries a newer version than cached."""
+    return _load_role(role_id, permission_version, db).permissions
+
+def get_role_mask(role_id: int, permission_version: int, db: Session) -> int:
+    return _load_role(role_id, permission_version, db).mask
+
+def clear_permission_cache() -> None:
+    with _lock:
+        _role_permissions.clear()
+
+    permission_registry.clear()
+
+def refresh_role_permissions(role_ids, db: Session) -> None:
+    """Reload grants after a change so this process stops trusting tokens minted before it."""
+    stmt = select(Role.id, Role.permission_version).where(Role.id.in_(list(role_ids)))
+
+    with _lock:
+        for role_id in role_ids:
+            _role_permissions.pop(role_id, None)
+
+    for role_id, permission_version in db.execute(stmt).all():
+        _load_role(role_id, permission_version, db)
+
+def _token_is_current(principal: TokenData, db: Session) -> bool:
+    """Whether the token is at least as new as the role's grants; a token older than them may carry revoked bits."""
+    cached = _role_permissions.get(principal.role_id)
+
+    if cached is None:
+        # First check for this role on this process, learn its current version once
+        version = db.scalars(select(Role.permission_version).where(Role.id == principal.role_id)).one_or_none()
+
+        if version is None:
+            return False
+
+        cached = _load_role(principal.role_id, version, db)
+
+    return cached.version <= principal.permission_version
+
+def has_permission(principal: TokenData, resource: str, action: str, db: Session) -> bool:
+    if principal.is_superuser:
         return True
 
-    role = user.role
-    if not role:
+    if principal.role_id is None:
         return False
 
-    permissions = role.permissions
-    
-    # Role based permissions
-    for permission in permissions:
-        if (permission.resource == resource
-            and permission.action == action):
+    # Bitmask carried by the token: a single AND once the role's version is cached
+    if principal.permission_mask is not None and _token_is_current(principal, db):
+        bit = permission_registry.bit(resource, action, db)
+
+        if bit is not None and principal.permission_mask >> bit & 1:
             return True
-        
-    return False
\ No newline at end of file
+
+    # Role based permissions; denials are confirmed here so a stale registry never locks anyone out
+    return (resource, action) in get_role_permissions(principal.role_id, principal.permission_version, db)
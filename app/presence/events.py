@@ -0,0 +1,171 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from collections import deque
+from datetime import date, datetime, time, timedelta
+from threading import Lock
+from typing import NamedTuple
+from .models import Presence
+from .schemas import PresenceEventSchema, PresenceEventType
+import asyncio
+import json
+
+
+class Subscriber:
+    def __init__(self, max_queued: int):
+        self.queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=max_queued)
+        # Highest event already queued, by replay or fan-out
+        self.seq = 0
+
+
+class Snapshot(NamedTuple):
+    seq: int
+    message: str
+
+
+class PresenceHub:
+    """In-process fan-out of presence events to SSE subscribers.
+
+    publish() serialises an event once and hands it to the event loop in a
+    single call, whatever the number of subscribers. The hub also keeps the
+    latest event of each employee for the current day, so late joiners get a
+    snapshot without querying the database.
+
+    Subscribers that fall more than max_queued events behind are disconnected
+    and can reconnect with Last-Event-ID.
+
+    Only events published by this process reach its subscribers, so streams
+    are complete only when the API runs as a single worker.
+    """
+
+    def __init__(self, max_queued: int = 256, history: int = 1024):
+        self.max_queued = max_queued
+        self._subscribers: set[Subscriber] = set()
+        self._history: deque[tuple[int, str]] = deque(maxlen=history)
+        self._latest: dict[str, dict] = {}
+        self._day: date | None = None
+        self._seeded = False
+        self._seq = 0
+        self._lock = Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def publish(self, event: PresenceEventSchema) -> None:
+        """Record an event; safe to call from request threads."""
+        payload = event.model_dump(mode="json")
+
+        today = date.today()
+
+        with self._lock:
+            if self._day != today:
+                self._reset(today)
+
+            self._seq += 1
+            seq = self._seq
+            message = f"id: {seq}\nevent: presence\ndata: {json.dumps(payload)}\n\n"
+            self._history.append((seq, message))
+            self._latest[payload["employee_id"]] = payload
+            loop = self._loop
+
+        if loop is not None and self._subscribers:
+            loop.call_soon_threadsafe(self._fan_out, seq, message)
+
+    def _fan_out(self, seq: int, message: str) -> None:
+        for subscriber in list(self._subscribers):
+            # Already replayed from history when it subscribed
+            if seq <= subscriber.seq:
+                continue
+
+            subscriber.seq = seq
+
+            try:
+                subscriber.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self._drop(subscriber)
+
+    def _drop(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+
+        subscriber.queue.put_nowait(None)
+
+    def _reset(self, day: date) -> None:
+        self._day = day
+        self._latest = {}
+        self._seeded = False
+
+    def subscribe(self, last_event_id: int | None = None) -> Subscriber:
+        """Register a subscriber on the running loop, replaying events after last_event_id if still buffered."""
+        self._loop = asyncio.get_running_loop()
+        subscriber = Subscriber(self.max_queued)
+
+        with self._lock:
+            if last_event_id is not None:
+                for seq, message in self._history:
+                    if seq > last_event_id and not subscriber.queue.full():
+                        subscriber.queue.put_nowait(message)
+
+            subscriber.seq = self._seq
+            self._subscribers.add(subscriber)
+
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    def snapshot(self, db: Session) -> Snapshot:
+        """Latest state of every employee today, loaded from the database once per day.
+
+        Subscribe with the returned seq so events published after the snapshot
+        was cut are replayed from history.
+        """
+        today = date.today()
+
+        with self._lock:
+            if self._day == today and self._seeded:
+                return self._snapshot_message()
+
+        start = datetime.combine(today, time.min)
+        stmt = select(Presence).where(
+            Presence.created_at >= start,
+            Presence.created_at < start + timedelta(days=1)
+        ).order_by(Presence.id)
+        stored = {
+            str(presence.employee_id): event_from_presence(presence).model_dump(mode="json")
+            for presence in db.scalars(stmt)
+        }
+
+        with self._lock:
+            if self._day != today:
+                self._reset(today)
+
+            # Events published while we were querying are newer than the rows read
+            self._latest = {**stored, **self._latest}
+            self._seeded = True
+
+            return self._snapshot_message()
+
+    def _snapshot_message(self) -> Snapshot:
+        return Snapshot(self._seq, f"id: {self._seq}\nevent: snapshot\ndata: {json.dumps(list(self._latest.values()))}\n\n")
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+
+presence_hub = PresenceHub()
+
+def event_from_presence(presence: Presence) -> PresenceEventSchema:
+    if presence.clock_out is not None:
+        event_type, at = PresenceEventType.CLOCK_OUT, presence.clock_out
+    elif presence.clock_in is not None:
+        event_type, at = PresenceEventType.CLOCK_IN, presence.clock_in
+    else:
+        event_type, at = PresenceEventType(presence.status), presence.created_at or datetime.now()
+
+    return PresenceEventSchema(
+        type=event_type,
+        presence_id=presence.id,
+        employee_id=presence.employee_id,
+        status=presence.status,
+        at=at
+    )
@@ -1,5 +1,5 @@
 from app.database import Base
-from sqlalchemy import ForeignKey, Enum, Uuid
+from sqlalchemy import ForeignKey, Enum, Uuid, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import mapped_column, Mapped, relationship
 from enum import StrEnum
@@ -19,7 +19,10 @@ class StatusType(StrEnum):
 
 class Presence(Base):
     __tablename__ = "presences"
-    
+    # Serves per-employee, per-day lookups such as the end-of-day absence job and
+    # the keyset-paginated history, which walks it by (employee_id, created_at, id)
+    __table_args__ = (Index("ix_presences_employee_id_created_at", "employee_id", "created_at"),)
+
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     employee_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), ForeignKey("employee.id"), nullable=False)
     clock_in: Mapped[datetime | None] = mapped_column(nullable=True)
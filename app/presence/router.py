@@ -1,22 +1,126 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, status
+from app.negotiation import MsgPackRoute
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from typing import Annotated
-from sqlalchemy.orm import Session
-from app.database import get_session
-from app.auth.dependencies import get_current_user
+from sqlalchemy.orm import Session, sessionmaker
+from app.database import get_session, get_read_session, get_read_session_factory
+from app.auth.dependencies import oauth2_scheme, get_token_payload, get_current_principal, get_current_user
 from app.auth.models import User
+from app.policy.dependencies import require_permission
+from app.policy.utils import has_permission
+from app.idempotency.dependencies import IdempotentRequest, idempotency
 from .models import StatusType
-from .service import create_presence
+from .events import Snapshot, presence_hub
+from .schemas import AttendanceReportSchema, PresencePageSchema
+from .service import create_presence, get_attendance_report, get_presence_history
+from datetime import date
+import asyncio
 import uuid
 
-router = APIRouter(prefix="/presence", tags=["Employee", "Presence"])
+KEEP_ALIVE_SECONDS = 15
+
+router = APIRouter(prefix="/presence", tags=["Employee", "Presence"], route_class=MsgPackRoute)
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
-def presence(status_type: StatusType, current_user: Annotated[User, Depends(get_current_user)], db: Annotated[Session, Depends(get_session)]):
+def presence(
+    status_type: StatusType,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[Session, Depends(get_session)],
+    idempotent: Annotated[IdempotentRequest, Depends(idempotency("POST /presence"))]
+):
     try:
         create_presence(status_type, current_user.employee.id, db)
     except ValueError as err:
         raise HTTPException(status_code=status.HTTP_406_NOT_ACCEPTABLE, detail=str(err))
     
-    return {
+    return idempotent.save({
         "msg": "Success created presence today"
-    }
\ No newline at end of file
+    }, status.HTTP_201_CREATED)
+
+@router.get("/")
+def my_presences(
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[Session, Depends(get_read_session)],
+    start: date | None = None,
+    end: date | None = None,
+    limit: Annotated[int, Query(ge=1, le=500)] = 50,
+    cursor: str | None = None
+) -> PresencePageSchema:
+    if not current_user.employee:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User is not linked to an employee")
+
+    try:
+        return get_presence_history(current_user.employee.id, db, start=start, end=end, limit=limit, cursor=cursor)
+    except ValueError as err:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(err))
+
+def attendance_report(employee_id: uuid.UUID, start: date, end: date, db: Session) -> AttendanceReportSchema:
+    try:
+        return get_attendance_report(employee_id, start, end, db)
+    except NameError as err:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(err))
+    except ValueError as err:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(err))
+
+@router.get("/me/report")
+def my_attendance_report(start: date, end: date, current_user: Annotated[User, Depends(get_current_user)], db: Annotated[Session, Depends(get_read_session)]) -> AttendanceReportSchema:
+    if not current_user.employee:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User is not linked to an employee")
+
+    return attendance_report(current_user.employee.id, start, end, db)
+
+@router.get("/report/{employee_id}", dependencies=[Depends(require_permission("presences", "read"))])
+def employee_attendance_report(employee_id: uuid.UUID, start: date, end: date, db: Annotated[Session, Depends(get_read_session)]) -> AttendanceReportSchema:
+    return attendance_report(employee_id, start, end, db)
+
+def open_event_stream(token: str, last_event_id: int | None, session_factory: sessionmaker) -> Snapshot | None:
+    """Authorise a stream and take its snapshot on a session that is closed before streaming starts."""
+    with session_factory() as db:
+        principal = get_current_principal(get_token_payload(token, db))
+
+        if not has_permission(principal, "presences", "list", db):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Permission denied: list on presences")
+
+        return None if last_event_id is not None else presence_hub.snapshot(db)
+
+@router.get("/events")
+async def presence_events(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    session_factory: Annotated[sessionmaker, Depends(get_read_session_factory)],
+    last_event_id: Annotated[int | None, Header()] = None
+) -> StreamingResponse:
+    """Server-Sent Events: a snapshot of today's presences, then every clock-in/clock-out as it happens.
+
+    No session dependency here: yield dependencies are only closed once the
+    response ends, which for a stream would pin a pooled connection for hours.
+    """
+    snapshot = await run_in_threadpool(open_event_stream, token, last_event_id, session_factory)
+    # Replays whatever was published between the snapshot and this point
+    subscriber = presence_hub.subscribe(last_event_id if snapshot is None else snapshot.seq)
+
+    async def stream():
+        try:
+            if snapshot is not None:
+                yield snapshot.message
+
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscriber.queue.get(), KEEP_ALIVE_SECONDS)
+                except TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                # Fell too far behind, the client reconnects with Last-Event-ID
+                if message is None:
+                    return
+
+                yield message
+        finally:
+            presence_hub.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
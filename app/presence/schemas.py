@@ -0,0 +1,60 @@
+from pydantic import BaseModel, ConfigDict
+from enum import StrEnum
+from datetime import date, datetime
+import uuid
+
+
+class DayStatus(StrEnum):
+    PRESENT = "present"
+    ABSENT = "absent"
+    ON_LEAVE = "on_leave"
+    NON_WORKING = "non_working"
+
+
+class AttendanceDaySchema(BaseModel):
+    date: date
+    status: DayStatus
+
+
+class AttendanceReportSchema(BaseModel):
+    employee_id: uuid.UUID
+    start: date
+    end: date
+    working_days: int
+    present: int
+    absent: int
+    on_leave: int
+    non_working: int
+    days: list[AttendanceDaySchema]
+
+
+class PresenceSchema(BaseModel):
+    id: int
+    employee_id: uuid.UUID
+    status: str
+    clock_in: datetime | None = None
+    clock_out: datetime | None = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PresencePageSchema(BaseModel):
+    data: list[PresenceSchema]
+    # Pass back as ?cursor= for the next, older page; null on the last page
+    next_cursor: str | None = None
+
+
+class PresenceEventType(StrEnum):
+    CLOCK_IN = "clock_in"
+    CLOCK_OUT = "clock_out"
+    ABSENT = "absent"
+    ON_LEAVE = "on_leave"
+
+
+class PresenceEventSchema(BaseModel):
+    type: PresenceEventType
+    presence_id: int
+    employee_id: uuid.UUID
+    status: str
+    at: datetime
\ No newline at end of file
@@ -1,11 +1,28 @@
-from sqlalchemy import select
+from sqlalchemy import select, insert, update, literal, and_, or_
 from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.employee.models import Employee, EmployeeStatus
+from app.work_calendar.service import get_employee_calendar, get_working_department_ids
+from .events import presence_hub, event_from_presence
 from .models import Presence, StatusType
-from datetime import datetime, date
+from .schemas import DayStatus, AttendanceDaySchema, AttendanceReportSchema, PresenceSchema, PresencePageSchema
+from datetime import datetime, date, time, timedelta
+import base64
+import numpy as np
+import uuid
+
+settings = get_settings()
+
+MAX_REPORT_DAYS = 366
+ABSENCE_JOB_NAME = "mark_absences"
 
 def create_presence(status: str, employee_id: str, db: Session) -> None:
-    stmt = select(Presence).where(Presence.employee_id == employee_id
-                                    and Presence.created_at == date.today())
+    today = datetime.combine(date.today(), time.min)
+    stmt = select(Presence).where(and_(
+        Presence.employee_id == employee_id,
+        Presence.created_at >= today,
+        Presence.created_at < today + timedelta(days=1)
+    ))
     already_clock = db.scalars(stmt).one_or_none()
 
     if status == StatusType.PRESENT:
@@ -19,6 +36,7 @@ def create_presence(status: str, employee_id: str, db: Session) -> None:
 
             db.add(new_presence)
             db.commit()
+            presence_hub.publish(event_from_presence(new_presence))
 
             return
         
@@ -27,6 +45,7 @@ def create_presence(status: str, employee_id: str, db: Session) -> None:
 
         already_clock.clock_out = datetime.now()
         db.commit()
+        presence_hub.publish(event_from_presence(already_clock))
 
         return
     
@@ -40,4 +59,171 @@ def create_presence(status: str, employee_id: str, db: Session) -> None:
     )
 
     db.add(new_presence)
-    db.commit()
\ No newline at end of file
+    db.commit()
+    presence_hub.publish(event_from_presence(new_presence))
+
+def encode_cursor(created_at: datetime, presence_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{presence_id}".encode()).decode()
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, presence_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(presence_id)
+    except ValueError:
+        raise ValueError("Invalid cursor")
+
+def get_presence_history(
+    employee_id: uuid.UUID,
+    db: Session,
+    start: date | None = None,
+    end: date | None = None,
+    limit: int = 50,
+    cursor: str | None = None
+) -> PresencePageSchema:
+    """Newest-first page of an employee's presences, continuing after the cursor of the previous page.
+
+    Keyset pagination on (employee_id, created_at, id) walks the composite
+    index, so deep pages cost the same as the first one.
+    """
+    if start is not None and end is not None and end < start:
+        raise ValueError("End date must not be before start date")
+
+    if db.get(Employee, employee_id) is None:
+        raise NameError(f"Employee with ID {employee_id} is not found")
+
+    stmt = select(Presence).where(Presence.employee_id == employee_id)
+
+    if start is not None:
+        stmt = stmt.where(Presence.created_at >= datetime.combine(start, time.min))
+
+    if end is not None:
+        stmt = stmt.where(Presence.created_at < datetime.combine(end + timedelta(days=1), time.min))
+
+    if cursor is not None:
+        created_at, presence_id = decode_cursor(cursor)
+        stmt = stmt.where(or_(
+            Presence.created_at < created_at,
+            and_(Presence.created_at == created_at, Presence.id < presence_id)
+        ))
+
+    # One extra row tells whether another page follows
+    stmt = stmt.order_by(Presence.created_at.desc(), Presence.id.desc()).limit(limit + 1)
+    presences = db.scalars(stmt).all()
+    page = presences[:limit]
+
+    return PresencePageSchema(
+        data=[PresenceSchema.model_validate(presence) for presence in page],
+        next_cursor=encode_cursor(page[-1].created_at, page[-1].id) if len(presences) > limit else None
+    )
+
+def get_attendance_report(employee_id, start: date, end: date, db: Session) -> AttendanceReportSchema:
+    """Status of every day in the range, telling absences apart from days off on the employee's calendar.
+
+    Working days without any presence count as absent; non-working days are
+    never absent, even if an absence was recorded on them.
+    """
+    if end < start:
+        raise ValueError("End date must not be before start date")
+
+    if (end - start).days >= MAX_REPORT_DAYS:
+        raise ValueError(f"Report range is limited to {MAX_REPORT_DAYS} days")
+
+    employee = db.get(Employee, employee_id)
+
+    if not employee:
+        raise NameError(f"Employee with ID {employee_id} is not found")
+
+    calendar = get_employee_calendar(employee, db)
+    first_day = np.datetime64(start, "D")
+    days = np.arange(first_day, np.datetime64(end, "D") + np.timedelta64(1, "D"))
+    working = calendar.is_working_day(days)
+
+    statuses = np.where(working, DayStatus.ABSENT.value, DayStatus.NON_WORKING.value).astype("<U11")
+
+    stmt = select(Presence.created_at, Presence.status).where(
+        Presence.employee_id == employee_id,
+        Presence.created_at >= datetime.combine(start, time.min),
+        Presence.created_at < datetime.combine(end + timedelta(days=1), time.min)
+    )
+    rows = db.execute(stmt).all()
+
+    if rows:
+        created_at, recorded = zip(*rows)
+        positions = (np.array(created_at, dtype="datetime64[D]") - first_day).astype(np.int64)
+        recorded = np.array([str(status) for status in recorded])
+        statuses[positions] = np.where(
+            (recorded == StatusType.ABSENT) & ~working[positions],
+            DayStatus.NON_WORKING.value,
+            recorded
+        )
+
+    return AttendanceReportSchema(
+        employee_id=employee.id,
+        start=start,
+        end=end,
+        working_days=int(working.sum()),
+        present=int((statuses == DayStatus.PRESENT).sum()),
+        absent=int((statuses == DayStatus.ABSENT).sum()),
+        on_leave=int((statuses == DayStatus.ON_LEAVE).sum()),
+        non_working=int((statuses == DayStatus.NON_WORKING).sum()),
+        days=[AttendanceDaySchema(date=day, status=status) for day, status in zip(days.tolist(), statuses.tolist())]
+    )
+
+def mark_absences(day: date, db: Session) -> tuple[int, int]:
+    """End-of-day job: record ABSENT for every active employee without a presence on the day,
+    and close the day's clock-ins that never clocked out.
+
+    Employees whose department calendar has the day off are skipped. Returns
+    the number of absences inserted and clock-ins closed; the caller commits.
+    """
+    start = datetime.combine(day, time.min)
+    end = start + timedelta(days=1)
+    presences = Presence.__table__
+    absences = 0
+
+    department_ids = get_working_department_ids(day, db)
+
+    if department_ids:
+        has_presence = select(Presence.id).where(
+            Presence.employee_id == Employee.id,
+            Presence.created_at >= start,
+            Presence.created_at < end
+        ).exists()
+
+        absentees = (
+            select(
+                Employee.id,
+                literal(StatusType.ABSENT, presences.c.status.type),
+                literal(end - timedelta(seconds=1), presences.c.created_at.type)
+            )
+            .join(EmployeeStatus, Employee.employee_status_id == EmployeeStatus.id)
+            .where(
+                EmployeeStatus.is_active.is_(True),
+                Employee.hire_date < end,
+                Employee.department_id.in_(department_ids),
+                ~has_presence
+            )
+        )
+
+        result = db.execute(insert(presences).from_select(["employee_id", "status", "created_at"], absentees))
+        absences = result.rowcount
+
+    # Close forgotten clock-ins after a standard day, without running past midnight
+    shift = timedelta(hours=settings.payroll_standard_hours_per_day)
+    open_clock_ins = db.execute(
+        select(Presence.id, Presence.clock_in).where(
+            Presence.status == StatusType.PRESENT,
+            Presence.clock_in.is_not(None),
+            Presence.clock_out.is_(None),
+            Presence.created_at >= start,
+            Presence.created_at < end
+        )
+    ).all()
+
+    if open_clock_ins:
+        db.execute(update(Presence), [
+            {"id": presence_id, "clock_out": min(clock_in + shift, end - timedelta(seconds=1))}
+            for presence_id, clock_in in open_clock_ins
+        ])
+
+    return absences, len(open_clock_ins)
@@ -0,0 +1,16 @@
+from app.database import Base
+from sqlalchemy import String, UniqueConstraint
+from sqlalchemy.orm import mapped_column, Mapped
+from sqlalchemy.sql import func
+from datetime import datetime, date
+
+
+class JobRun(Base):
+    """One row per job and day; the unique constraint is what lets a single worker claim a run."""
+    __tablename__ = "job_runs"
+    __table_args__ = (UniqueConstraint("name", "run_date"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    run_date: Mapped[date] = mapped_column(nullable=False)
+    started_at: Mapped[datetime] = mapped_column(server_default=func.now())
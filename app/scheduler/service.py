@@ -0,0 +1,64 @@
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.exc import IntegrityError
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable
+from .models import JobRun
+import asyncio
+import logging
+
+# Receives the day to process and a session; must not commit, the scheduler does
+DailyJob = Callable[[date, Session], Any]
+
+def run_job_once(name: str, job: DailyJob, day: date, db: Session) -> bool:
+    """Run the job for the day unless a worker already has.
+
+    The claim row and the job's writes share one transaction: a worker racing
+    on the same day blocks on the unique constraint and then fails, and if
+    the job fails the claim is rolled back with it so the next tick retries.
+    """
+    try:
+        db.add(JobRun(name=name, run_date=day))
+        db.flush()
+
+    except IntegrityError:
+        db.rollback()
+        return False
+
+    try:
+        job(day, db)
+        db.commit()
+
+    except Exception:
+        db.rollback()
+        raise
+
+    return True
+
+def _run(name: str, job: DailyJob, day: date, session_factory: sessionmaker) -> None:
+    with session_factory() as db:
+        try:
+            if run_job_once(name, job, day, db):
+                logging.info(f"Job {name} ran for {day}")
+        except IntegrityError:
+            # Lost the race to another worker after the claim was flushed
+            logging.info(f"Job {name} for {day} was run by another worker")
+        except Exception:
+            logging.exception(f"Job {name} failed for {day}")
+
+def _seconds_until(at: time) -> float:
+    now = datetime.now()
+    next_run = datetime.combine(now.date(), at)
+
+    if next_run <= now:
+        next_run += timedelta(days=1)
+
+    return (next_run - now).total_seconds()
+
+async def schedule_daily(name: str, job: DailyJob, at: time, session_factory: sessionmaker) -> None:
+    """Run the job every day at `at` for the previous day, catching up on yesterday at startup.
+
+    Every worker runs this loop; run_job_once makes sure each day is processed once.
+    """
+    while True:
+        await asyncio.to_thread(_run, name, job, date.today() - timedelta(days=1), session_factory)
+        await asyncio.sleep(_seconds_until(at))
@@ -0,0 +1,32 @@
+from app.database import Base
+from sqlalchemy import ForeignKey, String, UniqueConstraint
+from sqlalchemy.orm import mapped_column, Mapped, relationship
+from sqlalchemy.sql import func
+from datetime import datetime
+import datetime as dt
+
+
+class WorkingCalendar(Base):
+    __tablename__ = "working_calendars"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(150), unique=True, nullable=False)
+    description: Mapped[str] = mapped_column(String(255), default="")
+    # Monday to Sunday, "1" for a working day
+    weekmask: Mapped[str] = mapped_column(String(7), nullable=False, default="1111100")
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now())
+
+    holidays: Mapped[list["Holiday"]] = relationship(back_populates="calendar", cascade="all, delete-orphan", order_by="Holiday.date")
+
+
+class Holiday(Base):
+    __tablename__ = "holidays"
+    __table_args__ = (UniqueConstraint("calendar_id", "date"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    calendar_id: Mapped[int] = mapped_column(ForeignKey("working_calendars.id", ondelete="CASCADE"), nullable=False)
+    date: Mapped[dt.date] = mapped_column(nullable=False)
+    name: Mapped[str] = mapped_column(String(150), nullable=False)
+
+    calendar: Mapped["WorkingCalendar"] = relationship(back_populates="holidays")
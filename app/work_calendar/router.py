@@ -0,0 +1,116 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Annotated
+from sqlalchemy.orm import Session
+from datetime import date
+from app.database import get_session, get_read_session
+from app.policy.dependencies import require_permission
+from .schemas import CreateCalendarSchema, UpdateCalendarSchema, CalendarSchema, CalendarsSchema, HolidaySchema, AddHolidaysSchema, WorkingDaysSchema
+from .service import create, get_all, get_by_id, update, delete, add_holidays, delete_holiday
+from .utils import get_business_calendar
+
+router = APIRouter(prefix="/calendar", tags=["Calendar"])
+
+def to_calendar_schema(calendar) -> CalendarSchema:
+    return CalendarSchema(
+        id=calendar.id,
+        name=calendar.name,
+        description=calendar.description,
+        weekmask=calendar.weekmask,
+        holidays=[HolidaySchema(date=holiday.date, name=holiday.name) for holiday in calendar.holidays]
+    )
+
+@router.post("/", dependencies=[Depends(require_permission("working_calendars", "create"))], status_code=status.HTTP_201_CREATED)
+def create_calendar(calendar: CreateCalendarSchema, db: Annotated[Session, Depends(get_session)]):
+    try:
+        create(name=calendar.name, weekmask=calendar.weekmask, description=calendar.description, db=db)
+    except ValueError as ve:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(ve))
+    except RuntimeError as re:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(re))
+
+    return {
+        "msg": f"Success created calendar {calendar.name}"
+    }
+
+@router.get("/", dependencies=[Depends(require_permission("working_calendars", "list"))])
+def get_all_calendars(db: Annotated[Session, Depends(get_read_session)]) -> CalendarsSchema:
+    calendars = get_all(db)
+
+    return CalendarsSchema(data=[to_calendar_schema(calendar) for calendar in calendars], count=len(calendars))
+
+@router.get("/{id}", dependencies=[Depends(require_permission("working_calendars", "read"))])
+def get_calendar(id: int, db: Annotated[Session, Depends(get_read_session)]) -> CalendarSchema:
+    calendar = get_by_id(id, db)
+
+    if not calendar:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Calendar not found")
+
+    return to_calendar_schema(calendar)
+
+@router.put("/{id}", dependencies=[Depends(require_permission("working_calendars", "update"))])
+def update_calendar(id: int, calendar: UpdateCalendarSchema, db: Annotated[Session, Depends(get_session)]):
+    try:
+        update(id, name=calendar.name, weekmask=calendar.weekmask, description=calendar.description, db=db)
+    except NameError as ne:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(ne))
+    except ValueError as ve:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(ve))
+    except RuntimeError as re:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(re))
+
+    return {
+        "msg": f"Success updated calendar with ID {id}"
+    }
+
+@router.delete("/{id}", dependencies=[Depends(require_permission("working_calendars", "delete"))])
+def delete_calendar(id: int, db: Annotated[Session, Depends(get_session)]):
+    try:
+        delete(id, db)
+    except NameError as ne:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(ne))
+    except RuntimeError as re:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(re))
+
+    return {
+        "msg": f"Success deleted calendar with ID {id}"
+    }
+
+@router.post("/{id}/holidays", dependencies=[Depends(require_permission("holidays", "create"))], status_code=status.HTTP_201_CREATED)
+def create_holidays(id: int, payload: AddHolidaysSchema, db: Annotated[Session, Depends(get_session)]):
+    try:
+        added = add_holidays(id, [(holiday.date, holiday.name) for holiday in payload.holidays], db)
+    except NameError as ne:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(ne))
+    except ValueError as ve:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(ve))
+    except RuntimeError as re:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(re))
+
+    return {
+        "msg": f"Success added {added} holidays"
+    }
+
+@router.delete("/{id}/holidays/{day}", dependencies=[Depends(require_permission("holidays", "delete"))])
+def remove_holiday(id: int, day: date, db: Annotated[Session, Depends(get_session)]):
+    try:
+        delete_holiday(id, day, db)
+    except NameError as ne:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(ne))
+    except RuntimeError as re:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(re))
+
+    return {
+        "msg": f"Success deleted holiday on {day}"
+    }
+
+@router.get("/{id}/working-days", dependencies=[Depends(require_permission("working_calendars", "read"))])
+def count_working_days(id: int, start: date, end: date, db: Annotated[Session, Depends(get_read_session)]) -> WorkingDaysSchema:
+    if end < start:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail="end must not be before start")
+
+    try:
+        calendar = get_business_calendar(id, db)
+    except NameError as ne:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(ne))
+
+    return WorkingDaysSchema(start=start, end=end, working_days=calendar.count_working_days(start, end))
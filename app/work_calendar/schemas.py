@@ -0,0 +1,52 @@
+from pydantic import BaseModel, Field, field_validator
+from datetime import date
+from typing import Optional
+
+WEEKMASK_PATTERN = r"^[01]{7}$"
+
+def validate_weekmask(weekmask: str | None) -> str | None:
+    # numpy refuses a calendar without a single working day
+    if weekmask is not None and "1" not in weekmask:
+        raise ValueError("Weekmask needs at least one working day")
+    return weekmask
+
+
+class CreateCalendarSchema(BaseModel):
+    name: str
+    description: Optional[str] = ""
+    weekmask: str = Field(default="1111100", pattern=WEEKMASK_PATTERN, description="Monday to Sunday, 1 for a working day")
+
+    _validate_weekmask = field_validator("weekmask")(validate_weekmask)
+
+
+class UpdateCalendarSchema(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    weekmask: Optional[str] = Field(default=None, pattern=WEEKMASK_PATTERN)
+
+    _validate_weekmask = field_validator("weekmask")(validate_weekmask)
+
+
+class HolidaySchema(BaseModel):
+    date: date
+    name: str
+
+
+class CalendarSchema(CreateCalendarSchema):
+    id: int
+    holidays: list[HolidaySchema]
+
+
+class CalendarsSchema(BaseModel):
+    data: list[CalendarSchema]
+    count: int
+
+
+class AddHolidaysSchema(BaseModel):
+    holidays: list[HolidaySchema]
+
+
+class WorkingDaysSchema(BaseModel):
+    start: date
+    end: date
+    working_days: int
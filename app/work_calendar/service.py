@@ -0,0 +1,176 @@
+from sqlalchemy import select, insert, delete as sql_delete
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.exc import IntegrityError
+from datetime import date
+from app.analytics.utils import bump_data_version
+from app.department.models import Department, department_closure
+from app.employee.models import Employee
+from .models import WorkingCalendar, Holiday
+from .utils import BusinessCalendar, get_business_calendar
+
+
+def create(name: str, weekmask: str, description: str | None, db: Session) -> WorkingCalendar:
+    """Create a new working calendar."""
+    calendar = WorkingCalendar(name=name, weekmask=weekmask, description=description or "")
+
+    try:
+        db.add(calendar)
+        db.commit()
+
+    except IntegrityError:
+        db.rollback()
+        raise ValueError(f"Duplicate entry calendar {name}")
+
+    except Exception as err:
+        db.rollback()
+        raise RuntimeError(str(err))
+
+    return calendar
+
+def get_all(db: Session) -> list[WorkingCalendar]:
+    return db.scalars(select(WorkingCalendar).order_by(WorkingCalendar.id)).all()
+
+def get_by_id(calendar_id: int, db: Session) -> WorkingCalendar | None:
+    return db.get(WorkingCalendar, calendar_id)
+
+def update(calendar_id: int, name: str | None, weekmask: str | None, description: str | None, db: Session) -> None:
+    calendar = db.get(WorkingCalendar, calendar_id)
+
+    if not calendar:
+        raise NameError(f"Calendar with ID {calendar_id} is not found")
+
+    if name is not None:
+        calendar.name = name
+    if weekmask is not None:
+        calendar.weekmask = weekmask
+    if description is not None:
+        calendar.description = description
+
+    try:
+        db.commit()
+
+    except IntegrityError:
+        db.rollback()
+        raise ValueError(f"Duplicate entry calendar {name}")
+
+    except Exception as err:
+        db.rollback()
+        raise RuntimeError(str(err))
+
+def delete(calendar_id: int, db: Session) -> None:
+    """Delete a calendar; departments using it fall back to their parent's or the default calendar."""
+    calendar = db.get(WorkingCalendar, calendar_id)
+
+    if not calendar:
+        raise NameError(f"Calendar with ID {calendar_id} is not found")
+
+    try:
+        db.delete(calendar)
+        db.commit()
+
+    except Exception as err:
+        db.rollback()
+        raise RuntimeError(str(err))
+
+def add_holidays(calendar_id: int, holidays: list[tuple[date, str]], db: Session) -> int:
+    """Insert holidays in one statement, skipping dates the calendar already has. Returns the number added."""
+    if db.get(WorkingCalendar, calendar_id) is None:
+        raise NameError(f"Calendar with ID {calendar_id} is not found")
+
+    dates = {day for day, _ in holidays}
+    existing = set(db.scalars(
+        select(Holiday.date).where(Holiday.calendar_id == calendar_id, Holiday.date.in_(dates))
+    ).all())
+
+    rows = {day: name for day, name in holidays if day not in existing}
+
+    if not rows:
+        return 0
+
+    try:
+        db.execute(insert(Holiday), [{"calendar_id": calendar_id, "date": day, "name": name} for day, name in rows.items()])
+        # Core inserts do not go through the flush listener
+        bump_data_version("calendar", db)
+        db.commit()
+
+    except IntegrityError:
+        db.rollback()
+        raise ValueError("Holiday was added concurrently, retry the request")
+
+    except Exception as err:
+        db.rollback()
+        raise RuntimeError(str(err))
+
+    return len(rows)
+
+def delete_holiday(calendar_id: int, day: date, db: Session) -> None:
+    holiday = db.scalars(select(Holiday).where(Holiday.calendar_id == calendar_id, Holiday.date == day)).one_or_none()
+
+    if not holiday:
+        raise NameError(f"Holiday on {day} is not found")
+
+    try:
+        db.delete(holiday)
+        db.commit()
+
+    except Exception as err:
+        db.rollback()
+        raise RuntimeError(str(err))
+
+def set_department_calendar(department_id: int, calendar_id: int | None, db: Session) -> None:
+    """Assign a calendar to a department; None makes it inherit from its parent."""
+    department = db.get(Department, department_id)
+
+    if not department:
+        raise NameError(f"Department with ID {department_id} is not found")
+
+    if calendar_id is not None and db.get(WorkingCalendar, calendar_id) is None:
+        raise NameError(f"Calendar with ID {calendar_id} is not found")
+
+    try:
+        department.calendar_id = calendar_id
+        db.commit()
+
+    except Exception as err:
+        db.rollback()
+        raise RuntimeError(str(err))
+
+def get_department_calendar_ids(db: Session, department_ids: list[int] | None = None) -> dict[int, int | None]:
+    """Effective calendar of each department: its own, else the nearest ancestor's, else None (default)."""
+    ancestor = aliased(Department)
+    stmt = (
+        select(department_closure.c.descendant_id, ancestor.calendar_id)
+        .join(ancestor, ancestor.id == department_closure.c.ancestor_id)
+        .where(ancestor.calendar_id.is_not(None))
+        .order_by(department_closure.c.descendant_id, department_closure.c.depth)
+    )
+
+    if department_ids is not None:
+        stmt = stmt.where(department_closure.c.descendant_id.in_(department_ids))
+
+    calendars: dict[int, int | None] = {department_id: None for department_id in department_ids or []}
+    resolved: set[int] = set()
+
+    # Rows are ordered by depth, so the first row of each department is its nearest calendar
+    for department_id, calendar_id in db.execute(stmt):
+        if department_id not in resolved:
+            calendars[department_id] = calendar_id
+            resolved.add(department_id)
+
+    return calendars
+
+def get_employee_calendar(employee: Employee, db: Session) -> BusinessCalendar:
+    calendar_id = get_department_calendar_ids(db, [employee.department_id])[employee.department_id]
+
+    return get_business_calendar(calendar_id, db)
+
+def get_working_department_ids(day: date, db: Session) -> list[int]:
+    """IDs of the departments for which the day is a working day on their calendar."""
+    department_ids = list(db.scalars(select(Department.id)).all())
+    calendar_ids = get_department_calendar_ids(db, department_ids)
+    working = {
+        calendar_id: bool(get_business_calendar(calendar_id, db).is_working_day([day])[0])
+        for calendar_id in set(calendar_ids.values())
+    }
+
+    return [department_id for department_id in department_ids if working[calendar_ids[department_id]]]
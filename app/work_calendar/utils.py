@@ -0,0 +1,102 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from datetime import date, timedelta
+from app.analytics.utils import ResultCache, get_data_version
+from app.config import get_settings
+from .models import WorkingCalendar, Holiday
+import numpy as np
+
+settings = get_settings()
+
+
+class BusinessCalendar:
+    """Working days of one calendar.
+
+    Counting and offsetting use numpy's busday functions; membership tests
+    index into a boolean bitmap of the whole year, computed once per year.
+    """
+
+    def __init__(self, weekmask: str, holidays: list[date] | None = None):
+        self.weekmask = weekmask
+        self.holidays = np.array(sorted(holidays or []), dtype="datetime64[D]")
+        self._busdaycal = np.busdaycalendar(weekmask=weekmask, holidays=self.holidays)
+        self._bitmaps: dict[int, np.ndarray] = {}
+
+    def year_bitmap(self, year: int) -> np.ndarray:
+        """One boolean per day of the year, True on working days."""
+        bitmap = self._bitmaps.get(year)
+
+        if bitmap is None:
+            days = np.arange(np.datetime64(f"{year:04d}-01-01"), np.datetime64(f"{year + 1:04d}-01-01"))
+            bitmap = np.is_busday(days, busdaycal=self._busdaycal)
+            self._bitmaps[year] = bitmap
+
+        return bitmap
+
+    def is_working_day(self, days) -> np.ndarray:
+        days = np.asarray(days, dtype="datetime64[D]")
+        years = days.astype("datetime64[Y]")
+        result = np.empty(days.shape, dtype=bool)
+
+        # One bitmap lookup per year in the range, never per day
+        for year in np.unique(years):
+            in_year = years == year
+            offsets = (days[in_year] - year.astype("datetime64[D]")).astype(np.int64)
+            result[in_year] = self.year_bitmap(int(str(year)))[offsets]
+
+        return result
+
+    def count_working_days(self, start: date, end: date) -> int:
+        """Working days between both dates, inclusive."""
+        return int(np.busday_count(start, end + timedelta(days=1), busdaycal=self._busdaycal))
+
+    def count_working_days_since(self, starts, end: date) -> np.ndarray:
+        """Working days from each start date to end, inclusive; zero when a start is after end."""
+        starts = np.asarray(starts, dtype="datetime64[D]")
+        last = np.datetime64(end + timedelta(days=1), "D")
+
+        return np.where(starts < last, np.busday_count(np.minimum(starts, last), last, busdaycal=self._busdaycal), 0)
+
+    def add_working_days(self, day: date, count: int) -> date:
+        """The working day `count` working days after `day`, rolling forward from a non-working day."""
+        return np.busday_offset(day, count, roll="forward", busdaycal=self._busdaycal).astype(date)
+
+
+_calendars = ResultCache(max_entries=64)
+
+def get_business_calendar(calendar_id: int | None, db: Session) -> BusinessCalendar:
+    """Calendar by ID, or the default weekmask without holidays when None.
+
+    Cached per data version, so holiday edits from any worker take effect on the next lookup.
+    """
+    if calendar_id is None:
+        return _default_calendar()
+
+    cache_key = (calendar_id, get_data_version("calendar", db))
+    calendar = _calendars.get(cache_key)
+
+    if calendar is not None:
+        return calendar
+
+    weekmask = db.scalars(select(WorkingCalendar.weekmask).where(WorkingCalendar.id == calendar_id)).one_or_none()
+
+    if weekmask is None:
+        raise NameError(f"Calendar with ID {calendar_id} is not found")
+
+    holidays = db.scalars(select(Holiday.date).where(Holiday.calendar_id == calendar_id)).all()
+    calendar = BusinessCalendar(weekmask, list(holidays))
+    _calendars.set(cache_key, calendar)
+
+    return calendar
+
+def _default_calendar() -> BusinessCalendar:
+    calendar = _calendars.get(None)
+
+    if calendar is None:
+        calendar = BusinessCalendar(settings.default_calendar_weekmask)
+        _calendars.set(None, calendar)
+
+    return calendar
+
+def clear_calendar_cache() -> None:
+    _calendars.clear()
@@ -0,0 +1,49 @@
+"""CPU cost vs. bandwidth saved when compressing the GET /employee payload.
+
+    python -m benchmarks.compression --employees 10000
+"""
+from app.compression import _gzip_encoder, _zstd_encoder
+from benchmarks.payloads import employee_list
+import argparse
+import time
+
+def measure(factory, payload: bytes, chunk_size: int, repeat: int) -> tuple[int, float]:
+    """Compressed size and best CPU seconds, feeding the payload in streaming-sized chunks."""
+    best = float("inf")
+
+    for _ in range(repeat):
+        started = time.process_time()
+        encoder = factory()
+        size = sum(len(encoder.compress(payload[i:i + chunk_size])) for i in range(0, len(payload), chunk_size))
+        size += len(encoder.flush())
+        best = min(best, time.process_time() - started)
+
+    return size, best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=10_000)
+    parser.add_argument("--chunk-size", type=int, default=64 * 1024)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = employee_list(args.employees).model_dump_json().encode()
+    candidates = [(f"gzip-{level}", lambda level=level: _gzip_encoder(level)) for level in (1, 6, 9)]
+
+    if _zstd_encoder is not None:
+        candidates += [(f"zstd-{level}", lambda level=level: _zstd_encoder(level)) for level in (1, 3, 9)]
+
+    print(f"{args.employees} employees, {len(payload) / 1024:.0f} KiB uncompressed, {args.chunk_size // 1024} KiB chunks")
+    print(f"{'coding':<8} {'KiB':>8} {'ratio':>6} {'saved':>7} {'CPU ms':>8} {'MiB/s':>7} {'KiB saved/CPU ms':>17}")
+
+    for name, factory in candidates:
+        size, seconds = measure(factory, payload, args.chunk_size, args.repeat)
+        saved = len(payload) - size
+
+        print(
+            f"{name:<8} {size / 1024:>8.0f} {len(payload) / size:>6.1f} {saved / len(payload):>7.1%} "
+            f"{seconds * 1000:>8.1f} {len(payload) / seconds / 2**20:>7.0f} {saved / 1024 / (seconds * 1000):>17.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
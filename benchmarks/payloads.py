@@ -0,0 +1,56 @@
+"""Synthetic API payloads shared by the benchmarks."""
+from app.employee.schemas import EmployeeSchema, EmployeesSchema
+from app.presence.schemas import PresenceEventSchema, PresenceEventType
+from datetime import datetime, timedelta
+import random
+import uuid
+
+def employee_list(count: int) -> EmployeesSchema:
+    """A GET /employee response with `count` realistic employees, always the same for a given count."""
+    rng = random.Random(0)
+    departments = ["Information Technology", "Human Resources", "Finance", "Operations", "Sales"]
+    jobs = ["Software Engineer", "Recruiter", "Accountant", "Analyst", "Account Executive"]
+    statuses = ["Full Time", "Part Time", "Contract"]
+    now = datetime(2026, 1, 1)
+
+    data = [
+        EmployeeSchema(
+            id=uuid.UUID(int=rng.getrandbits(128), version=4),
+            full_name=f"Employee {index}",
+            gender=bool(index % 2),
+            birthday=now - timedelta(days=rng.randint(20 * 365, 60 * 365)),
+            email_address=f"employee{index}@email.com",
+            phone_number=f"+628{rng.randint(10**9, 10**10 - 1)}",
+            address=f"Street {rng.randint(1, 500)} No. {rng.randint(1, 99)}",
+            department=rng.choice(departments),
+            job=rng.choice(jobs),
+            salary=rng.randint(3, 40) * 1_000_000,
+            employee_status=rng.choice(statuses),
+            hire_date=now - timedelta(days=rng.randint(0, 3650)),
+            created_at=now,
+            updated_at=now
+        )
+        for index in range(count)
+    ]
+
+    return EmployeesSchema(data=data, count=count)
+
+def presence_events(count: int) -> list[PresenceEventSchema]:
+    """A day's worth of clock-in/clock-out events for count // 2 employees."""
+    rng = random.Random(0)
+    start = datetime(2026, 1, 5, 7)
+    events = []
+
+    for index in range(count):
+        employee_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+        clock_out = index % 2 == 1
+
+        events.append(PresenceEventSchema(
+            type=PresenceEventType.CLOCK_OUT if clock_out else PresenceEventType.CLOCK_IN,
+            presence_id=index + 1,
+            employee_id=employee_id,
+            status="present",
+            at=start + timedelta(hours=9 if clock_out else 0, seconds=rng.randint(0, 7200))
+        ))
+
+    return events
@@ -0,0 +1,65 @@
+"""JSON vs. MessagePack size, encode and decode time for the employee and presence payloads.
+
+    python -m benchmarks.serialization --employees 10000 --events 20000
+"""
+from app.presence.schemas import PresenceEventSchema
+from benchmarks.payloads import employee_list, presence_events
+from pydantic import TypeAdapter
+import argparse
+import json
+import msgpack
+import time
+
+def best_of(repeat: int, func) -> float:
+    best = float("inf")
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+
+    return best
+
+def report(name: str, dump_json, dump_python, repeat: int) -> None:
+    as_json = dump_json()
+    # What MsgPackRoute sends: the validated model dumped to Python and packed
+    as_msgpack = msgpack.packb(dump_python())
+
+    rows = [
+        ("JSON", len(as_json), best_of(repeat, dump_json), best_of(repeat, lambda: json.loads(as_json))),
+        ("MessagePack", len(as_msgpack), best_of(repeat, lambda: msgpack.packb(dump_python())), best_of(repeat, lambda: msgpack.unpackb(as_msgpack))),
+    ]
+
+    print(name)
+    print(f"  {'format':<12} {'KiB':>8} {'encode ms':>10} {'decode ms':>10}")
+
+    for label, size, encode, decode in rows:
+        decoded = f"{decode * 1000:>10.1f}" if decode is not None else f"{'':>10}"
+        print(f"  {label:<12} {size / 1024:>8.0f} {encode * 1000:>10.1f} {decoded}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=10_000)
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    employees = employee_list(args.employees)
+    report(
+        f"GET /employee, {args.employees} employees",
+        employees.model_dump_json,
+        lambda: employees.model_dump(mode="json"),
+        args.repeat
+    )
+
+    events = presence_events(args.events)
+    adapter = TypeAdapter(list[PresenceEventSchema])
+    report(
+        f"presence events, {args.events} events",
+        lambda: adapter.dump_json(events),
+        lambda: adapter.dump_python(events, mode="json"),
+        args.repeat
+    )
+
+if __name__ == "__main__":
+    main()
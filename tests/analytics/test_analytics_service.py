@@ -0,0 +1,120 @@
+from app.analytics.schemas import GroupBy
+from app.analytics.service import headcount, compensation, _percentiles_in_numpy, _group_keys
+from app.analytics.utils import get_data_version, result_cache
+from app.database import Base
+from app.department.models import Department, Job
+from app.employee.models import Employee, EmployeeStatus
+from tests.conftest import TestingSessionLocal, engine
+from datetime import datetime
+import numpy as np
+import pytest
+import uuid
+
+SALARIES = {
+    "IT": [1000, 2000, 3000, 4000],
+    "HR": [5000],
+}
+
+def test_headcount_by_department(db):
+    result = headcount(GroupBy.DEPARTMENT, db)
+
+    assert {group.key: group.headcount for group in result.data} == {"IT": 4, "HR": 1}
+    assert result.total == 5
+
+def test_headcount_by_hire_bucket(db):
+    by_year = headcount(GroupBy.HIRE_YEAR, db)
+    by_month = headcount(GroupBy.HIRE_MONTH, db)
+
+    assert {group.key: group.headcount for group in by_year.data} == {"2020": 3, "2021": 2}
+    assert {group.key: group.headcount for group in by_month.data} == {"2020-01": 3, "2021-06": 2}
+
+def test_compensation_by_department(db):
+    result = compensation(GroupBy.DEPARTMENT, db)
+    groups = {group.key: group for group in result.data}
+
+    it = groups["IT"]
+    assert (it.count, it.min, it.max, it.avg) == (4, 1000, 4000, 2500)
+    assert it.p50 == pytest.approx(np.percentile(SALARIES["IT"], 50))
+    assert it.p90 == pytest.approx(np.percentile(SALARIES["IT"], 90))
+
+    hr = groups["HR"]
+    assert (hr.count, hr.p25, hr.p90) == (1, 5000, 5000)
+
+def test_numpy_percentiles_match_groups(db):
+    keys, join = _group_keys(GroupBy.JOB)
+    percentiles = _percentiles_in_numpy(keys, join, db)
+
+    assert percentiles[(1, "Engineer")] == pytest.approx(np.percentile(SALARIES["IT"], [25, 50, 75, 90]).tolist())
+
+def test_results_cached_until_employee_changes(db):
+    version = get_data_version("employee", db)
+    first = headcount(GroupBy.STATUS, db)
+
+    assert headcount(GroupBy.STATUS, db) is first
+
+    employee = db.query(Employee).first()
+    employee.salary += 1
+    db.commit()
+
+    assert get_data_version("employee", db) == version + 1
+    assert headcount(GroupBy.STATUS, db) is not first
+
+def test_version_is_bumped_outside_the_writer_transaction(db):
+    version = get_data_version("employee", db)
+
+    employee = db.query(Employee).first()
+    employee.salary += 1
+    db.flush()
+
+    # The writer's transaction never touches the shared version row
+    assert get_data_version("employee", db) == version
+
+    db.rollback()
+
+    assert get_data_version("employee", db) == version
+
+    employee.salary += 1
+    db.commit()
+
+    assert get_data_version("employee", db) == version + 1
+
+def setup_module():
+    Base.metadata.create_all(bind=engine)
+    result_cache.clear()
+
+    with TestingSessionLocal() as db:
+        db.add_all([
+            Department(id=1, name="IT", description=""),
+            Department(id=2, name="HR", description=""),
+            EmployeeStatus(id=1, name="Full Time", description=""),
+        ])
+        db.commit()
+        db.add_all([
+            Job(id=1, department_id=1, name="Engineer", description=""),
+            Job(id=2, department_id=2, name="Recruiter", description=""),
+        ])
+        db.commit()
+
+        hire_dates = [datetime(2020, 1, 1), datetime(2020, 1, 2), datetime(2020, 1, 3), datetime(2021, 6, 1), datetime(2021, 6, 2)]
+        rows = [(1, 1, salary) for salary in SALARIES["IT"]] + [(2, 2, salary) for salary in SALARIES["HR"]]
+
+        for index, ((department_id, job_id, salary), hire_date) in enumerate(zip(rows, hire_dates)):
+            db.add(Employee(
+                id=uuid.uuid4(),
+                full_name=f"Employee {index}",
+                gender=True,
+                birthday=datetime(1990, 1, 1),
+                email_address=f"employee{index}@email.com",
+                phone_number="+6281234567890",
+                address="Address",
+                department_id=department_id,
+                job_id=job_id,
+                salary=salary,
+                employee_status_id=1,
+                hire_date=hire_date
+            ))
+        db.commit()
+
+def teardown_module():
+    Base.metadata.drop_all(bind=engine)
+    result_cache.clear()
@@ -0,0 +1,89 @@
+from app.database import Base
+from app.employee.models import Employee
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from tests.utils import get_access_token
+from tests.conftest import TestingSessionLocal, engine
+from datetime import datetime
+import uuid
+
+FIRST = uuid.UUID("00000000-0000-0000-0000-000000000001")
+SECOND = uuid.UUID("00000000-0000-0000-0000-000000000002")
+MISSING = uuid.UUID("00000000-0000-0000-0000-0000000000ff")
+
+def auth(client: TestClient) -> dict:
+    return {"Authorization": f"Bearer {get_access_token(client, 'admin', 'admin')}"}
+
+def test_get_by_ids_in_request_order(client: TestClient):
+    headers = auth(client)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM employee" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get(f"/employee?ids={SECOND},{MISSING},{FIRST}", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    body = response.json()
+
+    assert [employee and employee["full_name"] for employee in body["data"]] == ["Employee 2", None, "Employee 1"]
+    assert body["data"][0]["department"] == "IT"
+    assert body["not_found"] == [str(MISSING)]
+    assert body["count"] == 2
+    assert len(statements) == 1
+
+def test_post_batch_get_with_fields(client: TestClient):
+    response = client.post("/employee/batch-get?fields=full_name", json={"ids": [str(FIRST), str(FIRST), str(MISSING)]}, headers=auth(client))
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "data": [{"full_name": "Employee 1"}, {"full_name": "Employee 1"}, None],
+        "not_found": [str(MISSING)],
+        "count": 2
+    }
+
+def test_batch_limits(client: TestClient):
+    headers = auth(client)
+
+    assert client.get("/employee?ids=not-a-uuid", headers=headers).status_code == 400
+    assert client.get("/employee?ids=", headers=headers).status_code == 400
+    assert client.post("/employee/batch-get", json={"ids": []}, headers=headers).status_code == 422
+
+    too_many = [str(uuid.uuid4()) for _ in range(101)]
+    assert client.post("/employee/batch-get", json={"ids": too_many}, headers=headers).status_code == 400
+
+def setup_module():
+    from tests.utils import create_user, create_department, create_job, create_status_employee
+
+    Base.metadata.create_all(bind=engine)
+
+    create_user("admin", "admin", "active", is_superuser=True)
+    create_department(id=1, name="IT", description="Description")
+    create_job(id=1, department_id=1)
+    create_status_employee(id=1)
+
+    with TestingSessionLocal() as db:
+        for index, employee_id in enumerate([FIRST, SECOND], start=1):
+            db.add(Employee(
+                id=employee_id,
+                full_name=f"Employee {index}",
+                gender=True,
+                birthday=datetime(1990, 1, 1),
+                email_address=f"batch{index}@email.com",
+                phone_number="+6281234567890",
+                address="Address",
+                department_id=1,
+                job_id=1,
+                salary=1000,
+                employee_status_id=1,
+                hire_date=datetime(2020, 1, 1)
+            ))
+        db.commit()
+
+def teardown_module():
+    Base.metadata.drop_all(bind=engine)
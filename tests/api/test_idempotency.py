@@ -0,0 +1,86 @@
+from app.database import Base
+from app.employee.models import Employee
+from app.idempotency.service import clear_idempotency_cache
+from fastapi.testclient import TestClient
+from tests.utils import get_access_token
+from tests.conftest import engine
+
+def payload(email: str = "idempotent@email.com") -> dict:
+    return {
+        "employee": {
+            "full_name": "Idempotent Employee",
+            "gender": True,
+            "birthday": "1990-01-01T00:00:00",
+            "hire_date": "2020-01-01T00:00:00",
+            "email_address": email,
+            "phone_number": "+6281234567890",
+            "address": "Address",
+            "department": 1,
+            "job": 1,
+            "salary": 1000,
+            "employee_status": 1
+        },
+        "user": {"username": email, "password": "password", "status": "active"}
+    }
+
+def test_retry_replays_stored_response(client: TestClient, db):
+    token = get_access_token(client, "admin", "admin")
+    headers = {"Authorization": f"Bearer {token}", "Idempotency-Key": "create-1"}
+
+    first = client.post("/employee", json=payload(), headers=headers)
+    assert first.status_code == 201
+    assert "Idempotent-Replayed" not in first.headers
+
+    retry = client.post("/employee", json=payload(), headers=headers)
+    assert retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+
+    # Without the in-process cache the response comes from the table
+    clear_idempotency_cache()
+    retry = client.post("/employee", json=payload(), headers=headers)
+    assert retry.status_code == 201
+    assert retry.headers["Idempotent-Replayed"] == "true"
+
+    assert db.query(Employee).filter_by(email_address="idempotent@email.com").count() == 1
+
+def test_key_reused_with_different_body(client: TestClient):
+    token = get_access_token(client, "admin", "admin")
+    headers = {"Authorization": f"Bearer {token}", "Idempotency-Key": "create-1"}
+
+    resp = client.post("/employee", json=payload("other@email.com"), headers=headers)
+    assert resp.status_code == 422
+
+def test_failed_request_releases_key(client: TestClient):
+    token = get_access_token(client, "admin", "admin")
+    headers = {"Authorization": f"Bearer {token}", "Idempotency-Key": "create-2"}
+
+    # Duplicate email, the handler fails
+    resp = client.post("/employee", json=payload(), headers=headers)
+    assert resp.status_code == 409
+
+    resp = client.post("/employee", json=payload(), headers=headers)
+    assert resp.status_code == 409
+    assert resp.json()["detail"] == "Duplicate entry for employee or user"
+
+def test_without_key_handler_runs_every_time(client: TestClient):
+    token = get_access_token(client, "admin", "admin")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    resp = client.post("/employee", json=payload(), headers=headers)
+    assert resp.status_code == 409
+
+def setup_module():
+    from tests.utils import create_user, create_department, create_job, create_status_employee
+
+    Base.metadata.create_all(bind=engine)
+    clear_idempotency_cache()
+
+    create_user("admin", "admin", "active", is_superuser=True)
+    create_department(id=1, name="IT", description="Description")
+    create_job(id=1, department_id=1)
+    create_status_employee(id=1)
+
+def teardown_module():
+    Base.metadata.drop_all(bind=engine)
+    clear_idempotency_cache()
@@ -0,0 +1,93 @@
+from app.database import Base
+from app.employee.models import Employee
+from app.negotiation import prefers_msgpack
+from fastapi.testclient import TestClient
+from tests.utils import get_access_token
+from tests.conftest import TestingSessionLocal, engine
+from datetime import datetime
+import msgpack
+import uuid
+
+MSGPACK = "application/msgpack"
+
+def auth(client: TestClient, accept: str | None = MSGPACK) -> dict:
+    headers = {"Authorization": f"Bearer {get_access_token(client, 'admin', 'admin')}"}
+
+    if accept is not None:
+        headers["Accept"] = accept
+
+    return headers
+
+def test_prefers_msgpack():
+    assert prefers_msgpack("application/msgpack")
+    assert prefers_msgpack("application/x-msgpack, application/json")
+    assert prefers_msgpack("application/json;q=0.5, application/msgpack")
+    assert not prefers_msgpack("")
+    assert not prefers_msgpack("*/*")
+    assert not prefers_msgpack("application/json, application/msgpack;q=0.9")
+    assert not prefers_msgpack("application/msgpack;q=0")
+
+def test_employee_list_same_schema_as_json(client: TestClient):
+    as_json = client.get("/employee", headers=auth(client, accept=None))
+    as_msgpack = client.get("/employee", headers=auth(client))
+
+    assert as_json.headers["Content-Type"] == "application/json"
+    assert as_msgpack.status_code == 200
+    assert as_msgpack.headers["Content-Type"] == MSGPACK
+    assert "Accept" in as_msgpack.headers["Vary"]
+    assert msgpack.unpackb(as_msgpack.content) == as_json.json()
+
+def test_sparse_fields_in_msgpack(client: TestClient):
+    response = client.get("/employee?fields=id,full_name", headers=auth(client))
+
+    assert response.headers["Content-Type"] == MSGPACK
+    assert msgpack.unpackb(response.content) == {
+        "data": [{"id": "00000000-0000-0000-0000-000000000001", "full_name": "Packed Employee"}],
+        "count": 1
+    }
+
+def test_department_and_roles(client: TestClient):
+    department = client.get("/department/1", headers=auth(client))
+    assert department.headers["Content-Type"] == MSGPACK
+    assert department.headers["ETag"] == '"1"'
+    assert msgpack.unpackb(department.content)["name"] == "IT"
+
+    roles = client.get("/roles/", headers=auth(client))
+    assert [role["name"] for role in msgpack.unpackb(roles.content)] == ["Viewer"]
+
+def test_errors_stay_json(client: TestClient):
+    response = client.get("/department/999", headers=auth(client))
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Department not found"}
+
+def setup_module():
+    from tests.utils import create_user, create_department, create_job, create_status_employee, create_role
+
+    Base.metadata.create_all(bind=engine)
+
+    create_user("admin", "admin", "active", is_superuser=True)
+    create_department(id=1, name="IT", description="Description")
+    create_job(id=1, department_id=1)
+    create_status_employee(id=1)
+    create_role(id=1, role_name="Viewer")
+
+    with TestingSessionLocal() as db:
+        db.add(Employee(
+            id=uuid.UUID("00000000-0000-0000-0000-000000000001"),
+            full_name="Packed Employee",
+            gender=True,
+            birthday=datetime(1990, 1, 1),
+            email_address="packed@email.com",
+            phone_number="+6281234567890",
+            address="Address",
+            department_id=1,
+            job_id=1,
+            salary=1000,
+            employee_status_id=1,
+            hire_date=datetime(2020, 1, 1)
+        ))
+        db.commit()
+
+def teardown_module():
+    Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,68 @@
+from app.database import Base
+from fastapi.testclient import TestClient
+from tests.utils import get_access_token
+from tests.conftest import engine
+
+def auth(client: TestClient, **extra) -> dict:
+    token = get_access_token(client, "admin", "admin")
+
+    return {"Authorization": f"Bearer {token}", **extra}
+
+def test_department_update_with_matching_etag(client: TestClient):
+    read = client.get("/department/1", headers=auth(client))
+    assert read.status_code == 200
+    assert read.headers["ETag"] == '"1"'
+    assert read.json()["version"] == 1
+
+    body = {"name": "IT", "description": "Renamed", "is_active": True}
+    response = client.put("/department/1", json=body, headers=auth(client, **{"If-Match": read.headers["ETag"]}))
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"2"'
+
+def test_department_update_with_stale_etag(client: TestClient):
+    body = {"name": "IT", "description": "Lost update", "is_active": True}
+    response = client.put("/department/1", json=body, headers=auth(client, **{"If-Match": '"1"'}))
+    assert response.status_code == 412
+
+    assert client.get("/department/1", headers=auth(client)).json()["description"] == "Renamed"
+
+def test_update_without_if_match_still_works(client: TestClient):
+    body = {"name": "IT", "description": "Unconditional", "is_active": True}
+    response = client.put("/department/1", json=body, headers=auth(client))
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"3"'
+
+def test_malformed_if_match(client: TestClient):
+    body = {"name": "IT", "description": "Description", "is_active": True}
+    response = client.put("/department/1", json=body, headers=auth(client, **{"If-Match": "not-a-version"}))
+    assert response.status_code == 400
+
+def test_role_and_permission_updates_are_conditional(client: TestClient):
+    assert client.post("/roles/", json={"name": "Auditor", "description": "Reads"}, headers=auth(client)).status_code == 201
+    role = next(role for role in client.get("/roles/", headers=auth(client)).json() if role["name"] == "Auditor")
+
+    body = {"name": "Auditor", "description": "Reads everything"}
+    assert client.put(f"/roles/{role['id']}", json=body, headers=auth(client, **{"If-Match": '"1"'})).status_code == 200
+    assert client.put(f"/roles/{role['id']}", json=body, headers=auth(client, **{"If-Match": '"1"'})).status_code == 412
+    assert client.get(f"/roles/{role['id']}", headers=auth(client)).headers["ETag"] == '"2"'
+
+    permission = {"name": "audit_read", "resource": "audit", "action": "read", "description": "Read audit"}
+    assert client.post("/permission/", json=permission, headers=auth(client)).status_code == 201
+    created = next(p for p in client.get("/permission/", headers=auth(client)).json() if p["name"] == "audit_read")
+
+    permission["description"] = "Read the audit log"
+    assert client.put(f"/permission/{created['id']}", json=permission, headers=auth(client, **{"If-Match": '"2"'})).status_code == 412
+    response = client.put(f"/permission/{created['id']}", json=permission, headers=auth(client, **{"If-Match": '"1"'}))
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"2"'
+
+def setup_module():
+    from tests.utils import create_user, create_department
+
+    Base.metadata.create_all(bind=engine)
+
+    create_user("admin", "admin", "active", is_superuser=True)
+    create_department(id=1, name="IT", description="Description")
+
+def teardown_module():
+    Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,52 @@
+from app.database import Base
+from app.presence.router import presence_events
+from app.presence.events import presence_hub
+from fastapi.testclient import TestClient
+from tests.conftest import TestingSessionLocal, engine
+from tests.utils import get_access_token
+import asyncio
+
+def test_events_require_a_token(client: TestClient):
+    assert client.get("/presence/events").status_code == 401
+
+def test_events_require_permission(client: TestClient):
+    headers = {"Authorization": f"Bearer {get_access_token(client, 'watcher', 'watcher')}"}
+
+    assert client.get("/presence/events", headers=headers).status_code == 403
+
+def test_session_is_closed_before_streaming(client: TestClient):
+    closed = []
+
+    def tracking_factory():
+        session = TestingSessionLocal()
+        close = session.close
+        session.close = lambda: closed.append(True) or close()
+        return session
+
+    token = get_access_token(client, "streamer", "streamer")
+
+    async def open_stream():
+        response = await presence_events(token, tracking_factory)
+
+        # The stream is open and its first event is ready, the session is already closed
+        assert closed == [True]
+        assert (await anext(response.body_iterator)).startswith("id: ")
+
+        await response.body_iterator.aclose()
+
+    asyncio.run(open_stream())
+
+    assert len(presence_hub) == 0
+
+def setup_module():
+    from tests.utils import create_user
+
+    # Create the database tables
+    Base.metadata.create_all(bind=engine)
+
+    create_user("watcher", "watcher")
+    create_user("streamer", "streamer", is_superuser=True)
+
+def teardown_module():
+    # Drop the database tables
+    Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,80 @@
+from app.database import Base
+from app.policy.models import Role, role_permissions
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from tests.utils import get_access_token
+from tests.conftest import engine
+
+def admin(client: TestClient) -> dict:
+    return {"Authorization": f"Bearer {get_access_token(client, 'admin', 'admin')}"}
+
+def grants(db, role_id: int) -> set[int]:
+    return set(db.scalars(select(role_permissions.c.permission_id).where(role_permissions.c.role_id == role_id)))
+
+def test_put_applies_only_the_difference(client: TestClient, db):
+    headers = admin(client)
+
+    response = client.put("/roles/1/permissions", json={"permission_ids": [1, 2]}, headers=headers)
+    assert response.status_code == 200
+    assert (response.json()["added"], response.json()["removed"]) == (2, 0)
+
+    version = db.scalars(select(Role.permission_version).where(Role.id == 1)).one()
+
+    response = client.put("/roles/1/permissions", json={"permission_ids": [2, 3]}, headers=headers)
+    assert (response.json()["added"], response.json()["removed"]) == (1, 1)
+    assert grants(db, 1) == {2, 3}
+    assert db.scalars(select(Role.permission_version).where(Role.id == 1)).one() == version + 1
+
+    # Same set again writes nothing and keeps cached grants valid
+    response = client.put("/roles/1/permissions", json={"permission_ids": [3, 2]}, headers=headers)
+    assert (response.json()["added"], response.json()["removed"]) == (0, 0)
+    db.expire_all()
+    assert db.scalars(select(Role.permission_version).where(Role.id == 1)).one() == version + 1
+
+def test_put_with_unknown_ids(client: TestClient, db):
+    headers = admin(client)
+
+    assert client.put("/roles/99/permissions", json={"permission_ids": [1]}, headers=headers).status_code == 404
+
+    response = client.put("/roles/1/permissions", json={"permission_ids": [1, 98, 99]}, headers=headers)
+    assert response.status_code == 404
+    assert "98, 99" in response.json()["detail"]
+    assert grants(db, 1) == {2, 3}
+
+def test_grant_takes_effect_for_existing_tokens(client: TestClient, db):
+    user = {"Authorization": f"Bearer {get_access_token(client, 'reader@user.com', 'p')}"}
+    assert client.get("/roles/", headers=user).status_code == 403
+
+    response = client.post("/roles/permissions/grant", json={"role_ids": [1, 2], "permission_ids": [1, 3]}, headers=admin(client))
+    assert response.status_code == 200
+    assert response.json()["granted"] == 3
+
+    assert grants(db, 1) == {1, 2, 3}
+    assert grants(db, 2) == {1, 3}
+    assert client.get("/roles/", headers=user).status_code == 200
+
+    # Granting again adds nothing
+    response = client.post("/roles/permissions/grant", json={"role_ids": [1, 2], "permission_ids": [1, 3]}, headers=admin(client))
+    assert response.json()["granted"] == 0
+
+def test_grant_with_unknown_role(client: TestClient):
+    response = client.post("/roles/permissions/grant", json={"role_ids": [1, 42], "permission_ids": [1]}, headers=admin(client))
+
+    assert response.status_code == 404
+    assert "42" in response.json()["detail"]
+
+def setup_module():
+    from tests.utils import create_user, create_role, create_permission
+
+    Base.metadata.create_all(bind=engine)
+
+    create_user("admin", "admin", "active", is_superuser=True)
+    create_role(id=1, role_name="Reader")
+    create_role(id=2, role_name="Auditor")
+    create_permission(id=1, name="roles_list", resource="roles", action="list")
+    create_permission(id=2, name="roles_read", resource="roles", action="read")
+    create_permission(id=3, name="roles_update", resource="roles", action="update")
+    create_user("reader@user.com", "p", "active", role_id=2)
+
+def teardown_module():
+    Base.metadata.drop_all(bind=engine)
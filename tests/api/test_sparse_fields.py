@@ -0,0 +1,112 @@
+from app.database import Base
+from app.employee.models import Employee
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from tests.utils import get_access_token
+from tests.conftest import TestingSessionLocal, engine
+from contextlib import contextmanager
+from datetime import datetime
+import uuid
+
+def auth(client: TestClient) -> dict:
+    return {"Authorization": f"Bearer {get_access_token(client, 'admin', 'admin')}"}
+
+@contextmanager
+def captured_sql():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+def test_employee_fields_narrow_query_and_payload(client: TestClient):
+    headers = auth(client)
+
+    with captured_sql() as statements:
+        response = client.get("/employee?fields=id,full_name", headers=headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 1
+    assert body["data"] == [{"id": "00000000-0000-0000-0000-000000000001", "full_name": "Sparse Employee"}]
+
+    employee_queries = [statement for statement in statements if "FROM employee" in statement]
+    assert employee_queries
+    assert all("address" not in statement and "salary" not in statement for statement in employee_queries)
+
+def test_employee_lookup_names_are_joined_only_when_asked(client: TestClient):
+    response = client.get("/employee/00000000-0000-0000-0000-000000000001?fields=full_name,department,job", headers=auth(client))
+
+    assert response.status_code == 200
+    assert response.json() == {"full_name": "Sparse Employee", "department": "IT", "job": "Engineer"}
+
+def test_employee_without_fields_is_unchanged(client: TestClient):
+    response = client.get("/employee/00000000-0000-0000-0000-000000000001", headers=auth(client))
+
+    assert response.status_code == 200
+    assert response.json()["address"] == "Address"
+
+def test_unknown_field(client: TestClient):
+    response = client.get("/employee?fields=id,password", headers=auth(client))
+
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
+
+def test_department_fields(client: TestClient):
+    headers = auth(client)
+
+    response = client.get("/department/?fields=id,name", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {"data": [{"id": 1, "name": "IT"}], "count": 1}
+
+    response = client.get("/department/1?fields=name,jobs", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"1"'
+    assert response.json() == {"name": "IT", "jobs": [{"id": 1, "name": "Engineer", "description": "Engineer Job", "is_active": True}]}
+
+def test_role_fields(client: TestClient):
+    headers = auth(client)
+
+    roles = client.get("/roles/?fields=name", headers=headers)
+    assert roles.status_code == 200
+    assert roles.json() == [{"name": "Viewer"}]
+
+    role = client.get("/roles/1?fields=id,permissions", headers=headers)
+    assert role.status_code == 200
+    assert role.json() == {"id": 1, "permissions": []}
+
+def setup_module():
+    from tests.utils import create_user, create_department, create_job, create_status_employee, create_role
+
+    Base.metadata.create_all(bind=engine)
+
+    create_user("admin", "admin", "active", is_superuser=True)
+    create_department(id=1, name="IT", description="Description")
+    create_job(id=1, department_id=1, name="Engineer", description="Engineer Job")
+    create_status_employee(id=1)
+    create_role(id=1, role_name="Viewer")
+
+    with TestingSessionLocal() as db:
+        db.add(Employee(
+            id=uuid.UUID("00000000-0000-0000-0000-000000000001"),
+            full_name="Sparse Employee",
+            gender=True,
+            birthday=datetime(1990, 1, 1),
+            email_address="sparse@email.com",
+            phone_number="+6281234567890",
+            address="Address",
+            department_id=1,
+            job_id=1,
+            salary=1000,
+            employee_status_id=1,
+            hire_date=datetime(2020, 1, 1)
+        ))
+        db.commit()
+
+def teardown_module():
+    Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,110 @@
+from app.auth.models import PasswordResetToken
+from app.auth.service import create_password_reset_token, reset_password, hash_token
+from app.database import Base
+from app.employee.models import Employee
+from app.mail.service import mail_queue
+from app.mail.transport import MemoryTransport
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+from tests.conftest import engine, TestingSessionLocal
+from datetime import datetime
+import asyncio
+import pytest
+import re
+import uuid
+
+EMPLOYEE = uuid.uuid4()
+
+def deliver_mail() -> MemoryTransport:
+    transport = MemoryTransport()
+    mail_queue.transport = transport
+
+    async def drain():
+        await mail_queue.start()
+        await mail_queue.join()
+        await mail_queue.stop()
+
+    asyncio.run(drain())
+
+    return transport
+
+def test_forgot_password_mails_single_use_token(client: TestClient, db):
+    resp = client.post("/forgot-password", params={"email": "reset@email.com"})
+
+    assert resp.status_code == 204
+
+    outbox = deliver_mail().outbox
+    assert [email["To"] for email in outbox] == ["reset@email.com"]
+
+    token = re.search(r"token=(\S+)", outbox[0].get_content()).group(1)
+
+    # Only the hash is stored
+    assert db.scalars(select(PasswordResetToken).where(PasswordResetToken.token_hash == token)).first() is None
+
+    resp = client.post("/reset-password", json={"token": token, "new_password": "new-password"})
+    assert resp.status_code == 200
+
+    resp = client.post("/login", data={"username": "resetter", "password": "new-password"})
+    assert resp.status_code == 200
+
+    resp = client.post("/reset-password", json={"token": token, "new_password": "another-password"})
+    assert resp.status_code == 400
+
+def test_new_token_invalidates_previous(db):
+    user = db.scalars(select(Employee).where(Employee.id == EMPLOYEE)).one().user
+
+    first = create_password_reset_token(user, db)
+    second = create_password_reset_token(user, db)
+
+    with pytest.raises(ValueError):
+        reset_password(first, "password-one", db)
+
+    reset_password(second, "password-two", db)
+
+def test_expired_token_is_rejected(db):
+    user = db.scalars(select(Employee).where(Employee.id == EMPLOYEE)).one().user
+    token = create_password_reset_token(user, db)
+
+    db.execute(
+        update(PasswordResetToken)
+        .where(PasswordResetToken.token_hash == hash_token(token))
+        .values(expires_at=datetime(2000, 1, 1))
+    )
+    db.commit()
+
+    with pytest.raises(ValueError):
+        reset_password(token, "password-three", db)
+
+def setup_module():
+    from tests.utils import create_user, create_department, create_job, create_status_employee
+    from app.auth.models import User
+
+    Base.metadata.create_all(bind=engine)
+
+    create_department(1)
+    create_job(1, 1)
+    create_status_employee(1)
+
+    with TestingSessionLocal() as db:
+        db.add(Employee(
+            id=EMPLOYEE,
+            full_name="Resetter",
+            gender=True,
+            birthday=datetime(1990, 1, 1),
+            email_address="reset@email.com",
+            phone_number="+6281234567890",
+            address="Address",
+            department_id=1,
+            job_id=1,
+            employee_status_id=1
+        ))
+        db.commit()
+
+    user = create_user("resetter", "old-password")
+
+    with TestingSessionLocal() as db:
+        db.execute(update(User).where(User.id == user.id).values(employee_id=EMPLOYEE))
+        db.commit()
+
+def teardown_module():
+    Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,92 @@
+from app.auth.schemas import TokenData
+from app.database import Base
+from app.policy.models import Permission, Role, role_permissions
+from app.policy.service import set_role_permissions, grant_permissions, create_p, delete_p
+from app.policy.utils import clear_permission_cache, has_permission, permission_mask
+from sqlalchemy import delete, insert, select, update
+from fastapi.testclient import TestClient
+from tests.conftest import engine
+from tests.utils import create_permission
+import jwt
+import uuid
+
+def login(client: TestClient) -> str:
+    resp = client.post("/login", data={"username": "masked", "password": "masked"})
+    assert resp.status_code == 200
+
+    return resp.json()["access_token"]
+
+def principal(mask: int | None, version: int = 1) -> TokenData:
+    return TokenData(id=uuid.uuid4(), username="masked", role_id=22, status="active", permission_version=version, permission_mask=mask)
+
+def test_permission_mask_uses_ids_as_bits():
+    assert permission_mask([]) == 0
+    assert permission_mask([1, 3]) == 0b1010
+    assert permission_mask([70]) >> 70 & 1
+
+def test_access_token_carries_role_mask(client: TestClient):
+    claims = jwt.decode(login(client), options={"verify_signature": False})
+
+    assert int(claims["pm"], 16) == permission_mask([41])
+
+def test_mask_check_needs_no_grants_query(db):
+    # The first check learns the role's version, later ones need no query at all
+    assert has_permission(principal(permission_mask([41])), "roles", "list", db)
+    assert has_permission(principal(permission_mask([41])), "roles", "list", None)
+
+def test_cold_cache_does_not_trust_an_outdated_mask(db):
+    # Revoked by another worker: the role moved to version 2 and lost the grant
+    db.execute(update(Role).where(Role.id == 22).values(permission_version=2))
+    db.execute(delete(role_permissions).where(role_permissions.c.role_id == 22))
+    db.commit()
+    clear_permission_cache()
+
+    assert not has_permission(principal(permission_mask([41])), "roles", "list", db)
+
+    db.execute(insert(role_permissions).values(role_id=22, permission_id=41))
+    db.execute(update(Role).where(Role.id == 22).values(permission_version=1))
+    db.commit()
+    clear_permission_cache()
+
+def test_deleted_permission_id_is_not_reused(db):
+    create_permission(43, "Delete Roles", "roles", "delete")
+    delete_p(43, db)
+    create_p("Export Roles", "roles", "export", db)
+
+    assert db.scalars(select(Permission.id).where(Permission.name == "Export Roles")).one() > 43
+
+def test_missing_bit_falls_back_to_database(db):
+    # Granted after the token was minted, the role's grants still say yes
+    assert has_permission(principal(0), "roles", "list", db)
+    assert not has_permission(principal(0), "roles", "create", db)
+
+def test_token_older_than_grant_change_is_not_trusted(client: TestClient, db):
+    headers = {"Authorization": f"Bearer {login(client)}"}
+
+    assert client.get("/roles/", headers=headers).status_code == 200
+
+    set_role_permissions(22, set(), db)
+
+    # The token still has the bit but this process knows the role moved on
+    assert client.get("/roles/", headers=headers).status_code == 403
+
+    grant_permissions({22}, {41}, db)
+
+    assert client.get("/roles/", headers=headers).status_code == 200
+
+def setup_module():
+    from tests.utils import create_user, create_role, create_permission, assign_role
+
+    # Create the database tables
+    Base.metadata.create_all(bind=engine)
+
+    create_role(22, "Mask Reader", "Can list roles")
+    create_permission(41, "List Roles", "roles", "list")
+    create_permission(42, "Create Roles", "roles", "create")
+    assign_role(22, 41)
+
+    create_user("masked", "masked", role_id=22)
+
+def teardown_module():
+    # Drop the database tables
+    Base.metadata.drop_all(bind=engine)
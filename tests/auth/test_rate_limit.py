@@ -0,0 +1,79 @@
+from app.auth import rate_limit
+from app.auth.rate_limit import InMemoryRateLimitStore, RateLimiter, limit_login
+from app.database import Base
+from app.main import app
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from tests.conftest import engine
+import pytest
+
+def test_store_refills_over_time(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    store = InMemoryRateLimitStore()
+
+    assert store.consume("key", 2, 1.0) == 0
+    assert store.consume("key", 2, 1.0) == 0
+    assert store.consume("key", 2, 1.0) == pytest.approx(1.0)
+
+    now[0] += 1
+
+    assert store.consume("key", 2, 1.0) == 0
+
+def test_store_evicts_least_recently_used():
+    store = InMemoryRateLimitStore(max_keys=2)
+
+    store.consume("a", 1, 1.0)
+    store.consume("b", 1, 1.0)
+    store.consume("c", 1, 1.0)
+
+    assert len(store) == 2
+    # "a" was evicted, so it starts with a full bucket again
+    assert store.consume("a", 1, 1.0) == 0
+
+def test_limiter_rejects_per_identity_and_ip():
+    limiter = RateLimiter("test", attempts=1, ip_attempts=3, window_seconds=60, store=InMemoryRateLimitStore())
+
+    limiter.check("10.0.0.1", "admin")
+
+    with pytest.raises(HTTPException) as exc:
+        limiter.check("10.0.0.2", "ADMIN")
+
+    assert exc.value.status_code == 429
+    assert "Retry-After" in exc.value.headers
+
+    limiter.check("10.0.0.1", "other")
+    limiter.check("10.0.0.1", "another")
+
+    with pytest.raises(HTTPException):
+        limiter.check("10.0.0.1", "yet-another")
+
+    assert limiter.stats()["allowed"] == 3
+    assert limiter.stats()["rejected"] == 2
+
+def test_login_returns_429_before_hashing(client: TestClient, monkeypatch):
+    monkeypatch.delitem(app.dependency_overrides, limit_login)
+    monkeypatch.setattr(rate_limit.login_limiter, "store", InMemoryRateLimitStore())
+    monkeypatch.setattr(rate_limit.login_limiter, "attempts", 2)
+
+    for _ in range(2):
+        resp = client.post("/login", data={"username": "nobody", "password": "wrong"})
+        assert resp.status_code == 401
+
+    def fail_verify(*args):
+        raise AssertionError("Password must not be verified once rate limited")
+
+    monkeypatch.setattr("app.auth.dependencies.verify_password", fail_verify)
+
+    resp = client.post("/login", data={"username": "nobody", "password": "wrong"})
+
+    assert resp.status_code == 429
+    assert resp.headers["Retry-After"]
+
+def setup_module():
+    # Create the database tables
+    Base.metadata.create_all(bind=engine)
+
+def teardown_module():
+    # Drop the database tables
+    Base.metadata.drop_all(bind=engine)
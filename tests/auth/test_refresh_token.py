@@ -0,0 +1,115 @@
+from app.auth.models import User
+from app.database import Base
+from app.policy.models import Role
+from app.policy.service import bump_permission_version
+from app.policy.utils import get_role_permissions
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+from tests.conftest import engine
+import jwt
+
+def login(client: TestClient, username: str, password: str) -> dict:
+    resp = client.post("/login", data={"username": username, "password": password})
+    assert resp.status_code == 200
+
+    return resp.json()
+
+def test_login_returns_refresh_token_and_claims(client: TestClient):
+    tokens = login(client, "refresher", "refresher")
+
+    assert tokens["refresh_token"]
+    assert tokens["expires_in"] > 0
+
+    claims = jwt.decode(tokens["access_token"], options={"verify_signature": False})
+
+    assert claims["sub"] == "refresher"
+    assert claims["rid"] == 21
+    assert claims["st"] == "active"
+    assert claims["su"] is False
+    assert claims["pv"] == 1
+
+def test_refresh_rotates_token(client: TestClient):
+    tokens = login(client, "refresher", "refresher")
+
+    resp = client.post("/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+    assert resp.status_code == 200
+
+    rotated = resp.json()
+
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    assert client.get("/me", headers={"Authorization": f"Bearer {rotated['access_token']}"}).status_code == 200
+
+def test_refresh_token_reuse_revokes_family(client: TestClient):
+    tokens = login(client, "refresher", "refresher")
+    rotated = client.post("/refresh", json={"refresh_token": tokens["refresh_token"]}).json()
+
+    # Replaying the first token kills the whole family, including the rotated one
+    resp = client.post("/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert resp.status_code == 401
+
+    resp = client.post("/refresh", json={"refresh_token": rotated["refresh_token"]})
+    assert resp.status_code == 401
+
+def test_refresh_invalid_token(client: TestClient):
+    resp = client.post("/refresh", json={"refresh_token": "not-a-token"})
+
+    assert resp.status_code == 401
+
+def test_refresh_inactive_user(client: TestClient, db):
+    tokens = login(client, "refresher", "refresher")
+
+    db.execute(update(User).where(User.username == "refresher").values(status="inactive"))
+    db.commit()
+
+    resp = client.post("/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+    assert resp.status_code == 423
+
+    db.execute(update(User).where(User.username == "refresher").values(status="active"))
+    db.commit()
+
+def test_logout_revokes_refresh_token(client: TestClient):
+    tokens = login(client, "refresher", "refresher")
+
+    client.post("/logout", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+
+    resp = client.post("/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+    assert resp.status_code == 401
+
+def test_permission_check_uses_token_claims(client: TestClient):
+    tokens = login(client, "refresher", "refresher")
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    assert client.get("/roles/", headers=headers).status_code == 200
+    assert client.post("/roles/", json={"name": "Nope"}, headers=headers).status_code == 403
+
+def test_role_permissions_cache_follows_version(db):
+    assert get_role_permissions(21, 1, db) == frozenset({("roles", "list")})
+
+    bump_permission_version(db, role_id=21)
+    db.commit()
+
+    version = db.scalars(select(Role.permission_version).where(Role.id == 21)).one()
+
+    assert version == 2
+    # A token carrying the old version still sees the cached grants
+    assert get_role_permissions(21, 1, db) == frozenset({("roles", "list")})
+    assert get_role_permissions(21, 2, db) == frozenset({("roles", "list")})
+
+def setup_module():
+    from tests.utils import create_user, create_role, create_permission, assign_role
+
+    # Create the database tables
+    Base.metadata.create_all(bind=engine)
+
+    create_role(21, "Role Reader", "Can list roles")
+    create_permission(31, "List Roles", "roles", "list")
+    assign_role(21, 31)
+
+    create_user("refresher", "refresher", role_id=21)
+
+def teardown_module():
+    # Drop the database tables
+    Base.metadata.drop_all(bind=engine)
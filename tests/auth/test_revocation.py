@@ -0,0 +1,77 @@
+from app.auth.models import RevokedToken
+from app.auth.revocation import RevocationList, revocation_list
+from app.database import Base
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from tests.conftest import engine
+from tests.utils import get_access_token
+
+def test_logout_revokes_token(client: TestClient):
+    token = get_access_token(client, "revoke", "revoke")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/me", headers=headers).status_code == 200
+
+    resp = client.post("/logout", headers=headers)
+
+    assert resp.status_code == 200
+    assert resp.json() == {"msg": "Successfully logged out"}
+
+    assert client.get("/me", headers=headers).status_code == 401
+    assert client.post("/logout", headers=headers).status_code == 401
+
+    # A fresh login is unaffected
+    token = get_access_token(client, "revoke", "revoke")
+    assert client.get("/me", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+
+def test_revocation_list_syncs_from_database(db):
+    revocations = RevocationList(sync_seconds=0)
+    expires_at = datetime.now() + timedelta(minutes=5)
+
+    assert not revocations.is_revoked("from-other-worker", db)
+
+    # Revoked by another worker: only visible through the table
+    db.add(RevokedToken(jti="from-other-worker", expires_at=expires_at))
+    db.add(RevokedToken(jti="already-expired", expires_at=datetime.now() - timedelta(minutes=5)))
+    db.commit()
+
+    assert revocations.is_revoked("from-other-worker", db)
+    assert not revocations.is_revoked("already-expired", db)
+
+def test_revocation_list_skips_database_between_syncs(db):
+    revocations = RevocationList(sync_seconds=3600)
+    revocations.sync(db)
+
+    db.add(RevokedToken(jti="not-synced-yet", expires_at=datetime.now() + timedelta(minutes=5)))
+    db.commit()
+
+    assert not revocations.is_revoked("not-synced-yet", db)
+
+def test_revocation_list_picks_up_late_commits(db):
+    revocations = RevocationList(sync_seconds=0)
+    expires_at = datetime.now() + timedelta(minutes=5)
+
+    db.add(RevokedToken(id=200, jti="committed-first", expires_at=expires_at))
+    db.commit()
+
+    assert revocations.is_revoked("committed-first", db)
+
+    # Got its ID earlier but committed after the sync above had moved past it
+    db.add(RevokedToken(id=150, jti="committed-late", expires_at=expires_at))
+    db.commit()
+
+    assert revocations.is_revoked("committed-late", db)
+
+def setup_module():
+    from tests.utils import create_user
+
+    # Create the database tables
+    Base.metadata.create_all(bind=engine)
+    revocation_list.clear()
+
+    create_user("revoke", "revoke")
+
+def teardown_module():
+    # Drop the database tables
+    Base.metadata.drop_all(bind=engine)
+    revocation_list.clear()
@@ -0,0 +1,93 @@
+from app.database import Base
+from app.auth.models import User
+from app.bootstrap import service
+from app.bootstrap.models import BootstrapState
+from app.policy.models import Role, Permission
+from tests.conftest import engine
+from sqlalchemy import select
+import pytest
+
+@pytest.fixture
+def superuser_settings(monkeypatch):
+    monkeypatch.setattr(service.settings, "superuser_username", "root")
+    monkeypatch.setattr(service.settings, "superuser_password", "rootpassword")
+
+def test_run_bootstrap(db, superuser_settings):
+    assert service.get_applied_version(db) == 0
+
+    assert service.run_bootstrap(db) is True
+
+    user = db.scalars(select(User).where(User.username == "root")).one_or_none()
+
+    assert user is not None
+    assert user.is_superuser
+    assert service.get_applied_version(db) == service.BOOTSTRAP_VERSION
+
+def test_run_bootstrap_already_applied_skips_hashing(db, superuser_settings, monkeypatch):
+    def fail_hash(password: str):
+        raise AssertionError("Password must not be hashed once bootstrap is applied")
+
+    monkeypatch.setattr(service, "get_password_hash", fail_hash)
+
+    assert service.run_bootstrap(db) is False
+
+def test_create_first_superuser_existing_skips_hashing(db, superuser_settings, monkeypatch):
+    def fail_hash(password: str):
+        raise AssertionError("Password must not be hashed for an existing superuser")
+
+    monkeypatch.setattr(service, "get_password_hash", fail_hash)
+
+    assert service.create_first_superuser(db) is True
+
+def test_run_bootstrap_without_credentials_is_retried(db, monkeypatch):
+    monkeypatch.setattr(service.settings, "superuser_username", "")
+    db.delete(db.get(BootstrapState, service.BOOTSTRAP_STATE_ID))
+    db.commit()
+
+    assert service.run_bootstrap(db) is True
+    assert service.get_applied_version(db) == 0
+
+def test_upsert_permissions_inserts_missing_only(db):
+    assert service.upsert_permissions(["reports"], db) == 5
+    db.commit()
+
+    assert service.upsert_permissions(["reports", "invoices"], db) == 5
+    db.commit()
+
+    names = db.scalars(select(Permission.name).where(Permission.resource.in_(["reports", "invoices"]))).all()
+
+    assert len(names) == 10
+    assert "Create Reports" in names
+    assert "List Invoices" in names
+
+def test_grant_all_permissions_is_incremental(db):
+    role_id = service.upsert_role("Auditor", "Reads everything", db)
+
+    assert service.upsert_role("Auditor", "Reads everything", db) == role_id
+
+    total = len(db.scalars(select(Permission.id)).all())
+
+    assert service.grant_all_permissions(role_id, db) == total
+    assert service.grant_all_permissions(role_id, db) == 0
+
+    service.upsert_permissions(["payslips"], db)
+
+    assert service.grant_all_permissions(role_id, db) == 5
+    db.commit()
+
+def test_create_role_sa_holds_every_permission(db):
+    service.create_all_permissions(db)
+    service.create_role_sa(db)
+
+    role = db.scalars(select(Role).where(Role.name == service.SYSTEM_ADMINISTRATOR_ROLE)).one()
+    permissions = db.scalars(select(Permission)).all()
+
+    assert len(role.permissions) == len(permissions)
+
+def setup_module():
+    # Create the database tables
+    Base.metadata.create_all(bind=engine)
+
+def teardown_module():
+    # Drop the database tables
+    Base.metadata.drop_all(bind=engine)
@@ -1,6 +1,8 @@
 from fastapi.testclient import TestClient
 from app.main import app, create_first_superuser
-from app.database import get_session, Base
+from app.database import get_session, get_read_session, get_read_session_factory, Base
+from app.auth.rate_limit import limit_login, limit_forgot_password
+from app.policy.utils import clear_permission_cache
 from app.auth.models import User
 from app.auth.utils import get_password_hash
 from app.employee.models import EmployeeStatus
@@ -19,11 +21,22 @@ def override_get_session():
 @pytest.fixture(scope="session")
 def client():
     app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_read_session] = override_get_session
+    app.dependency_overrides[get_read_session_factory] = lambda: TestingSessionLocal
+    app.dependency_overrides[limit_login] = lambda: None
+    app.dependency_overrides[limit_forgot_password] = lambda: None
 
     yield TestClient(app)
 
     app.dependency_overrides.clear()
 
+@pytest.fixture(scope="module", autouse=True)
+def permission_cache():
+    # Every module recreates the tables, so role IDs and versions are reused
+    clear_permission_cache()
+    yield
+    clear_permission_cache()
+
 @pytest.fixture
 def db():
     # Create the database tables
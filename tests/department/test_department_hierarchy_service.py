@@ -0,0 +1,89 @@
+from app.department.models import Department, Job, department_closure
+from app.department.service import create, move, delete, get_descendant_ids
+from app.employee.models import Employee, EmployeeStatus
+from app.employee.service import get_all
+from app.database import Base
+from tests.conftest import engine, TestingSessionLocal
+from sqlalchemy import select
+from datetime import datetime
+import pytest
+import uuid
+
+def closure(db) -> set[tuple[int, int, int]]:
+    return set(db.execute(select(department_closure)).all())
+
+def test_create_links_ancestors(db):
+    # Division 1 -> Department 2 -> Team 3
+    assert closure(db) >= {(1, 1, 0), (2, 2, 0), (1, 2, 1), (3, 3, 0), (2, 3, 1), (1, 3, 2)}
+    assert sorted(get_descendant_ids(1, db)) == [1, 2, 3]
+
+def test_create_with_missing_parent(db):
+    with pytest.raises(NameError, match="Parent department with ID 999 is not found"):
+        create("Orphan", "", db, parent_id=999)
+
+def test_subtree_employees(db):
+    employees = get_all(db, department_id=1, include_subdepartments=True)
+
+    assert {employee.full_name for employee in employees} == {"Division Head", "Team Member"}
+    assert [employee.full_name for employee in get_all(db, department_id=1)] == ["Division Head"]
+    assert [employee.full_name for employee in get_all(db, department_id=2, include_subdepartments=True)] == ["Team Member"]
+
+def test_move_subtree(db):
+    # Move Department 2 (with Team 3) under Division 4
+    move(2, 4, db)
+
+    assert sorted(get_descendant_ids(1, db)) == [1]
+    assert sorted(get_descendant_ids(4, db)) == [2, 3, 4]
+    assert (4, 3, 2) in closure(db)
+    assert db.get(Department, 2).parent_id == 4
+
+    # Back to the root
+    move(2, None, db)
+
+    assert sorted(get_descendant_ids(4, db)) == [4]
+    assert sorted(get_descendant_ids(2, db)) == [2, 3]
+    assert {row for row in closure(db) if row[1] == 3} == {(3, 3, 0), (2, 3, 1)}
+
+def test_move_under_own_subtree(db):
+    with pytest.raises(ValueError, match="can not be moved under itself"):
+        move(2, 3, db)
+
+    with pytest.raises(NameError):
+        move(999, None, db)
+
+def test_delete_with_children(db):
+    with pytest.raises(ValueError, match="still has sub-departments"):
+        delete(2, db)
+
+def setup_module():
+    Base.metadata.create_all(bind=engine)
+
+    with TestingSessionLocal() as db:
+        create("Division", "", db)
+        create("Department", "", db, parent_id=1)
+        create("Team", "", db, parent_id=2)
+        create("Other Division", "", db)
+
+        db.add(EmployeeStatus(id=1, name="Full Time", description=""))
+        db.commit()
+
+        db.add(Job(id=1, department_id=1, name="Engineer", description=""))
+        db.commit()
+
+        for index, (name, department_id) in enumerate([("Division Head", 1), ("Team Member", 3)]):
+            db.add(Employee(
+                id=uuid.uuid4(),
+                full_name=name,
+                gender=True,
+                birthday=datetime(1990, 1, 1),
+                email_address=f"employee{index}@email.com",
+                phone_number="+6281234567890",
+                address="Address",
+                department_id=department_id,
+                job_id=1,
+                employee_status_id=1
+            ))
+        db.commit()
+
+def teardown_module():
+    Base.metadata.drop_all(bind=engine)
@@ -47,6 +47,24 @@ def test_create_job_duplicate(db):
         db=db
     )
 
+def test_create_job_duplicate_ignores_case(db):
+    from app.department.service import create_job
+
+    create_job(
+        department_id=67,
+        name="Data Engineer",
+        description="Description of Job",
+        db=db
+    )
+
+    with pytest.raises(ValueError, match="Duplicate entry job DATA engineer on Department IT"):
+        create_job(
+            department_id=67,
+            name="DATA engineer",
+            description="Description of Job",
+            db=db
+        )
+
 def setup_module():
     # Create the database tables
     Base.metadata.create_all(bind=engine)
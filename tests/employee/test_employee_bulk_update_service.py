@@ -0,0 +1,108 @@
+from app.database import Base
+from app.department.models import Department, Job
+from app.employee.models import Employee, EmployeeStatus
+from app.employee.schemas import BulkUpdateEmployeeSchema, EmployeeFilterSchema
+from app.analytics.utils import get_data_version
+from tests.conftest import TestingSessionLocal, engine
+from datetime import datetime
+from pydantic import ValidationError
+from sqlalchemy import select
+import pytest
+
+def salaries(db) -> dict[str, int]:
+    db.expire_all()
+    return dict(db.execute(select(Employee.email_address, Employee.salary)).all())
+
+def test_dry_run_counts_without_writing(db):
+    from app.employee.service import bulk_update
+
+    changes = BulkUpdateEmployeeSchema(filter=EmployeeFilterSchema(department_id=1, include_subdepartments=True), salary_percent=3)
+    before = salaries(db)
+
+    assert bulk_update(changes, db, dry_run=True) == 3
+    assert salaries(db) == before
+
+def test_raise_salary_by_percent_for_department(db):
+    from app.employee.service import bulk_update
+
+    version = get_data_version("employee", db)
+    changes = BulkUpdateEmployeeSchema(filter=EmployeeFilterSchema(department_id=1), salary_percent=3)
+
+    assert bulk_update(changes, db) == 2
+
+    result = salaries(db)
+    assert result["bulk0@email.com"] == 1030
+    assert result["bulk1@email.com"] == 2060
+    assert result["bulk2@email.com"] == 3000
+    assert get_data_version("employee", db) == version + 1
+
+def test_salary_cut_never_goes_negative(db):
+    from app.employee.service import bulk_update
+
+    changes = BulkUpdateEmployeeSchema(filter=EmployeeFilterSchema(department_id=2), salary_amount=-5000)
+
+    assert bulk_update(changes, db) == 1
+    assert salaries(db)["bulk2@email.com"] == 0
+
+def test_move_job_to_status(db):
+    from app.employee.service import bulk_update
+
+    changes = BulkUpdateEmployeeSchema(filter=EmployeeFilterSchema(job_id=1), employee_status_id=2)
+
+    assert bulk_update(changes, db) == 2
+    statuses = db.scalars(select(Employee.employee_status_id).where(Employee.job_id == 1)).all()
+    assert set(statuses) == {2}
+
+def test_unknown_target_status(db):
+    from app.employee.service import bulk_update
+
+    changes = BulkUpdateEmployeeSchema(filter=EmployeeFilterSchema(job_id=1), employee_status_id=99)
+
+    with pytest.raises(NameError):
+        bulk_update(changes, db)
+
+def test_schema_requires_filter_and_change():
+    with pytest.raises(ValidationError):
+        EmployeeFilterSchema()
+
+    with pytest.raises(ValidationError):
+        BulkUpdateEmployeeSchema(filter=EmployeeFilterSchema(job_id=1))
+
+    with pytest.raises(ValidationError):
+        BulkUpdateEmployeeSchema(filter=EmployeeFilterSchema(job_id=1), salary_percent=3, salary_amount=100)
+
+def setup_module():
+    Base.metadata.create_all(bind=engine)
+
+    with TestingSessionLocal() as db:
+        db.add_all([
+            Department(id=1, name="IT", description=""),
+            EmployeeStatus(id=1, name="Full Time", description=""),
+            EmployeeStatus(id=2, name="Contract", description=""),
+        ])
+        db.commit()
+        db.add(Department(id=2, name="Support", description="", parent_id=1))
+        db.add_all([
+            Job(id=1, department_id=1, name="Engineer", description=""),
+            Job(id=2, department_id=1, name="Analyst", description=""),
+        ])
+        db.commit()
+
+        for index, (department_id, job_id, salary) in enumerate([(1, 1, 1000), (1, 1, 2000), (2, 2, 3000)]):
+            db.add(Employee(
+                full_name=f"Employee {index}",
+                gender=True,
+                birthday=datetime(1990, 1, 1),
+                email_address=f"bulk{index}@email.com",
+                phone_number="+6281234567890",
+                address="Address",
+                department_id=department_id,
+                job_id=job_id,
+                salary=salary,
+                employee_status_id=1,
+                hire_date=datetime(2020, 1, 1)
+            ))
+        db.commit()
+
+def teardown_module():
+    Base.metadata.drop_all(bind=engine)
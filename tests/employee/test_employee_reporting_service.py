@@ -0,0 +1,149 @@
+from app.database import Base
+from app.department.models import Department, Job
+from app.employee.models import Employee, EmployeeStatus
+from app.employee.service import MAX_REPORTING_DEPTH, REPORTING_LINES_LOCK_NAME, _query_subordinate_ids, get_all, get_direct_reports, get_subordinate_ids, get_manager_chain, set_manager
+from app.employee.utils import subordinate_cache
+from tests.conftest import TestingSessionLocal, engine
+from sqlalchemy import update
+from sqlalchemy.exc import OperationalError
+from contextlib import contextmanager
+from datetime import datetime
+import pytest
+import uuid
+
+# CEO -> CTO -> Engineer, CEO -> CFO
+CEO = uuid.UUID("00000000-0000-0000-0000-00000000000a")
+CTO = uuid.UUID("00000000-0000-0000-0000-00000000000b")
+CFO = uuid.UUID("00000000-0000-0000-0000-00000000000c")
+ENGINEER = uuid.UUID("00000000-0000-0000-0000-00000000000d")
+
+def test_direct_and_transitive_reports(db):
+    assert {employee.id for employee in get_direct_reports(CEO, db)} == {CTO, CFO}
+    assert get_subordinate_ids(CEO, db) == {CTO, CFO, ENGINEER}
+    assert get_subordinate_ids(ENGINEER, db) == frozenset()
+    assert {employee.id for employee in get_all(db, manager_id=CTO)} == {ENGINEER}
+
+def test_manager_chain(db):
+    assert get_manager_chain(ENGINEER, db) == [CTO, CEO]
+    assert get_manager_chain(CEO, db) == []
+
+def test_subordinates_are_cached(db):
+    get_subordinate_ids(CTO, db)
+
+    assert subordinate_cache.get(CTO) == {ENGINEER}
+
+def test_set_manager_updates_cache_incrementally(db):
+    get_subordinate_ids(CEO, db)
+    get_subordinate_ids(CFO, db)
+
+    set_manager(ENGINEER, CFO, db)
+
+    # Patched in place, not dropped
+    assert subordinate_cache.get(CTO) == frozenset()
+    assert subordinate_cache.get(CFO) == {ENGINEER}
+    assert subordinate_cache.get(CEO) == {CTO, CFO, ENGINEER}
+
+    subordinate_cache.clear()
+
+    assert get_subordinate_ids(CFO, db) == {ENGINEER}
+    assert get_subordinate_ids(CTO, db) == frozenset()
+
+def test_set_manager_rejects_cycles(db):
+    with pytest.raises(ValueError, match="can not report to themselves"):
+        set_manager(CEO, ENGINEER, db)
+
+    with pytest.raises(ValueError):
+        set_manager(CFO, CFO, db)
+
+    with pytest.raises(NameError, match="Manager with ID"):
+        set_manager(CFO, uuid.uuid4(), db)
+
+def test_set_manager_ignores_stale_cache(db):
+    # Another worker moved CTO under the engineer, this process still caches the engineer without reports
+    subordinate_cache.set(ENGINEER, frozenset())
+    db.execute(update(Employee).where(Employee.id == CTO).values(manager_id=ENGINEER))
+    db.commit()
+
+    with pytest.raises(ValueError, match="can not report to themselves"):
+        set_manager(ENGINEER, CTO, db)
+
+    db.execute(update(Employee).where(Employee.id == CTO).values(manager_id=CEO))
+    db.commit()
+    subordinate_cache.clear()
+
+def test_set_manager_holds_the_reporting_lines_lock(db, monkeypatch):
+    held = []
+
+    @contextmanager
+    def fake_lock(session, name, timeout):
+        held.append(name)
+        yield
+
+    monkeypatch.setattr("app.employee.service.advisory_lock", fake_lock)
+
+    set_manager(CFO, CEO, db)
+
+    assert held == [REPORTING_LINES_LOCK_NAME]
+
+def test_set_manager_maps_a_deadlock_to_a_conflict(db, monkeypatch):
+    def deadlock(*args):
+        raise OperationalError("UPDATE employees", {}, Exception("Deadlock found when trying to get lock"))
+
+    manager_id = db.get(Employee, ENGINEER).manager_id
+    monkeypatch.setattr("app.employee.service.get_manager_chain", deadlock)
+
+    with pytest.raises(ValueError, match="changed concurrently"):
+        set_manager(ENGINEER, CEO, db)
+
+    assert db.get(Employee, ENGINEER).manager_id == manager_id
+
+def test_recursive_queries_stop_on_a_cycle(db):
+    # A cycle written around the service still terminates
+    db.execute(update(Employee).where(Employee.id == CEO).values(manager_id=CTO))
+    db.commit()
+
+    assert CEO in _query_subordinate_ids(CTO, db)
+    assert get_manager_chain(CTO, db)[:2] == [CEO, CTO]
+    assert len(get_manager_chain(CTO, db)) == MAX_REPORTING_DEPTH
+
+    db.execute(update(Employee).where(Employee.id == CEO).values(manager_id=None))
+    db.commit()
+    subordinate_cache.clear()
+
+def test_remove_manager(db):
+    set_manager(CFO, None, db)
+
+    assert get_subordinate_ids(CEO, db) == {CTO}
+    assert get_manager_chain(ENGINEER, db) == [CFO]
+
+def setup_module():
+    Base.metadata.create_all(bind=engine)
+    subordinate_cache.clear()
+
+    with TestingSessionLocal() as db:
+        db.add(Department(id=1, name="Board", description=""))
+        db.add(EmployeeStatus(id=1, name="Full Time", description=""))
+        db.commit()
+        db.add(Job(id=1, department_id=1, name="Officer", description=""))
+        db.commit()
+
+        for employee_id, manager_id in [(CEO, None), (CTO, CEO), (CFO, CEO), (ENGINEER, CTO)]:
+            db.add(Employee(
+                id=employee_id,
+                full_name=str(employee_id),
+                gender=True,
+                birthday=datetime(1990, 1, 1),
+                email_address=f"{employee_id.hex}@email.com",
+                phone_number="+6281234567890",
+                address="Address",
+                department_id=1,
+                job_id=1,
+                employee_status_id=1,
+                manager_id=manager_id
+            ))
+            db.flush()
+        db.commit()
+
+def teardown_module():
+    Base.metadata.drop_all(bind=engine)
+    subordinate_cache.clear()
@@ -0,0 +1,62 @@
+from app.mail.queue import MailQueue
+from app.mail.transport import MemoryTransport
+from email.message import EmailMessage
+import asyncio
+
+def message(to: str) -> EmailMessage:
+    email = EmailMessage()
+    email["To"] = to
+    email["Subject"] = "Test"
+    email.set_content("Hello")
+
+    return email
+
+
+class FlakyTransport(MemoryTransport):
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+
+    def send_batch(self, messages):
+        if self.failures > 0:
+            self.failures -= 1
+            raise ConnectionError("SMTP server unavailable")
+
+        return super().send_batch(messages)
+
+
+async def deliver(queue: MailQueue, count: int) -> None:
+    for index in range(count):
+        queue.enqueue(message(f"user{index}@email.com"))
+
+    await queue.start()
+    await queue.join()
+    await queue.stop()
+
+def test_messages_sent_in_batches():
+    transport = MemoryTransport()
+    queue = MailQueue(transport, batch_size=4)
+
+    asyncio.run(deliver(queue, 10))
+
+    assert transport.batches == [4, 4, 2]
+    assert [email["To"] for email in transport.outbox] == [f"user{index}@email.com" for index in range(10)]
+    assert queue.stats() == {"queued": 0, "sent": 10, "failed": 0}
+
+def test_failed_batch_is_retried():
+    transport = FlakyTransport(failures=2)
+    queue = MailQueue(transport, batch_size=10, max_retries=3, retry_base_seconds=0.01)
+
+    asyncio.run(deliver(queue, 3))
+
+    assert len(transport.outbox) == 3
+    assert queue.stats() == {"queued": 0, "sent": 3, "failed": 0}
+
+def test_message_dropped_after_max_retries():
+    transport = FlakyTransport(failures=10)
+    queue = MailQueue(transport, batch_size=10, max_retries=2, retry_base_seconds=0.01)
+
+    asyncio.run(deliver(queue, 2))
+
+    assert transport.outbox == []
+    assert queue.stats() == {"queued": 0, "sent": 0, "failed": 2}
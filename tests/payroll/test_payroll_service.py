@@ -0,0 +1,130 @@
+from app.database import Base
+from app.department.models import Department, Job
+from app.employee.models import Employee, EmployeeStatus
+from app.payroll.models import PayrollItem
+from app.payroll.service import run_payroll, compute_payroll, count_working_days, get_items
+from app.presence.models import Presence, StatusType
+from tests.conftest import TestingSessionLocal, engine
+from datetime import date, datetime
+import numpy as np
+import pytest
+import uuid
+
+FIRST = uuid.uuid4()
+SECOND = uuid.uuid4()
+LATE = uuid.uuid4()
+RESIGNED = uuid.uuid4()
+MID_PERIOD = uuid.uuid4()
+
+def test_count_working_days(db):
+    # March 2026 starts on a Sunday
+    assert count_working_days(date(2026, 3, 1), date(2026, 3, 31), db) == 22
+    assert count_working_days(date(2026, 3, 7), date(2026, 3, 8), db) == 0
+
+def test_compute_payroll_is_elementwise():
+    pay = compute_payroll(
+        salaries=np.array([2200, 2200]),
+        working_days=22,
+        present_days=np.array([20, 0]),
+        absent_days=np.array([2, 30]),
+        overtime_hours=np.array([4.0, 0.0]),
+        standard_hours=8,
+        overtime_multiplier=1.5
+    )
+
+    assert pay["absence_deduction"].tolist() == [200, 2200]
+    assert pay["overtime_pay"].tolist() == [75, 0]
+    assert pay["net_pay"].tolist() == [2075, 0]
+
+def test_run_payroll(db):
+    payroll_run = run_payroll(date(2026, 3, 1), date(2026, 3, 31), db)
+
+    assert payroll_run.working_days == 22
+    assert payroll_run.employee_count == 3
+    assert payroll_run.total_net_pay == 2175 + 4400 + 200
+
+    items = {item.employee_id: item for item in get_items(payroll_run.id, db)}
+
+    assert LATE not in items
+    # Inactive statuses are never marked absent, they must not be paid at all
+    assert RESIGNED not in items
+    first = items[FIRST]
+    assert (first.present_days, first.absent_days, first.leave_days) == (2, 1, 0)
+    assert float(first.overtime_hours) == 4.0
+    assert (first.absence_deduction, first.overtime_pay, first.net_pay) == (100, 75, 2175)
+
+    second = items[SECOND]
+    assert (second.leave_days, second.absence_deduction, second.net_pay) == (1, 0, 4400)
+
+    # Hired Saturday 28 March: paid for Monday 30 and Tuesday 31 only
+    mid_period = items[MID_PERIOD]
+    assert (mid_period.working_days, mid_period.absent_days, mid_period.net_pay) == (2, 0, 200)
+
+def test_compute_payroll_prorates_employed_days():
+    pay = compute_payroll(
+        salaries=np.array([2200, 2200]),
+        working_days=22,
+        present_days=np.array([0, 0]),
+        absent_days=np.array([0, 5]),
+        overtime_hours=np.array([0.0, 0.0]),
+        standard_hours=8,
+        overtime_multiplier=1.5,
+        employed_days=np.array([22, 3])
+    )
+
+    assert pay["net_pay"].tolist() == [2200, 0]
+
+def test_run_payroll_twice_for_same_period(db):
+    with pytest.raises(ValueError):
+        run_payroll(date(2026, 3, 1), date(2026, 3, 31), db)
+
+    assert db.query(PayrollItem).count() == 3
+
+def setup_module():
+    Base.metadata.create_all(bind=engine)
+
+    with TestingSessionLocal() as db:
+        db.add_all([
+            Department(id=1, name="IT", description=""),
+            EmployeeStatus(id=1, name="Full Time", description=""),
+            EmployeeStatus(id=2, name="Resigned", description="", is_active=False),
+        ])
+        db.commit()
+        db.add(Job(id=1, department_id=1, name="Engineer", description=""))
+        db.commit()
+
+        for index, (employee_id, salary, hire_date, status_id) in enumerate([
+            (FIRST, 2200, datetime(2020, 1, 1), 1),
+            (SECOND, 4400, datetime(2020, 1, 1), 1),
+            (LATE, 3000, datetime(2026, 4, 1), 1),
+            (RESIGNED, 3000, datetime(2020, 1, 1), 2),
+            (MID_PERIOD, 2200, datetime(2026, 3, 28), 1),
+        ]):
+            db.add(Employee(
+                id=employee_id,
+                full_name=f"Employee {index}",
+                gender=True,
+                birthday=datetime(1990, 1, 1),
+                email_address=f"payroll{index}@email.com",
+                phone_number="+6281234567890",
+                address="Address",
+                department_id=1,
+                job_id=1,
+                salary=salary,
+                employee_status_id=status_id,
+                hire_date=hire_date
+            ))
+        db.commit()
+
+        db.add_all([
+            Presence(employee_id=FIRST, status=StatusType.PRESENT, clock_in=datetime(2026, 3, 2, 8), clock_out=datetime(2026, 3, 2, 18), created_at=datetime(2026, 3, 2, 8)),
+            Presence(employee_id=FIRST, status=StatusType.PRESENT, clock_in=datetime(2026, 3, 3, 8), clock_out=datetime(2026, 3, 3, 18), created_at=datetime(2026, 3, 3, 8)),
+            Presence(employee_id=FIRST, status=StatusType.ABSENT, created_at=datetime(2026, 3, 4, 23)),
+            Presence(employee_id=SECOND, status=StatusType.ON_LEAVE, created_at=datetime(2026, 3, 4, 8)),
+            # Outside the period
+            Presence(employee_id=FIRST, status=StatusType.ABSENT, created_at=datetime(2026, 4, 1, 23)),
+        ])
+        db.commit()
+
+def teardown_module():
+    Base.metadata.drop_all(bind=engine)
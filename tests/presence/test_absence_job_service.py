@@ -0,0 +1,99 @@
+from app.database import Base
+from app.department.models import Department, Job
+from app.employee.models import Employee, EmployeeStatus
+from app.presence.models import Presence, StatusType
+from app.presence.service import mark_absences, create_presence
+from app.work_calendar.utils import clear_calendar_cache
+from tests.conftest import TestingSessionLocal, engine
+from sqlalchemy import select
+from datetime import date, datetime, timedelta
+import uuid
+
+CLOCKED_IN = uuid.uuid4()
+ON_LEAVE = uuid.uuid4()
+MISSING = uuid.uuid4()
+INACTIVE = uuid.uuid4()
+
+def statuses(day: date, db) -> dict:
+    stmt = select(Presence.employee_id, Presence.status).where(
+        Presence.created_at >= datetime(day.year, day.month, day.day),
+        Presence.created_at < datetime(day.year, day.month, day.day, 23, 59, 59, 999999)
+    )
+
+    return dict(db.execute(stmt).all())
+
+def test_mark_absences(db):
+    # Monday 2 March 2026
+    absences, closed = mark_absences(date(2026, 3, 2), db)
+    db.commit()
+
+    assert (absences, closed) == (1, 1)
+    assert statuses(date(2026, 3, 2), db) == {
+        CLOCKED_IN: StatusType.PRESENT,
+        ON_LEAVE: StatusType.ON_LEAVE,
+        MISSING: StatusType.ABSENT,
+    }
+
+    clocked_in = db.scalars(select(Presence).where(Presence.employee_id == CLOCKED_IN)).one()
+    assert clocked_in.clock_out == datetime(2026, 3, 2, 17)
+
+def test_mark_absences_is_idempotent(db):
+    assert mark_absences(date(2026, 3, 2), db) == (0, 0)
+    db.commit()
+
+def test_mark_absences_skips_non_working_days(db):
+    # Saturday
+    assert mark_absences(date(2026, 3, 7), db) == (0, 0)
+    db.commit()
+
+    assert statuses(date(2026, 3, 7), db) == {}
+
+def test_clock_in_after_absence_job(db):
+    mark_absences(date.today() - timedelta(days=1), db)
+    db.commit()
+
+    # Earlier days' rows, absences included, must not count as today's attendance
+    create_presence(StatusType.PRESENT, MISSING, db)
+
+    assert statuses(date.today(), db) == {MISSING: StatusType.PRESENT}
+
+def setup_module():
+    Base.metadata.create_all(bind=engine)
+    clear_calendar_cache()
+
+    with TestingSessionLocal() as db:
+        db.add_all([
+            Department(id=1, name="IT", description=""),
+            EmployeeStatus(id=1, name="Full Time", description=""),
+            EmployeeStatus(id=2, name="Resigned", description="", is_active=False),
+        ])
+        db.commit()
+        db.add(Job(id=1, department_id=1, name="Engineer", description=""))
+        db.commit()
+
+        for index, (employee_id, status_id) in enumerate([(CLOCKED_IN, 1), (ON_LEAVE, 1), (MISSING, 1), (INACTIVE, 2)]):
+            db.add(Employee(
+                id=employee_id,
+                full_name=f"Employee {index}",
+                gender=True,
+                birthday=datetime(1990, 1, 1),
+                email_address=f"absence{index}@email.com",
+                phone_number="+6281234567890",
+                address="Address",
+                department_id=1,
+                job_id=1,
+                salary=1000,
+                employee_status_id=status_id,
+                hire_date=datetime(2020, 1, 1)
+            ))
+        db.commit()
+
+        db.add_all([
+            Presence(employee_id=CLOCKED_IN, status=StatusType.PRESENT, clock_in=datetime(2026, 3, 2, 9), created_at=datetime(2026, 3, 2, 9)),
+            Presence(employee_id=ON_LEAVE, status=StatusType.ON_LEAVE, created_at=datetime(2026, 3, 2, 8)),
+        ])
+        db.commit()
+
+def teardown_module():
+    Base.metadata.drop_all(bind=engine)
+    clear_calendar_cache()
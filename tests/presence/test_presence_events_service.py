@@ -0,0 +1,121 @@
+from app.database import Base
+from app.presence.events import PresenceHub, presence_hub
+from app.presence.models import Presence, StatusType
+from app.presence.schemas import PresenceEventSchema, PresenceEventType
+from app.presence.service import create_presence
+from tests.conftest import engine
+from datetime import datetime
+import asyncio
+import json
+import threading
+import uuid
+
+EMPLOYEE = uuid.UUID("00000000-0000-0000-0000-000000000039")
+
+def event(presence_id: int, employee_id: uuid.UUID = EMPLOYEE) -> PresenceEventSchema:
+    return PresenceEventSchema(
+        type=PresenceEventType.CLOCK_IN,
+        presence_id=presence_id,
+        employee_id=employee_id,
+        status=StatusType.PRESENT,
+        at=datetime.now()
+    )
+
+def data(message: str):
+    return json.loads(message.split("data: ", 1)[1])
+
+def test_publish_fans_out_to_every_subscriber():
+    hub = PresenceHub()
+
+    async def scenario():
+        subscribers = [hub.subscribe() for _ in range(100)]
+
+        # Published from a request thread, not the event loop
+        thread = threading.Thread(target=hub.publish, args=(event(1),))
+        thread.start()
+        thread.join()
+
+        return [await asyncio.wait_for(subscriber.queue.get(), 1) for subscriber in subscribers]
+
+    messages = asyncio.run(scenario())
+
+    assert len(set(messages)) == 1
+    assert data(messages[0])["presence_id"] == 1
+
+def test_slow_subscriber_is_disconnected():
+    hub = PresenceHub(max_queued=2)
+
+    async def scenario():
+        subscriber = hub.subscribe()
+
+        for presence_id in range(3):
+            hub.publish(event(presence_id))
+
+        await asyncio.sleep(0)
+
+        return await subscriber.queue.get()
+
+    assert asyncio.run(scenario()) is None
+    assert len(hub) == 0
+
+def test_reconnect_replays_missed_events():
+    hub = PresenceHub()
+
+    for presence_id in range(1, 4):
+        hub.publish(event(presence_id))
+
+    async def scenario():
+        subscriber = hub.subscribe(last_event_id=1)
+
+        return [subscriber.queue.get_nowait() for _ in range(subscriber.queue.qsize())]
+
+    assert [data(message)["presence_id"] for message in asyncio.run(scenario())] == [2, 3]
+
+def test_snapshot_merges_database_and_live_events(db):
+    hub = PresenceHub()
+    other = uuid.uuid4()
+
+    db.add(Presence(employee_id=other, status=StatusType.ON_LEAVE, created_at=datetime.now()))
+    db.commit()
+
+    hub.publish(event(99))
+    snapshot = data(hub.snapshot(db).message)
+
+    assert {(item["employee_id"], item["type"]) for item in snapshot} == {
+        (str(EMPLOYEE), "clock_in"),
+        (str(other), "on_leave"),
+    }
+
+def test_events_between_snapshot_and_subscribe_are_replayed_once(db):
+    hub = PresenceHub()
+    hub.publish(event(1))
+
+    async def scenario():
+        hub.subscribe()
+        snapshot = hub.snapshot(db)
+
+        # Published while the stream was still being opened, its fan-out is already scheduled
+        hub.publish(event(2))
+        subscriber = hub.subscribe(snapshot.seq)
+        await asyncio.sleep(0)
+
+        return snapshot, [subscriber.queue.get_nowait() for _ in range(subscriber.queue.qsize())]
+
+    snapshot, messages = asyncio.run(scenario())
+
+    assert snapshot.message.startswith(f"id: {snapshot.seq}\n")
+    assert [data(message)["presence_id"] for message in messages] == [2]
+
+def test_create_presence_publishes(db):
+    latest = presence_hub._seq
+
+    create_presence(StatusType.PRESENT, EMPLOYEE, db)
+
+    assert presence_hub._seq == latest + 1
+    assert data(presence_hub._history[-1][1])["type"] == "clock_in"
+
+def setup_module():
+    Base.metadata.create_all(bind=engine)
+
+def teardown_module():
+    Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,108 @@
+from app.database import Base
+from app.department.models import Department, Job
+from app.employee.models import Employee, EmployeeStatus
+from app.presence.models import Presence, StatusType
+from app.presence.service import get_presence_history
+from tests.conftest import TestingSessionLocal, engine
+from sqlalchemy import text
+from datetime import date, datetime, timedelta
+import pytest
+import uuid
+
+EMPLOYEE = uuid.uuid4()
+OTHER = uuid.uuid4()
+FIRST_DAY = datetime(2026, 1, 1, 8)
+
+def test_pages_walk_history_newest_first(db):
+    seen = []
+    cursor = None
+
+    while True:
+        page = get_presence_history(EMPLOYEE, db, limit=7, cursor=cursor)
+        seen.extend(presence.created_at for presence in page.data)
+        cursor = page.next_cursor
+
+        if cursor is None:
+            break
+
+    assert len(seen) == 20
+    assert seen == sorted(seen, reverse=True)
+    assert len(set(seen)) == 20
+
+def test_same_timestamp_rows_are_not_skipped(db):
+    first = get_presence_history(OTHER, db, limit=1)
+    second = get_presence_history(OTHER, db, limit=1, cursor=first.next_cursor)
+
+    assert first.data[0].created_at == second.data[0].created_at
+    assert first.data[0].id > second.data[0].id
+    assert second.next_cursor is None
+
+def test_date_range(db):
+    page = get_presence_history(EMPLOYEE, db, start=date(2026, 1, 5), end=date(2026, 1, 7))
+
+    assert [presence.created_at.date() for presence in page.data] == [date(2026, 1, 7), date(2026, 1, 6), date(2026, 1, 5)]
+    assert page.data[0].employee_id == EMPLOYEE
+    assert page.data[0].status == StatusType.PRESENT
+    assert page.next_cursor is None
+
+def test_invalid_input(db):
+    with pytest.raises(ValueError):
+        get_presence_history(EMPLOYEE, db, cursor="not-a-cursor")
+
+    with pytest.raises(ValueError):
+        get_presence_history(EMPLOYEE, db, start=date(2026, 1, 7), end=date(2026, 1, 5))
+
+    with pytest.raises(NameError):
+        get_presence_history(uuid.uuid4(), db)
+
+def test_history_query_uses_composite_index(db):
+    plan = db.execute(text(
+        "EXPLAIN QUERY PLAN SELECT * FROM presences WHERE employee_id = :employee_id "
+        "AND created_at >= :start ORDER BY created_at DESC, id DESC LIMIT 51"
+    ), {"employee_id": EMPLOYEE.hex, "start": FIRST_DAY}).all()
+    details = " ".join(row[-1] for row in plan)
+
+    assert "ix_presences_employee_id_created_at" in details
+    assert "TEMP B-TREE" not in details
+
+def setup_module():
+    Base.metadata.create_all(bind=engine)
+
+    with TestingSessionLocal() as db:
+        db.add_all([
+            Department(id=1, name="IT", description=""),
+            EmployeeStatus(id=1, name="Full Time", description=""),
+        ])
+        db.commit()
+        db.add(Job(id=1, department_id=1, name="Engineer", description=""))
+        db.commit()
+
+        for index, employee_id in enumerate([EMPLOYEE, OTHER]):
+            db.add(Employee(
+                id=employee_id,
+                full_name=f"Employee {index}",
+                gender=True,
+                birthday=datetime(1990, 1, 1),
+                email_address=f"history{index}@email.com",
+                phone_number="+6281234567890",
+                address="Address",
+                department_id=1,
+                job_id=1,
+                salary=1000,
+                employee_status_id=1,
+                hire_date=datetime(2020, 1, 1)
+            ))
+        db.commit()
+
+        for day in range(20):
+            at = FIRST_DAY + timedelta(days=day)
+            db.add(Presence(employee_id=EMPLOYEE, status=StatusType.PRESENT, clock_in=at, created_at=at))
+
+        db.add_all([
+            Presence(employee_id=OTHER, status=StatusType.ABSENT, created_at=FIRST_DAY),
+            Presence(employee_id=OTHER, status=StatusType.ABSENT, created_at=FIRST_DAY),
+        ])
+        db.commit()
+
+def teardown_module():
+    Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,34 @@
+from app.database import Base
+from app.scheduler.models import JobRun
+from app.scheduler.service import run_job_once
+from tests.conftest import engine
+from datetime import date
+import pytest
+
+DAY = date(2026, 3, 2)
+
+def test_job_runs_once_per_day(db):
+    calls = []
+    job = lambda day, session: calls.append(day)
+
+    assert run_job_once("test", job, DAY, db) is True
+    assert run_job_once("test", job, DAY, db) is False
+    assert run_job_once("other", job, DAY, db) is True
+
+    assert calls == [DAY, DAY]
+
+def test_failed_job_releases_claim(db):
+    def failing(day, session):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        run_job_once("failing", failing, DAY, db)
+
+    assert db.query(JobRun).filter_by(name="failing").count() == 0
+    assert run_job_once("failing", lambda day, session: None, DAY, db) is True
+
+def setup_module():
+    Base.metadata.create_all(bind=engine)
+
+def teardown_module():
+    Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,108 @@
+from app.compression import CompressionMiddleware, negotiate
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+import asyncio
+import zlib
+
+PAYLOAD = "employee," * 1000
+
+def make_client(minimum_size: int = 500) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=minimum_size)
+
+    @app.get("/large")
+    def large():
+        return PlainTextResponse(PAYLOAD)
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("tiny")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((PAYLOAD[i:i + 100] for i in range(0, len(PAYLOAD), 100)), media_type="text/plain")
+
+    @app.get("/events")
+    def events():
+        return StreamingResponse(iter([PAYLOAD]), media_type="text/event-stream")
+
+    return TestClient(app)
+
+def raw_get(client: TestClient, path: str, encoding: str = "gzip"):
+    with client.stream("GET", path, headers={"Accept-Encoding": encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+def test_negotiate():
+    assert negotiate("gzip, deflate, br", ["zstd", "gzip"]) == "gzip"
+    assert negotiate("gzip, zstd", ["zstd", "gzip"]) == "zstd"
+    assert negotiate("zstd;q=0.5, gzip", ["zstd", "gzip"]) == "gzip"
+    assert negotiate("*", ["zstd", "gzip"]) == "zstd"
+    assert negotiate("gzip;q=0, identity", ["gzip"]) is None
+    assert negotiate("", ["gzip"]) is None
+
+def test_large_response_is_gzipped():
+    response, body = raw_get(make_client(), "/large")
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert int(response.headers["Content-Length"]) == len(body)
+    assert len(body) < len(PAYLOAD)
+    assert zlib.decompress(body, 16 + zlib.MAX_WBITS).decode() == PAYLOAD
+
+def test_small_response_is_left_alone():
+    response, body = raw_get(make_client(), "/small")
+
+    assert "Content-Encoding" not in response.headers
+    assert body == b"tiny"
+
+def test_without_accept_encoding():
+    response, body = raw_get(make_client(), "/large", encoding="identity")
+
+    assert "Content-Encoding" not in response.headers
+    assert body.decode() == PAYLOAD
+
+def test_streaming_response_is_compressed_chunk_by_chunk():
+    response, body = raw_get(make_client(), "/stream")
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert zlib.decompress(body, 16 + zlib.MAX_WBITS).decode() == PAYLOAD
+
+def test_each_streamed_chunk_is_sent_right_away():
+    chunks = [PAYLOAD[i:i + 100].encode() for i in range(0, len(PAYLOAD), 100)]
+    sent = []
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+
+        for chunk in chunks:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+    asyncio.run(CompressionMiddleware(app, minimum_size=500)(scope, None, send))
+
+    bodies = [message["body"] for message in sent if message["type"] == "http.response.body"]
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    decoded = [decoder.decompress(body) for body in bodies]
+
+    # The first five chunks reach the threshold, every later one decodes on arrival
+    assert [len(data) for data in decoded[:-1]] == [500] + [100] * (len(chunks) - 5)
+    assert b"".join(decoded).decode() == PAYLOAD
+
+def test_short_stream_below_threshold():
+    response, body = raw_get(make_client(minimum_size=len(PAYLOAD) + 1), "/stream")
+
+    assert "Content-Encoding" not in response.headers
+    assert body.decode() == PAYLOAD
+
+def test_event_stream_is_not_compressed():
+    response, body = raw_get(make_client(), "/events")
+
+    assert "Content-Encoding" not in response.headers
+    assert body.decode() == PAYLOAD
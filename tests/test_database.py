@@ -0,0 +1,38 @@
+from starlette.requests import Request
+from sqlalchemy.orm import sessionmaker
+from itertools import cycle
+from tests.conftest import engine
+import app.database as database
+import time
+
+def make_request(cookie: str | None = None) -> Request:
+    headers = [(b"cookie", cookie.encode())] if cookie else []
+
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+def test_read_session_falls_back_to_primary():
+    session = next(database.get_read_session(make_request()))
+
+    assert session.get_bind() is database.engine
+
+def test_read_session_uses_replica(monkeypatch):
+    ReplicaSession = sessionmaker(bind=engine)
+    monkeypatch.setattr(database, "_replica_cycle", cycle([ReplicaSession]))
+
+    session = next(database.get_read_session(make_request()))
+
+    assert session.get_bind() is engine
+
+def test_read_session_sticks_to_primary_after_write(monkeypatch):
+    ReplicaSession = sessionmaker(bind=engine)
+    monkeypatch.setattr(database, "_replica_cycle", cycle([ReplicaSession]))
+
+    sticky = make_request(f"{database.PRIMARY_STICKY_COOKIE}={time.time() + 60}")
+    session = next(database.get_read_session(sticky))
+
+    assert session.get_bind() is database.engine
+
+    expired = make_request(f"{database.PRIMARY_STICKY_COOKIE}={time.time() - 60}")
+    session = next(database.get_read_session(expired))
+
+    assert session.get_bind() is engine
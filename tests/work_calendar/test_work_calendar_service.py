@@ -0,0 +1,122 @@
+from app.database import Base
+from app.department.models import Department, Job
+from app.employee.models import Employee, EmployeeStatus
+from app.presence.models import Presence, StatusType
+from app.presence.service import get_attendance_report
+from app.work_calendar.service import create, add_holidays, delete_holiday, set_department_calendar, get_department_calendar_ids
+from app.work_calendar.schemas import CreateCalendarSchema, UpdateCalendarSchema
+from app.work_calendar.utils import BusinessCalendar, get_business_calendar, clear_calendar_cache
+from tests.conftest import TestingSessionLocal, engine
+from datetime import date, datetime
+from pydantic import ValidationError
+import numpy as np
+import pytest
+import uuid
+
+EMPLOYEE = uuid.uuid4()
+
+def test_business_calendar_bitmap_matches_busday():
+    calendar = BusinessCalendar("1111110", [date(2026, 1, 1)])
+    days = np.arange(np.datetime64("2025-12-25"), np.datetime64("2026-01-10"))
+
+    expected = np.is_busday(days, weekmask="1111110", holidays=["2026-01-01"])
+
+    assert (calendar.is_working_day(days) == expected).all()
+    assert calendar.year_bitmap(2026).sum() == np.busday_count("2026-01-01", "2027-01-01", weekmask="1111110", holidays=["2026-01-01"])
+    assert calendar.count_working_days(date(2026, 1, 1), date(2026, 1, 3)) == 2
+    assert calendar.add_working_days(date(2025, 12, 31), 1) == date(2026, 1, 2)
+
+def test_weekmask_needs_a_working_day():
+    with pytest.raises(ValidationError):
+        CreateCalendarSchema(name="Never", weekmask="0000000")
+
+    with pytest.raises(ValidationError):
+        UpdateCalendarSchema(weekmask="0000000")
+
+    assert UpdateCalendarSchema(weekmask="0000001").weekmask == "0000001"
+    assert UpdateCalendarSchema().weekmask is None
+
+def test_department_inherits_nearest_calendar(db):
+    calendar = create(name="Head Office", weekmask="1111100", description=None, db=db)
+    set_department_calendar(1, calendar.id, db)
+
+    assert get_department_calendar_ids(db, [1, 2, 3]) == {1: calendar.id, 2: calendar.id, 3: None}
+
+    with pytest.raises(NameError):
+        set_department_calendar(1, 999, db)
+
+def test_holidays_invalidate_cached_calendar(db):
+    calendar_id = get_department_calendar_ids(db, [1])[1]
+    before = get_business_calendar(calendar_id, db)
+
+    assert get_business_calendar(calendar_id, db) is before
+    assert add_holidays(calendar_id, [(date(2026, 3, 4), "Founders Day")], db) == 1
+    assert add_holidays(calendar_id, [(date(2026, 3, 4), "Founders Day")], db) == 0
+
+    after = get_business_calendar(calendar_id, db)
+
+    assert after is not before
+    assert not after.is_working_day([date(2026, 3, 4)])[0]
+
+def test_attendance_report_separates_non_working_days(db):
+    report = get_attendance_report(EMPLOYEE, date(2026, 3, 2), date(2026, 3, 8), db)
+    statuses = {day.date: day.status for day in report.days}
+
+    assert statuses[date(2026, 3, 2)] == "present"
+    assert statuses[date(2026, 3, 3)] == "absent"
+    # Holiday and weekend, even with an absence recorded on Saturday
+    assert statuses[date(2026, 3, 4)] == "non_working"
+    assert statuses[date(2026, 3, 7)] == "non_working"
+    assert (report.working_days, report.present, report.absent, report.non_working) == (4, 1, 3, 3)
+
+    with pytest.raises(ValueError):
+        get_attendance_report(EMPLOYEE, date(2026, 3, 8), date(2026, 3, 2), db)
+
+def test_delete_holiday(db):
+    calendar_id = get_department_calendar_ids(db, [1])[1]
+    delete_holiday(calendar_id, date(2026, 3, 4), db)
+
+    assert get_business_calendar(calendar_id, db).is_working_day([date(2026, 3, 4)])[0]
+
+    with pytest.raises(NameError):
+        delete_holiday(calendar_id, date(2026, 3, 4), db)
+
+def setup_module():
+    Base.metadata.create_all(bind=engine)
+    clear_calendar_cache()
+
+    with TestingSessionLocal() as db:
+        db.add_all([
+            Department(id=1, name="IT", description=""),
+            Department(id=3, name="HR", description=""),
+            EmployeeStatus(id=1, name="Full Time", description=""),
+        ])
+        db.commit()
+        db.add(Department(id=2, name="Backend", description="", parent_id=1))
+        db.add(Job(id=1, department_id=2, name="Engineer", description=""))
+        db.commit()
+
+        db.add(Employee(
+            id=EMPLOYEE,
+            full_name="Employee",
+            gender=True,
+            birthday=datetime(1990, 1, 1),
+            email_address="calendar@email.com",
+            phone_number="+6281234567890",
+            address="Address",
+            department_id=2,
+            job_id=1,
+            salary=1000,
+            employee_status_id=1
+        ))
+        db.commit()
+
+        db.add_all([
+            Presence(employee_id=EMPLOYEE, status=StatusType.PRESENT, clock_in=datetime(2026, 3, 2, 8), created_at=datetime(2026, 3, 2, 8)),
+            Presence(employee_id=EMPLOYEE, status=StatusType.ABSENT, created_at=datetime(2026, 3, 7, 23)),
+        ])
+        db.commit()
+
+def teardown_module():
+    Base.metadata.drop_all(bind=engine)
+    clear_calendar_cache()